@@ -1,9 +1,11 @@
 import pygame
 import math
-import random
 from typing import List, Tuple, Optional, Callable
 from Objetos import Objetos
 from Excepcion_juego import ExcepcionGeneracionEnemigo
+from almacen_enemigos import CampoAlmacen, RANURAS_LOCALES, DURACION_PARPADEO_DAÑO
+from ruta import Ruta
+from aleatorio import FlujosAleatorios, FLUJOS_PREDETERMINADOS
 
 COLORES_ENEMIGOS = {
     'basico': (255, 0, 0),
@@ -12,28 +14,63 @@ COLORES_ENEMIGOS = {
 }
 
 class Enemigo(Objetos): 
+    __slots__ = RANURAS_LOCALES + (
+        '_almacen', '_fila', '_ruta', '_tipo_enemigo', '_color', '_tamaño',
+        '_desplazamiento_animacion', '_mostrar_efecto_armadura', '_aleatorio',
+    )
+
+    # Estado que pasa a vivir en el AlmacenEnemigos al registrar el enemigo
+    x = CampoAlmacen('x')
+    y = CampoAlmacen('y')
+    activo = CampoAlmacen('activo')
+    _vida = CampoAlmacen('vida')
+    _vida_maxima = CampoAlmacen('vida_maxima')
+    _velocidad = CampoAlmacen('velocidad')
+    _recompensa = CampoAlmacen('recompensa')
+    _distancia_ruta = CampoAlmacen('distancia_ruta')
+    _duracion_ralentizacion = CampoAlmacen('duracion_ralentizacion')
+    _factor_ralentizacion = CampoAlmacen('factor_ralentizacion')
+    _tiempo_daño = CampoAlmacen('tiempo_daño')
+    _armadura = CampoAlmacen('armadura')
+
     def __init__(self, x: float, y: float, vida: int, velocidad: float, 
                  recompensa: int, tipo_enemigo: str = "basico"):
+        self._almacen = None
+        self._fila = -1
         super().__init__(x, y)
         self._vida_maxima = max(1, int(vida))
         self._vida = self._vida_maxima
         self._velocidad = max(0.1, float(velocidad))
         self._recompensa = max(0, int(recompensa))
-        self._ruta: List[Tuple[float, float]] = []
-        self._indice_ruta = 0
-        self._progreso_movimiento = 0.0
+        self._ruta: Optional[Ruta] = None
+        self._distancia_ruta = 0.0
         self._tipo_enemigo = tipo_enemigo
         self._color = COLORES_ENEMIGOS.get(tipo_enemigo, COLORES_ENEMIGOS['basico'])
         self._tamaño = 15
-        self._desplazamiento_animacion = random.uniform(0, 2 * math.pi)
-        self._esta_ralentizado = False
+        # Los enemigos sueltos usan los flujos predeterminados; la Simulacion les da los suyos
+        self._aleatorio = FLUJOS_PREDETERMINADOS
+        self._desplazamiento_animacion = self._aleatorio.flujo('animacion').uniform(0, 2 * math.pi)
         self._duracion_ralentizacion = 0.0
-        self._modificador_daño = lambda daño: daño
-        self._modificador_velocidad = lambda velocidad: velocidad
+        self._factor_ralentizacion = 1.0
+        self._armadura = 0
+        self._mostrar_efecto_armadura = False
         # --- EFECTO VISUAL DE DAÑO ---
-        self._recibio_daño = False
         self._tiempo_daño = 0
 
+    def reiniciar(self, x: float, y: float):
+        """Devuelve el enemigo a su estado inicial para reutilizarlo desde un pool."""
+        self._almacen = None
+        self._fila = -1
+        self.establecer_posicion(x, y)
+        self.activo = True
+        self._vida = self._vida_maxima
+        self._ruta = None
+        self._distancia_ruta = 0.0
+        self._duracion_ralentizacion = 0.0
+        self._factor_ralentizacion = 1.0
+        self._tiempo_daño = 0
+        self._mostrar_efecto_armadura = False
+
     @property
     def vida(self) -> int:
         return self._vida
@@ -55,31 +92,65 @@ class Enemigo(Objetos):
         return self._tipo_enemigo
     
     @property
-    def ruta(self) -> List[Tuple[float, float]]:
+    def desplazamiento_animacion(self) -> float:
+        return self._desplazamiento_animacion
+
+    @desplazamiento_animacion.setter
+    def desplazamiento_animacion(self, fase: float):
+        self._desplazamiento_animacion = float(fase)
+
+    @property
+    def aleatorio(self) -> FlujosAleatorios:
+        """Flujos aleatorios de la Simulacion dueña del enemigo."""
+        return self._aleatorio
+
+    @aleatorio.setter
+    def aleatorio(self, flujos: FlujosAleatorios):
+        self._aleatorio = flujos
+
+    @property
+    def ruta(self) -> Optional[Ruta]:
         return self._ruta
     
     @ruta.setter
-    def ruta(self, nueva_ruta: List[Tuple[float, float]]):
+    def ruta(self, nueva_ruta):
         if not nueva_ruta:
             raise ExcepcionGeneracionEnemigo(
                 "El camino no puede estar vacío",
                 tipo_enemigo=self._tipo_enemigo,
                 posicion_generacion=(self.x, self.y)
             )
-        self._ruta = nueva_ruta.copy()
-        self._indice_ruta = 0
+        # La ruta se comparte entre enemigos; el enemigo solo guarda su distancia
+        self._ruta = Ruta.desde(nueva_ruta)
+        self._distancia_ruta = self._ruta.distancia_de(self.x, self.y)
+        self.establecer_posicion(*self._ruta.posicion(self._distancia_ruta))
+    
+    @property
+    def progreso(self) -> float:
+        """Distancia recorrida sobre la ruta."""
+        return self._distancia_ruta
     
     @property
     def indice_ruta(self) -> int:
-        return self._indice_ruta
+        if not self._ruta:
+            return 0
+        if self.esta_al_final_de_la_ruta():
+            return len(self._ruta) - 1
+        return self._ruta.indice_segmento(self._distancia_ruta)
+    
+    @property
+    def _esta_ralentizado(self) -> bool:
+        return self._duracion_ralentizacion > 0
+    
+    @property
+    def _recibio_daño(self) -> bool:
+        return self._tiempo_daño > 0
     
     def recibir_daño(self, daño: int, tipo_daño: str = "normal") -> bool:
-        daño_modificado = self._modificador_daño(daño)
-        daño_final = self._calcular_resistencia_daño(daño_modificado, tipo_daño)
+        daño_final = self._calcular_resistencia_daño(daño, tipo_daño)
         self._vida -= daño_final
         # --- EFECTO VISUAL DE DAÑO ---
-        self._recibio_daño = True
-        self._tiempo_daño = 150  # milisegundos de parpadeo
+        self._tiempo_daño = DURACION_PARPADEO_DAÑO
         if self._vida <= 0:
             self._vida = 0
             self.activo = False
@@ -93,61 +164,43 @@ class Enemigo(Objetos):
         self._vida = min(self._vida_maxima, self._vida + cantidad)
     
     def aplicar_ralentizacion(self, duracion: float, factor_ralentizacion: float = 0.5):
-        self._esta_ralentizado = True
+        if duracion <= 0:
+            return
         self._duracion_ralentizacion = duracion
-        self._modificador_velocidad = lambda velocidad: velocidad * factor_ralentizacion
+        self._factor_ralentizacion = factor_ralentizacion
     
     def obtener_velocidad_actual(self) -> float:
-        velocidad_base = self._modificador_velocidad(self._velocidad)
+        velocidad_base = self._velocidad * self._factor_ralentizacion
         return velocidad_base
     
     def obtener_porcentaje_vida(self) -> float:
         return self._vida / self._vida_maxima if self._vida_maxima > 0 else 0.0
     
     def esta_al_final_de_la_ruta(self) -> bool:
-        return self._indice_ruta >= len(self._ruta) - 1
+        return self._distancia_ruta >= self._ruta.longitud_total
     
     def actualizar(self, dt: float):
         # --- EFECTO VISUAL DE DAÑO ---
         if self._recibio_daño:
             self._tiempo_daño -= dt
-            if self._tiempo_daño <= 0:
-                self._recibio_daño = False
         if not self.activo or not self._ruta:
             return
         self._actualizar_efectos_estado(dt)
         self._mover_a_lo_largo_de_la_ruta(dt)
         if self.esta_al_final_de_la_ruta():
-            distancia_al_final = self.distancia_a_punto(self._ruta[-1])
-            if distancia_al_final < 10:
-                self.activo = False
+            self.activo = False
     
     def _actualizar_efectos_estado(self, dt: float):
         if self._esta_ralentizado:
             self._duracion_ralentizacion -= dt
             if self._duracion_ralentizacion <= 0:
-                self._esta_ralentizado = False
-                self._modificador_velocidad = lambda velocidad: velocidad
+                self._factor_ralentizacion = 1.0
     
     def _mover_a_lo_largo_de_la_ruta(self, dt: float):
-        if self._indice_ruta >= len(self._ruta) - 1:
+        if self.esta_al_final_de_la_ruta():
             return
-        posicion_actual = (self.x, self.y)
-        posicion_objetivo = self._ruta[self._indice_ruta + 1]
-        dx = posicion_objetivo[0] - posicion_actual[0]
-        dy = posicion_objetivo[1] - posicion_actual[1]
-        distancia = math.sqrt(dx * dx + dy * dy)
-        if distancia < 5:
-            self._indice_ruta += 1
-            if self._indice_ruta < len(self._ruta):
-                self.establecer_posicion(*self._ruta[self._indice_ruta])
-        else:
-            velocidad_actual = self.obtener_velocidad_actual()
-            distancia_movimiento = velocidad_actual * dt / 1000.0
-            if distancia > 0:
-                mover_x = (dx / distancia) * distancia_movimiento
-                mover_y = (dy / distancia) * distancia_movimiento
-                self.establecer_posicion(self.x + mover_x, self.y + mover_y)
+        self._distancia_ruta += self.obtener_velocidad_actual() * dt / 1000.0
+        self.establecer_posicion(*self._ruta.posicion(self._distancia_ruta))
     
     def distancia_a_punto(self, punto: Tuple[float, float]) -> float:
         dx = self.x - punto[0]
@@ -163,18 +216,23 @@ class Enemigo(Objetos):
         desplazamiento_tiempo = pygame.time.get_ticks() + self._desplazamiento_animacion
         factor_animacion = math.sin(desplazamiento_tiempo * 0.005) * 0.1 + 1.0
         tamaño_animado = int(self._tamaño * factor_animacion)
+        self._dibujar_cuerpo(pantalla, (int(self.x), int(self.y)), tamaño_animado, self._recibio_daño)
+
+    def _dibujar_cuerpo(self, pantalla: pygame.Surface, centro: Tuple[int, int],
+                        tamaño_animado: int, dañado: bool):
+        """Cuerpo en un instante concreto; sprites_enemigos lo usa para hornear los fotogramas."""
         # --- EFECTO VISUAL DE DAÑO ---
-        color = (255, 0, 0) if self._recibio_daño else self._color
+        color = (255, 0, 0) if dañado else self._color
         pygame.draw.circle(
             pantalla, 
             color, 
-            (int(self.x), int(self.y)), 
+            centro, 
             tamaño_animado
         )
         pygame.draw.circle(
             pantalla, 
             (0, 0, 0), 
-            (int(self.x), int(self.y)), 
+            centro, 
             tamaño_animado, 
             2
         )
@@ -200,6 +258,8 @@ class Enemigo(Objetos):
                              (int(self.x - 10), int(efecto_y)), 3)
 
 class EnemigoBasico(Enemigo):
+    __slots__ = ()
+
     def __init__(self, x: float, y: float):
         super().__init__(x, y, vida=50, velocidad=50, recompensa=10, tipo_enemigo="basico")
         self._tamaño = 15
@@ -208,26 +268,29 @@ class EnemigoBasico(Enemigo):
         return daño
 
 class EnemigoRapido(Enemigo):
+    __slots__ = ()
+
     def __init__(self, x: float, y: float):
         super().__init__(x, y, vida=30, velocidad=80, recompensa=15, tipo_enemigo="rapido")
         self._tamaño = 12
-        self._impulso_velocidad = lambda: random.uniform(0.9, 1.1)
     
     def obtener_velocidad_actual(self) -> float:
         velocidad_base = super().obtener_velocidad_actual()
-        return velocidad_base * self._impulso_velocidad()
+        return velocidad_base * self._aleatorio.flujo('impulso_rapido').uniform(0.9, 1.1)
     
     def _calcular_resistencia_daño(self, daño: int, tipo_daño: str) -> int:
         if tipo_daño == "explosivo":
             return int(daño * 1.2)
         return daño
     
-    def _dibujar_cuerpo_enemigo(self, pantalla: pygame.Surface):
-        super()._dibujar_cuerpo_enemigo(pantalla)
+    def _dibujar_cuerpo(self, pantalla: pygame.Surface, centro: Tuple[int, int],
+                        tamaño_animado: int, dañado: bool):
+        super()._dibujar_cuerpo(pantalla, centro, tamaño_animado, dañado)
+        x, y = centro
         posiciones_rastro = [
-            (self.x - 5, self.y),
-            (self.x - 10, self.y),
-            (self.x - 15, self.y)
+            (x - 5, y),
+            (x - 10, y),
+            (x - 15, y)
         ]
         for i, pos in enumerate(posiciones_rastro):
             alfa = 100 - (i * 30)
@@ -236,17 +299,17 @@ class EnemigoRapido(Enemigo):
                              max(1, self._tamaño - i * 2))
 
 class EnemigoTanque(Enemigo):
+    __slots__ = ()
+
     def __init__(self, x: float, y: float):
         super().__init__(x, y, vida=120, velocidad=30, recompensa=25, tipo_enemigo="tanque")
         self._tamaño = 20
         self._armadura = 5
-        self._reduccion_armadura = lambda daño: max(1, daño - self._armadura)
     
     def _calcular_resistencia_daño(self, daño: int, tipo_daño: str) -> int:
         if tipo_daño == "perforante":
             return daño
-        daño_reducido = self._reduccion_armadura(daño)
-        return daño_reducido
+        return max(1, daño - self._armadura)
     
     def recibir_daño(self, daño: int, tipo_daño: str = "normal") -> bool:
         daño_original = daño
@@ -256,11 +319,12 @@ class EnemigoTanque(Enemigo):
             self._mostrar_efecto_armadura = True
         return resultado
     
-    def _dibujar_cuerpo_enemigo(self, pantalla: pygame.Surface):
-        super()._dibujar_cuerpo_enemigo(pantalla)
+    def _dibujar_cuerpo(self, pantalla: pygame.Surface, centro: Tuple[int, int],
+                        tamaño_animado: int, dañado: bool):
+        super()._dibujar_cuerpo(pantalla, centro, tamaño_animado, dañado)
         radio_anillo_armadura = self._tamaño + 3
         pygame.draw.circle(pantalla, (128, 128, 128), 
-                         (int(self.x), int(self.y)), radio_anillo_armadura, 2)
+                         centro, radio_anillo_armadura, 2)
 
 FABRICAS_ENEMIGOS = {
     'basico': lambda x, y: EnemigoBasico(x, y),
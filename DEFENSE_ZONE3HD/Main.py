@@ -1,28 +1,48 @@
 import pygame
-import math
-import random
-import asyncio
-import threading
+import os
+import time
 from enum import Enum
-from typing import List, Dict, Optional
-from Enemigo import Enemigo, EnemigoBasico, EnemigoRapido, EnemigoTanque
-from torres import torres
+from typing import List, Optional
+from almacen_enemigos import AlmacenEnemigos
+from misiles import MotorProyectiles
+from efectos import GestorEfectos
+from simulacion import (
+    Simulacion,
+    NivelDificultad,
+    GestorRecursos,
+    GeneradorOleadas,
+    TorreBase,
+    TorreCañon,
+    TorreMisil,
+    TorreLaser,
+    CLASES_TORRES,
+    crear_camino,
+)
 from Excepcion_juego import (
     ExcepcionRecursosInsuficientes,
     ExcepcionColocacionTorre,
 )
-from interfaz import Interfaz  
-from Objetos import Objetos
-from gestor_recursos import gestor_recursos
+from interfaz import Interfaz, PanelesInterfaz
+from grabacion import GrabadorEntradas
+from rendimiento import MedidorRendimiento, HUDRendimiento, CapturaPerfil, ruta_sin_usar
+from trazas import RegistroTrazas
+from renderizado import RenderizadorCapas, rectangulos_alrededor
+from sprites_enemigos import CacheSpritesEnemigos
+from sprites_torres import SpritesTorres
+from atlas import Atlas, SECUENCIA_IMPACTO
+from fuentes import FUENTES, TEXTOS, Etiqueta
 
 pygame.init()
 pygame.mixer.init()
 
+# Junto al paquete, para que el juego y los benchmarks arranquen desde cualquier directorio
+DIRECTORIO_SONIDOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "sonidos")
+
 
 try:
-    pygame.mixer.music.load("sonidos/Arcade_Game_Musica.mp3")
+    pygame.mixer.music.load(os.path.join(DIRECTORIO_SONIDOS, "Arcade_Game_Musica.mp3"))
     pygame.mixer.music.play(-1)
-except pygame.error:
+except (pygame.error, FileNotFoundError):
     print("No se pudo cargar la música de fondo")
 
 
@@ -43,6 +63,13 @@ else:
 
 FPS = 60
 
+# Velocidades del juego (pasos de simulación por frame); 0 = máxima
+VELOCIDADES_JUEGO = (1, 2, 4, 8, 0)
+VELOCIDAD_MAXIMA = 0
+# A velocidad máxima el bucle no espera al FPS y solo se dibuja cada N iteraciones
+PASOS_VELOCIDAD_MAXIMA = 16
+ITERACIONES_POR_DIBUJO_MAXIMA = 8
+
 
 BLANCO = (255, 255, 255)
 NEGRO  = (0, 0, 0)
@@ -60,6 +87,25 @@ AZUL_OSCURO = (25, 25, 112)
 GRIS_CLARO_TUTORIAL = (248, 248, 255)
 
 
+# Semiancho y semialto (px) de lo que puede pintar cada entidad alrededor de su centro:
+# cuerpo, estela de los rápidos, barra de vida y marca de ralentizado
+MARGEN_ENEMIGO = (42, 34)
+MARGEN_PROYECTIL = (22, 22)
+MARGEN_EFECTO = (20, 20)
+
+# Contadores (arriba a la izquierda) y lista de teclas (arriba a la derecha):
+# separación entre líneas y margen interior cuando van sobre un panel
+SEPARACION_CONTADORES = 30
+SEPARACION_TECLAS = 25
+MARGEN_PANEL = 16
+ANCHO_PANEL_CONTADORES = 300
+ANCHO_PANEL_TECLAS = 215
+
+
+# Grupo del planificador para las generaciones del tutorial
+GRUPO_TUTORIAL = 'tutorial'
+
+
 class EstadoJuego(Enum):
     MENU = 1
     TUTORIAL = 2
@@ -67,11 +113,6 @@ class EstadoJuego(Enum):
     PAUSADO = 4
     GAME_OVER = 5
 
-class NivelDificultad(Enum):
-    FACIL = 1
-    MEDIO = 2
-    DIFICIL = 3
-
 class FaseTutorial(Enum):
     INICIO = 0
     INTERFAZ_BASICA = 1
@@ -85,178 +126,6 @@ class FaseTutorial(Enum):
     VICTORIA = 9
 
 
-class GestorRecursos:
-    def __init__(self, dinero: int = 0, vidas: int = 0):
-        self.recursos = {"dinero": dinero, "vidas": vidas}
-
-    def gastar(self, clave: str, valor: int) -> bool:
-        actual = self.recursos.get(clave, 0)
-        if actual >= valor:
-            self.recursos[clave] = actual - valor
-            return True
-        return False
-
-    def ganar(self, clave: str, valor: int) -> None:
-        self.recursos[clave] = self.recursos.get(clave, 0) + valor
-
-    def obtener(self, clave: str) -> int:
-        return self.recursos.get(clave, 0)
-
-class misiles:
-    def __init__(self, x_inicio, y_inicio, x_objetivo, y_objetivo):
-        self.x = float(x_inicio)
-        self.y = float(y_inicio)
-        self.x_objetivo = float(x_objetivo)
-        self.y_objetivo = float(y_objetivo)
-        self.velocidad = 300  
-        self.activo = True
-        self.daño = 25  
-        self.radio_colision = 15  
-        
-        
-        dx = self.x_objetivo - self.x
-        dy = self.y_objetivo - self.y
-        distancia = math.sqrt(dx*dx + dy*dy)
-        
-        if distancia > 0:
-            self.vel_x = (dx / distancia) * self.velocidad
-            self.vel_y = (dy / distancia) * self.velocidad
-        else:
-            self.vel_x = self.vel_y = 0
-    
-    def actualizar(self, dt):
-        if not self.activo:
-            return
-            
-        
-        self.x += self.vel_x * dt / 1000.0
-        self.y += self.vel_y * dt / 1000.0
-        
-        
-        distancia_objetivo = math.sqrt((self.x - self.x_objetivo)**2 + (self.y - self.y_objetivo)**2)
-        if distancia_objetivo < 10:
-            self.activo = False
-        
-        
-        if self.x < 0 or self.x > ANCHO_VENTANA or self.y < 0 or self.y > ALTO_VENTANA:
-            self.activo = False
-    
-    def verificar_colision(self, enemigo):
-        """Verifica si el proyectil colisiona con un enemigo"""
-        if not self.activo or not enemigo.activo:
-            return False
-            
-        distancia = math.sqrt((self.x - enemigo.x)**2 + (self.y - enemigo.y)**2)
-        return distancia <= self.radio_colision
-    
-    def dibujar(self, pantalla):
-        if self.activo:
-            pygame.draw.circle(pantalla, AMARILLO, (int(self.x), int(self.y)), 5)
-            pygame.draw.circle(pantalla, NEGRO, (int(self.x), int(self.y)), 5, 2)
-
-
-class TorreBase(torres):
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y)
-        self.costo = 50
-        self.ultimo_disparo = 0
-        self.intervalo_disparo = 1000
-        self.objetivo = None
-        self.tipo = None
-
-    def puede_disparar(self, tiempo_actual: int) -> bool:
-        return tiempo_actual - self.ultimo_disparo >= self.intervalo_disparo
-
-    def encontrar_objetivo(self, enemigos: List[Enemigo]) -> Optional[Enemigo]:
-        objetivo_mas_cercano = None
-        distancia_minima = float('inf')
-        for enemigo in enemigos:
-            if getattr(enemigo, "activo", False):
-                distancia = math.sqrt((self.x - enemigo.x)**2 + (self.y - enemigo.y)**2)
-                if distancia <= self.rango and distancia < distancia_minima:
-                    distancia_minima = distancia
-                    objetivo_mas_cercano = enemigo
-        return objetivo_mas_cercano
-
-    def disparar(self, objetivo: Enemigo, lista_proyectiles: List[misiles], sonidos_disparo: Dict[str, pygame.mixer.Sound]):
-        proyectil = misiles(self.x, self.y, objetivo.x, objetivo.y)
-        proyectil.daño = self.daño  
-        lista_proyectiles.append(proyectil)
-        self.ultimo_disparo = pygame.time.get_ticks()
-        
-        if self.tipo in sonidos_disparo:
-            try:
-                sonidos_disparo[self.tipo].play()
-            except pygame.error:
-                pass  
-
-class TorreCañon(TorreBase):
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y)
-        self.costo = 50
-        self.rango = 100
-        self.daño = 35
-        self.intervalo_disparo = 1500
-        self.tipo = 'cañon'
-
-class TorreMisil(TorreBase):
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y)
-        self.costo = 100
-        self.rango = 120
-        self.daño = 50
-        self.intervalo_disparo = 2000
-        self.tipo = 'misil'
-
-class TorreLaser(TorreBase):
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y)
-        self.costo = 75
-        self.rango = 80
-        self.daño = 65
-        self.intervalo_disparo = 800
-        self.tipo = 'laser'
-
-
-class GeneradorOleadas:
-    def __init__(self, dificultad: NivelDificultad):
-        self.dificultad = dificultad
-        self.numero_oleada = 1
-        self.configuraciones_oleadas = self._generar_configuraciones()
-
-    def _generar_configuraciones(self) -> List[List[Dict]]:
-        configuraciones = []
-        multiplicador = {
-            NivelDificultad.FACIL: 0.8,
-            NivelDificultad.MEDIO: 1.0,
-            NivelDificultad.DIFICIL: 1.3
-        }[self.dificultad]
-        for oleada in range(1, 11):
-            config_oleada = []
-            num_enemigos = min(oleada * 3, 15)
-            for i in range(int(num_enemigos * multiplicador)):
-                if oleada <= 3:
-                    tipo = 'basico'
-                elif oleada <= 6:
-                    tipo = random.choice(['basico', 'rapido'])
-                else:
-                    tipo = random.choice(['basico', 'rapido', 'tanque'])
-                config_oleada.append({
-                    'tipo': tipo,
-                    'retraso': i * 1.0
-                })
-            configuraciones.append(config_oleada)
-        return configuraciones
-
-    def __next__(self):
-        if self.numero_oleada <= len(self.configuraciones_oleadas):
-            config = self.configuraciones_oleadas[self.numero_oleada - 1]
-            self.numero_oleada += 1
-            return config
-        else:
-            raise StopIteration
-
-
 class ObjetivoTutorial:
     def __init__(self, descripcion: str, completado: bool = False):
         self.descripcion = descripcion
@@ -272,9 +141,9 @@ class TutorialInteractivo:
         self.fase_actual = FaseTutorial.INICIO
         
         
-        self.fuente_titulo = pygame.font.SysFont("arial", 24, bold=True)
-        self.fuente_texto = pygame.font.SysFont("arial", 18)
-        self.fuente_pequeña = pygame.font.SysFont("arial", 16, bold=True)
+        self.fuente_titulo = FUENTES.fuente("arial", 24, negrita=True)
+        self.fuente_texto = FUENTES.fuente("arial", 18)
+        self.fuente_pequeña = FUENTES.fuente("arial", 16, negrita=True)
         
         self.objetivos_actuales: List[ObjetivoTutorial] = []
         self.mensaje_principal = ""
@@ -287,7 +156,7 @@ class TutorialInteractivo:
         self.activo = True
         self.fase_actual = FaseTutorial.INICIO
         self.juego.gestor_recursos.recursos = {"dinero": 300, "vidas": 10}
-        self.juego.torres.clear()
+        self.juego.simulacion.reemplazar_torres()
         self.juego.enemigos.clear()
         self.juego.proyectiles.clear()
         self.torres_colocadas = 0
@@ -297,6 +166,8 @@ class TutorialInteractivo:
     def _cargar_fase(self):
         self.objetivos_actuales.clear()
         self.puede_continuar = False
+        # Los enemigos de la oleada de práctica solo salen durante su fase
+        self.juego.simulacion.planificador.cancelar(GRUPO_TUTORIAL)
         
         
         if hasattr(self, 'tiempo_inicio_tipos_enemigos'):
@@ -382,58 +253,23 @@ class TutorialInteractivo:
             self.objetivos_actuales.append(ObjetivoTutorial("ESC para volver al menú"))
 
     def _generar_enemigo_tutorial(self, tipo: str):
-        clases_enemigos = {
-            'basico': EnemigoBasico,
-            'rapido': EnemigoRapido,
-            'tanque': EnemigoTanque
-        }
-        if tipo in clases_enemigos:
-            enemigo = clases_enemigos[tipo](self.juego.camino[0][0], self.juego.camino[0][1])
-            enemigo.ruta = self.juego.camino
-            self.juego.enemigos.append(enemigo)
+        if self.juego.simulacion.generar_enemigo(tipo) is not None:
             self.enemigos_tutorial_spawneados += 1
 
     def _generar_enemigos_recursos(self):
         
         for i in range(2):
-            enemigo = EnemigoBasico(self.juego.camino[0][0], self.juego.camino[0][1])
-            enemigo.ruta = self.juego.camino
-            self.juego.enemigos.append(enemigo)
+            self.juego.simulacion.generar_enemigo('basico')
 
     def _generar_enemigos_variados(self):
-        tipos = ['basico', 'rapido', 'tanque']
-        for i, tipo in enumerate(tipos):
-            clases_enemigos = {
-                'basico': EnemigoBasico,
-                'rapido': EnemigoRapido,
-                'tanque': EnemigoTanque
-            }
-            if tipo in clases_enemigos:
-                x = self.juego.camino[0][0] - (i * 60)
-                enemigo = clases_enemigos[tipo](x, self.juego.camino[0][1])
-                enemigo.ruta = self.juego.camino
-                self.juego.enemigos.append(enemigo)
+        # Salen juntos del inicio de la ruta y se separan por su velocidad
+        for tipo in ['basico', 'rapido', 'tanque']:
+            self.juego.simulacion.generar_enemigo(tipo)
 
     def _iniciar_oleada_tutorial(self):
-        import threading
-        import time
-        def generar_oleada():
-            tipos = ['basico', 'basico', 'rapido', 'tanque', 'basico']
-            clases_enemigos = {
-                'basico': EnemigoBasico,
-                'rapido': EnemigoRapido,
-                'tanque': EnemigoTanque
-            }
-            for i, tipo in enumerate(tipos):
-                time.sleep(1.5)
-                if self.activo and self.fase_actual == FaseTutorial.OLEADAS:
-                    if tipo in clases_enemigos:
-                        enemigo = clases_enemigos[tipo](self.juego.camino[0][0], self.juego.camino[0][1])
-                        enemigo.ruta = self.juego.camino
-                        self.juego.enemigos.append(enemigo)
-        hilo = threading.Thread(target=generar_oleada)
-        hilo.daemon = True
-        hilo.start()
+        tipos = ['basico', 'basico', 'rapido', 'tanque', 'basico']
+        for i, tipo in enumerate(tipos):
+            self.juego.simulacion.programar_generacion((i + 1) * 1500.0, tipo, GRUPO_TUTORIAL)
 
     def _verificar_objetivos(self):
         if self.fase_actual == FaseTutorial.INTERFAZ_BASICA:
@@ -556,9 +392,9 @@ class TutorialInteractivo:
         elif self.fase_actual == FaseTutorial.TIPOS_ENEMIGOS:
             
             if not hasattr(self, 'tiempo_inicio_tipos_enemigos'):
-                self.tiempo_inicio_tipos_enemigos = pygame.time.get_ticks()
+                self.tiempo_inicio_tipos_enemigos = self.juego.simulacion.tiempo_actual
             
-            tiempo_transcurrido = pygame.time.get_ticks() - self.tiempo_inicio_tipos_enemigos
+            tiempo_transcurrido = self.juego.simulacion.tiempo_actual - self.tiempo_inicio_tipos_enemigos
             
             
             if tiempo_transcurrido > 5000:  
@@ -570,9 +406,9 @@ class TutorialInteractivo:
         elif self.fase_actual == FaseTutorial.ESTRATEGIA:
             
             if not hasattr(self, 'tiempo_inicio_estrategia'):
-                self.tiempo_inicio_estrategia = pygame.time.get_ticks()
+                self.tiempo_inicio_estrategia = self.juego.simulacion.tiempo_actual
             
-            tiempo_transcurrido = pygame.time.get_ticks() - self.tiempo_inicio_estrategia
+            tiempo_transcurrido = self.juego.simulacion.tiempo_actual - self.tiempo_inicio_estrategia
             if tiempo_transcurrido > 10000 and len(self.juego.torres) >= 1:  
                 for objetivo in self.objetivos_actuales:
                     objetivo.completar()
@@ -615,6 +451,7 @@ class TutorialInteractivo:
 
     def _salir_tutorial(self):
         self.activo = False
+        self.juego.simulacion.planificador.cancelar(GRUPO_TUTORIAL)
         self.juego.estado_juego = EstadoJuego.MENU
 
     def dibujar(self, pantalla: pygame.Surface):
@@ -652,12 +489,12 @@ class TutorialInteractivo:
         pygame.draw.rect(pantalla, AZUL, (panel_x, panel_y, panel_ancho, panel_alto), 2)
         
         
-        titulo = self.fuente_titulo.render(self.mensaje_principal, True, AZUL_OSCURO)
+        titulo = TEXTOS.render(self.fuente_titulo, self.mensaje_principal, AZUL_OSCURO)
         pantalla.blit(titulo, (panel_x + 8, panel_y + 8))
         
         
         if self.mensaje_secundario:
-            subtitulo = self.fuente_texto.render(self.mensaje_secundario, True, AZUL_OSCURO)
+            subtitulo = TEXTOS.render(self.fuente_texto, self.mensaje_secundario, AZUL_OSCURO)
             pantalla.blit(subtitulo, (panel_x + 8, panel_y + 35))
 
     def _dibujar_objetivos_minimalistas(self, pantalla: pygame.Surface):
@@ -680,7 +517,7 @@ class TutorialInteractivo:
         pygame.draw.rect(pantalla, VERDE_OSCURO, (barra_x, barra_y, barra_ancho, barra_alto), 2)
         
         
-        titulo = self.fuente_pequeña.render("Objetivos:", True, VERDE_OSCURO)
+        titulo = TEXTOS.render(self.fuente_pequeña, "Objetivos:", VERDE_OSCURO)
         pantalla.blit(titulo, (barra_x + 8, barra_y + 6))
         
         
@@ -691,11 +528,11 @@ class TutorialInteractivo:
             texto = f"{simbolo} {objetivo.descripcion}"
             
             
-            sombra = self.fuente_pequeña.render(texto, True, BLANCO)
+            sombra = TEXTOS.render(self.fuente_pequeña, texto, BLANCO)
             pantalla.blit(sombra, (barra_x + 11, barra_y + y_offset + 1))
             
             
-            obj_surface = self.fuente_pequeña.render(texto, True, color)
+            obj_surface = TEXTOS.render(self.fuente_pequeña, texto, color)
             pantalla.blit(obj_surface, (barra_x + 10, barra_y + y_offset))
             y_offset += 22
 
@@ -719,7 +556,7 @@ class TutorialInteractivo:
         
         
         texto_progreso = f"Tutorial: {fase_actual_num}/{total_fases}"
-        superficie = self.fuente_pequeña.render(texto_progreso, True, AZUL_OSCURO)
+        superficie = TEXTOS.render(self.fuente_pequeña, texto_progreso, AZUL_OSCURO)
         rect = superficie.get_rect(center=(ANCHO_VENTANA//2, barra_y + barra_alto + 12))
         pantalla.blit(superficie, rect)
 
@@ -727,7 +564,7 @@ class TutorialInteractivo:
         """Indicador para continuar en esquina inferior derecha"""
         if int(pygame.time.get_ticks() / 800) % 2:
             texto = "ESPACIO → continuar"
-            superficie = self.fuente_pequeña.render(texto, True, VERDE_OSCURO)
+            superficie = TEXTOS.render(self.fuente_pequeña, texto, VERDE_OSCURO)
             
             rect = superficie.get_rect()
             rect.x = ANCHO_VENTANA - rect.width - 25
@@ -745,7 +582,9 @@ class TutorialInteractivo:
 
 
 class DefenseZone3HD:
-    def __init__(self):
+    def __init__(self, semilla: Optional[int] = None, archivo_grabacion: Optional[str] = None,
+                 perfilar: bool = False, oleada_perfilada: Optional[int] = None,
+                 directorio_perfiles: str = "perfiles", trazas: bool = False):
         
         if USAR_PANTALLA_COMPLETA:
             self.pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA), pygame.FULLSCREEN)
@@ -757,60 +596,105 @@ class DefenseZone3HD:
         self.ejecutando = True
         self.estado_juego = EstadoJuego.MENU
         self.dificultad = NivelDificultad.MEDIO
-        self.torres: List[TorreBase] = []
-        self.enemigos: List[Enemigo] = []
-        self.proyectiles: List[misiles] = []
-        self.generador_oleadas: Optional[GeneradorOleadas] = None
-        self.oleada_actual = []
-        self.temporizador_oleada = 0
-        self.retraso_oleada = 10000
-        self.ultimo_tiempo_oleada = 0
+        self.simulacion = Simulacion(
+            crear_camino(ANCHO_VENTANA, ALTO_VENTANA),
+            self.dificultad,
+            ancho=ANCHO_VENTANA,
+            alto=ALTO_VENTANA,
+            dinero=200,
+            vidas=20,
+            semilla=semilla,
+        )
+        # Con archivo de grabación se guardan las órdenes para repetir la partida
+        self.archivo_grabacion = archivo_grabacion
+        self.grabador = GrabadorEntradas(self.simulacion) if archivo_grabacion else None
         
         
         escala_x = ANCHO_VENTANA / 1300
         escala_y = ALTO_VENTANA / 800
         
-        self.camino = [
-            (int(50 * escala_x), int(400 * escala_y)), 
-            (int(200 * escala_x), int(400 * escala_y)), 
-            (int(200 * escala_x), int(200 * escala_y)), 
-            (int(400 * escala_x), int(200 * escala_y)),
-            (int(400 * escala_x), int(600 * escala_y)), 
-            (int(600 * escala_x), int(600 * escala_y)), 
-            (int(600 * escala_x), int(300 * escala_y)), 
-            (int(800 * escala_x), int(300 * escala_y)),
-            (int(800 * escala_x), int(500 * escala_y)), 
-            (int(1000 * escala_x), int(500 * escala_y)), 
-            (int(1000 * escala_x), int(200 * escala_y)), 
-            (int(1150 * escala_x), int(200 * escala_y))
-        ]
-        
         self.tipo_torre_seleccionada = 'cañon'
+        self.mostrar_cobertura = False
+        self.rangos_torres = {tipo: clase(0, 0).rango for tipo, clase in CLASES_TORRES.items()}
+        self.indice_velocidad = 0
+        # Ticks de simulación por segundo real, medidos cada medio segundo
+        self.ticks_por_segundo = 0.0
+        self._ticks_medidos = 0
+        self._inicio_medicion = pygame.time.get_ticks()
+        self._iteracion = 0
+        # Sprites de assets/ empaquetados en atlas (se construyen la primera vez);
+        # sin un grupo, lo suyo se dibuja con primitivas
+        self.atlas_efectos = self._cargar_atlas('efectos')
+        self.atlas_tanques = self._cargar_atlas('tanques')
+        self.atlas_interfaz = self._cargar_atlas('interfaz')
+        self.efectos = GestorEfectos(self.atlas_efectos.secuencia(SECUENCIA_IMPACTO)
+                                     if self.atlas_efectos is not None else None)
+        # Fondo horneado (camino, torres, interfaz fija) y rectángulos sucios durante la partida
+        self.renderizador = RenderizadorCapas(self._dibujar_fondo)
+        # Fotogramas de enemigos horneados; todos se dibujan con un único blits
+        self.sprites_enemigos = CacheSpritesEnemigos(self.atlas_tanques)
+        self.sprites_torres = SpritesTorres(self.atlas_tanques) if self.atlas_tanques is not None else None
+        # Marcos de botones y paneles; el texto va en claro sobre ellos
+        self.paneles = PanelesInterfaz(self.atlas_interfaz) if self.atlas_interfaz is not None else None
+        self.color_texto_ui = PanelesInterfaz.COLOR_TEXTO if self.paneles is not None else NEGRO
+        self.margen_ui = MARGEN_PANEL if self.paneles is not None else 10
+        # HUD de rendimiento (F3); oculto no se mide nada
+        self.mostrar_rendimiento = False
+        self.medidor = MedidorRendimiento()
+        self.hud_rendimiento = None
+        # Capturas de cProfile: toda la partida (perfilar), con F9, o por oleada (0 = todas)
+        self.perfil = CapturaPerfil(directorio_perfiles)
+        self.perfilar = perfilar
+        self.oleada_perfilada = oleada_perfilada
+        self._oleada_en_captura: Optional[int] = None
+        self._ultima_oleada = 0
+        # Spans de cada frame para exportar como traza de Chrome (F10 o --trazas)
+        self.trazas: Optional[RegistroTrazas] = None
+        self.directorio_trazas = directorio_perfiles
+        if trazas:
+            self.grabar_trazas()
         
         
         tamaño_base = max(24, int(32 * min(escala_x, escala_y)))
         tamaño_pequeño = max(18, int(24 * min(escala_x, escala_y)))
         
-        self.fuente = pygame.font.SysFont("arial", tamaño_base)
-        self.fuente_pequeña = pygame.font.SysFont("arial", tamaño_pequeño)
-        self.tareas_async = []
-        self.gestor_recursos = GestorRecursos(dinero=200, vidas=20)
-        self.interfaz = Interfaz(self.pantalla, self.fuente, self.fuente_pequeña)
+        self.fuente = FUENTES.fuente("arial", tamaño_base)
+        self.fuente_pequeña = FUENTES.fuente("arial", tamaño_pequeño)
+        # Contadores de la interfaz: solo se renderizan de nuevo cuando cambia su valor
+        self.etiquetas_ui = {
+            'dinero': Etiqueta(self.fuente_pequeña, "Dinero: ${}", self.color_texto_ui),
+            'vidas': Etiqueta(self.fuente_pequeña, "Vidas: {}", self.color_texto_ui),
+            'oleada': Etiqueta(self.fuente_pequeña, "Oleada: {}", self.color_texto_ui),
+            'enemigos': Etiqueta(self.fuente_pequeña, "Enemigos: {}", self.color_texto_ui),
+            'torres': Etiqueta(self.fuente_pequeña, "Torres: {}", self.color_texto_ui),
+            'velocidad': Etiqueta(self.fuente_pequeña, "Velocidad: {} ({:.0f} ticks/s)", self.color_texto_ui),
+            'perfil': Etiqueta(self.fuente_pequeña, "Perfilando: {}", ROJO),
+            'trazas': Etiqueta(self.fuente_pequeña, "Traza: {} spans", ROJO),
+        }
+        self.interfaz = Interfaz(self.pantalla, self.fuente, self.fuente_pequeña, self.paneles)
         self.tutorial = TutorialInteractivo(self)
         
         
         self.sonidos_disparo = {}
         self._cargar_sonidos()
 
+    def _cargar_atlas(self, grupo: str) -> Optional[Atlas]:
+        """Atlas de un grupo de assets/, o None si faltan los PNG"""
+        try:
+            return Atlas.cargar(grupo)
+        except (OSError, ValueError, pygame.error):
+            print(f"No se pudo cargar el atlas '{grupo}', se dibuja con primitivas")
+            return None
+
     def _cargar_sonidos(self):
         """Cargar todos los sonidos del juego"""
         try:
             self.sonidos_disparo = {
-                'cañon': pygame.mixer.Sound("sonidos/Canon.mp3"),
-                'misil': pygame.mixer.Sound("sonidos/Misil.mp3"),
-                'laser': pygame.mixer.Sound("sonidos/Laser.mp3")
+                'cañon': pygame.mixer.Sound(os.path.join(DIRECTORIO_SONIDOS, "Canon.mp3")),
+                'misil': pygame.mixer.Sound(os.path.join(DIRECTORIO_SONIDOS, "Misil.mp3")),
+                'laser': pygame.mixer.Sound(os.path.join(DIRECTORIO_SONIDOS, "Laser.mp3"))
             }
-        except pygame.error:
+        except (pygame.error, FileNotFoundError):
             print("No se pudieron cargar los sonidos de disparo")
             
             self.sonidos_disparo = {}
@@ -844,12 +728,29 @@ class DefenseZone3HD:
                     self.tipo_torre_seleccionada = 'misil'
                 elif evento.key == pygame.K_3:
                     self.tipo_torre_seleccionada = 'laser'
+                elif evento.key == pygame.K_c:
+                    self.mostrar_cobertura = not self.mostrar_cobertura
+                elif evento.key == pygame.K_f:
+                    self.indice_velocidad = (self.indice_velocidad + 1) % len(VELOCIDADES_JUEGO)
+                elif evento.key == pygame.K_F3:
+                    self.alternar_rendimiento()
+                elif evento.key == pygame.K_F9:
+                    self.alternar_perfil()
+                elif evento.key == pygame.K_F10:
+                    if self.trazas is None:
+                        self.grabar_trazas()
+                    else:
+                        self.exportar_trazas()
                 elif evento.key == pygame.K_SPACE and self.estado_juego == EstadoJuego.MENU:
                     self.iniciar_juego()
             elif evento.type == pygame.MOUSEBUTTONDOWN:
                 if evento.button == 1:
                     mouse_x, mouse_y = pygame.mouse.get_pos()
                     self.manejar_click(mouse_x, mouse_y)
+                elif evento.button == 3 and self.estado_juego in [EstadoJuego.JUGANDO, EstadoJuego.TUTORIAL]:
+                    torre = self.simulacion.torre_en(*pygame.mouse.get_pos())
+                    if torre is not None:
+                        self.simulacion.vender_torre(torre)
 
     def manejar_click(self, x: int, y: int):
         if self.estado_juego == EstadoJuego.MENU:
@@ -879,20 +780,34 @@ class DefenseZone3HD:
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+    @property
+    def camino(self) -> List:
+        return self.simulacion.camino
+
+    @property
+    def torres(self) -> List[TorreBase]:
+        return self.simulacion.torres
+
+    @property
+    def enemigos(self) -> AlmacenEnemigos:
+        return self.simulacion.enemigos
+
+    @property
+    def proyectiles(self) -> MotorProyectiles:
+        return self.simulacion.proyectiles
+
+    @property
+    def gestor_recursos(self) -> GestorRecursos:
+        return self.simulacion.gestor_recursos
+
+    @property
+    def generador_oleadas(self) -> Optional[GeneradorOleadas]:
+        return self.simulacion.generador_oleadas
+
     def iniciar_juego(self):
         self.estado_juego = EstadoJuego.JUGANDO
-        self.generador_oleadas = GeneradorOleadas(self.dificultad)
-        modificadores_dificultad = {
-            NivelDificultad.FACIL: {'dinero': 300, 'vidas': 5},
-            NivelDificultad.MEDIO: {'dinero': 200, 'vidas': 3},
-            NivelDificultad.DIFICIL: {'dinero': 150, 'vidas': 1}
-        }
-        mods = modificadores_dificultad[self.dificultad]
-        self.gestor_recursos.recursos.update(mods)
-        self.torres.clear()
-        self.enemigos.clear()
-        self.proyectiles.clear()
-        self.ultimo_tiempo_oleada = pygame.time.get_ticks()
+        self.simulacion.iniciar_partida(self.dificultad)
+        self.efectos.clear()
 
     def cambiar_dificultad(self):
         dificultades = list(NivelDificultad)
@@ -900,129 +815,107 @@ class DefenseZone3HD:
         self.dificultad = dificultades[(indice_actual + 1) % len(dificultades)]
 
     def posicion_valida_torre(self, x: int, y: int) -> bool:
-        for camino_x, camino_y in self.camino:
-            distancia = math.sqrt((x - camino_x)**2 + (y - camino_y)**2)
-            if distancia < 50:
-                return False
-        for torre in self.torres:
-            distancia = math.sqrt((x - torre.x)**2 + (y - torre.y)**2)
-            if distancia < 60:
-                return False
-        return True
+        return self.simulacion.posicion_valida_torre(x, y)
 
     def colocar_torre(self, x: int, y: int, tipo_torre: str):
-        clases_torres = {
-            'cañon': TorreCañon,
-            'misil': TorreMisil,
-            'laser': TorreLaser
-        }
-        if tipo_torre not in clases_torres:
-            return
-        clase_torre = clases_torres[tipo_torre]
-        torre_nueva = clase_torre(x, y)
-        if not self.gestor_recursos.gastar('dinero', torre_nueva.costo):
-            raise ExcepcionRecursosInsuficientes(
-                f"No tienes suficiente dinero para {tipo_torre}"
-            )
-        self.torres.append(torre_nueva)
-
-    async def generar_oleada_async(self):
-        try:
-            if self.generador_oleadas is None:
-                return
-            config_oleada = next(self.generador_oleadas)
-            for config_enemigo in config_oleada:
-                await asyncio.sleep(config_enemigo['retraso'])
-                tipo_enemigo = config_enemigo['tipo']
-                clases_enemigos = {
-                    'basico': EnemigoBasico,
-                    'rapido': EnemigoRapido,
-                    'tanque': EnemigoTanque
-                }
-                if tipo_enemigo in clases_enemigos:
-                    clase_enemigo = clases_enemigos[tipo_enemigo]
-                    enemigo = clase_enemigo(self.camino[0][0], self.camino[0][1])
-                    enemigo.ruta = self.camino
-                    self.enemigos.append(enemigo)
-        except StopIteration:
-            print("Todas las oleadas completadas")
-        except Exception as e:
-            print(f"Error en generación de oleada: {e}")
+        self.simulacion.colocar_torre(x, y, tipo_torre)
+
+    def alternar_rendimiento(self):
+        self.mostrar_rendimiento = not self.mostrar_rendimiento
+        if self.mostrar_rendimiento:
+            if self.hud_rendimiento is None:
+                self.hud_rendimiento = HUDRendimiento(self.medidor)
+            self.medidor.reiniciar()
+            self.simulacion.medidor = self.medidor
+        else:
+            self.simulacion.medidor = None
+
+    def alternar_perfil(self):
+        if self.perfil.activa:
+            self.perfil.detener()
+            self._oleada_en_captura = None
+        else:
+            self.perfil.iniciar("manual")
+
+    def grabar_trazas(self):
+        self.trazas = RegistroTrazas()
+        self.simulacion.trazas = self.trazas
+
+    def exportar_trazas(self) -> Optional[str]:
+        """Escribe los últimos segundos de spans; la grabación continúa."""
+        if self.trazas is None:
+            return None
+        ruta = ruta_sin_usar(self.directorio_trazas, "traza", ".json") + ".json"
+        spans = self.trazas.exportar(ruta)
+        print(f"Traza de {spans} spans guardada en {ruta}")
+        return ruta
+
+    def _perfilar_oleadas(self):
+        """Captura aparte cada oleada elegida, desde que sale hasta que sale la siguiente."""
+        generador = self.generador_oleadas
+        lanzadas = generador.numero_oleada - 1 if generador else 0
+        terminada = self.simulacion.derrota or self.simulacion.victoria
+        if self._oleada_en_captura is not None and (lanzadas != self._oleada_en_captura or terminada):
+            self.perfil.detener()
+            self._oleada_en_captura = None
+        if (lanzadas != self._ultima_oleada and lanzadas > 0 and not terminada
+                and self.oleada_perfilada in (0, lanzadas) and not self.perfil.activa):
+            self.perfil.iniciar(f"oleada_{lanzadas}")
+            self._oleada_en_captura = lanzadas
+        self._ultima_oleada = lanzadas
+
+    @property
+    def velocidad(self) -> int:
+        return VELOCIDADES_JUEGO[self.indice_velocidad]
+
+    def _medir_velocidad(self, pasos: int):
+        self._ticks_medidos += pasos
+        ahora = pygame.time.get_ticks()
+        transcurrido = ahora - self._inicio_medicion
+        if transcurrido >= 500:
+            self.ticks_por_segundo = self._ticks_medidos * 1000.0 / transcurrido
+            self._ticks_medidos = 0
+            self._inicio_medicion = ahora
 
     def actualizar(self, dt: float):
         if self.estado_juego not in [EstadoJuego.JUGANDO, EstadoJuego.TUTORIAL]:
+            self._medir_velocidad(0)
             return
         
         if self.estado_juego == EstadoJuego.TUTORIAL:
             self.tutorial.actualizar(dt)
         
+        self.simulacion.oleadas_automaticas = self.estado_juego == EstadoJuego.JUGANDO
+        if self.velocidad == VELOCIDAD_MAXIMA:
+            pasos = self.simulacion.avanzar_pasos(PASOS_VELOCIDAD_MAXIMA)
+        else:
+            pasos = self.simulacion.avanzar(dt, self.velocidad)
+        self._medir_velocidad(pasos)
         
-        for enemigo in self.enemigos[:]:
-            enemigo.actualizar(dt)
-            if not enemigo.activo:
-                if hasattr(enemigo, 'indice_ruta') and enemigo.indice_ruta >= len(enemigo.ruta) - 1:
-                    
-                    self.gestor_recursos.gastar('vidas', 1)
-                    vidas_actuales = self.gestor_recursos.obtener('vidas')
-                    if vidas_actuales <= 0:
-                        self.estado_juego = EstadoJuego.GAME_OVER
-                else:
-                    
-                    if hasattr(enemigo, 'recompensa'):
-                        self.gestor_recursos.ganar('dinero', enemigo.recompensa)
-                    else:
-                        
-                        self.gestor_recursos.ganar('dinero', 15)
-                self.enemigos.remove(enemigo)
-        
-        
-        tiempo_actual = pygame.time.get_ticks()
-        for torre in self.torres:
-            torre.objetivo = torre.encontrar_objetivo(self.enemigos)
-            if torre.objetivo and torre.puede_disparar(tiempo_actual):
-                torre.disparar(torre.objetivo, self.proyectiles, self.sonidos_disparo)
-        
+        # Un sonido por tipo de torre y frame, aunque se hayan simulado varios pasos
+        for tipo_torre in set(self.simulacion.disparos):
+            if tipo_torre in self.sonidos_disparo:
+                try:
+                    self.sonidos_disparo[tipo_torre].play()
+                except pygame.error:
+                    pass
         
-        for proyectil in self.proyectiles[:]:
-            proyectil.actualizar(dt)
-            
-            
-            if proyectil.activo:
-                for enemigo in self.enemigos:
-                    if proyectil.verificar_colision(enemigo):
-                        
-                        if hasattr(enemigo, 'recibir_daño'):
-                            enemigo.recibir_daño(proyectil.daño)
-                        elif hasattr(enemigo, 'hp'):
-                            enemigo.hp -= proyectil.daño
-                            if enemigo.hp <= 0:
-                                enemigo.activo = False
-                        
-                        
-                        proyectil.activo = False
-                        break
-            
-            
-            if not proyectil.activo:
-                self.proyectiles.remove(proyectil)
+        if self.oleada_perfilada is not None:
+            self._perfilar_oleadas()
         
+        for x, y in self.simulacion.impactos:
+            self.efectos.crear_impacto(x, y)
+        self.efectos.actualizar(pasos * Simulacion.DT_PASO)
         
-        if self.estado_juego == EstadoJuego.JUGANDO:
-            if len(self.enemigos) == 0 and tiempo_actual - self.ultimo_tiempo_oleada > self.retraso_oleada:
-                self.ultimo_tiempo_oleada = tiempo_actual
-                def hilo_oleada():
-                    try:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        loop.run_until_complete(self.generar_oleada_async())
-                        loop.close()
-                    except Exception as e:
-                        print(f"Error en hilo de oleada: {e}")
-                hilo = threading.Thread(target=hilo_oleada)
-                hilo.daemon = True
-                hilo.start()
+        if self.simulacion.derrota:
+            self.estado_juego = EstadoJuego.GAME_OVER
 
     def dibujar(self):
+        if self.estado_juego == EstadoJuego.JUGANDO:
+            self._dibujar_por_capas()
+            return
+        # Menú, tutorial y superposiciones se dibujan enteros
+        self.renderizador.invalidar()
         self.pantalla.fill(BLANCO)
         if self.estado_juego == EstadoJuego.MENU:
             self.dibujar_menu()
@@ -1030,20 +923,68 @@ class DefenseZone3HD:
         elif self.estado_juego == EstadoJuego.TUTORIAL:
             self.dibujar_juego()
             self.tutorial.dibujar(self.pantalla)
-        elif self.estado_juego == EstadoJuego.JUGANDO:
-            self.dibujar_juego()
-            self.interfaz.dibujar_juego()
         elif self.estado_juego == EstadoJuego.PAUSADO:
             self.dibujar_juego()
             self.dibujar_pausa()
         elif self.estado_juego == EstadoJuego.GAME_OVER:
             self.dibujar_juego()
             self.dibujar_game_over()
-        pygame.display.flip()
+        if self.mostrar_rendimiento:
+            self.hud_rendimiento.dibujar(self.pantalla, self.simulacion, self.efectos)
+        self._volcar(pygame.display.flip)
+
+    def _dibujar_por_capas(self):
+        """Partida sobre el fondo horneado, enviando a la ventana solo lo que cambió."""
+        renderizador = self.renderizador
+        renderizador.preparar(self.pantalla, (self.simulacion.mapa_construccion.version, len(self.torres),
+                                              self.mostrar_cobertura, self.tipo_torre_seleccionada))
+        renderizador.marcar(self.dibujar_vista_previa())
+        self._dibujar_entidades()
+        renderizador.marcar_varios(self._rectangulos_entidades())
+        renderizador.marcar_varios(self._dibujar_ui_dinamica())
+        if self.mostrar_rendimiento:
+            renderizador.marcar(self.hud_rendimiento.dibujar(self.pantalla, self.simulacion, self.efectos))
+        self._volcar(lambda: renderizador.presentar(self.pantalla))
+
+    def _volcar(self, volcado):
+        """Envía el frame a la ventana, midiendo cuánto tarda si hay HUD o trazas."""
+        if not (self.mostrar_rendimiento or self.trazas is not None):
+            volcado()
+            return
+        inicio_flip = time.perf_counter()
+        volcado()
+        fin_flip = time.perf_counter()
+        if self.mostrar_rendimiento:
+            self.medidor.acumular('flip', fin_flip - inicio_flip)
+        if self.trazas is not None:
+            self.trazas.registrar('flip', inicio_flip, fin_flip)
+
+    def _dibujar_fondo(self, superficie: pygame.Surface):
+        """Lo que no cambia de un frame a otro de la partida."""
+        superficie.fill(BLANCO)
+        self._dibujar_paneles_ui(superficie)
+        self._dibujar_escenario(superficie)
+        self._dibujar_ui_estatica(superficie)
+        self.interfaz.dibujar_juego(superficie)
+
+    def _rectangulos_entidades(self) -> List[pygame.Rect]:
+        """Zona que ocupa cada enemigo, proyectil y efecto dibujado este frame."""
+        enemigos, proyectiles = self.enemigos, self.proyectiles
+        rects = rectangulos_alrededor(enemigos.columnas['x'][:enemigos.n],
+                                      enemigos.columnas['y'][:enemigos.n], *MARGEN_ENEMIGO)
+        rects += rectangulos_alrededor(proyectiles.columnas['x'][:proyectiles.n],
+                                       proyectiles.columnas['y'][:proyectiles.n], *MARGEN_PROYECTIL)
+        semiancho, semialto = MARGEN_EFECTO
+        rects += [pygame.Rect(int(efecto.x) - semiancho, int(efecto.y) - semialto, 2 * semiancho, 2 * semialto)
+                  for efecto in self.efectos.activos]
+        return rects
 
     def dibujar_menu(self):
-        titulo = self.fuente.render("Defense Zone 3 HD", True, NEGRO)
+        titulo = TEXTOS.render(self.fuente, "Defense Zone 3 HD", self.color_texto_ui)
         rect_titulo = titulo.get_rect(center=(ANCHO_VENTANA//2, 200))
+        if self.paneles is not None:
+            placa = rect_titulo.inflate(80, 40)
+            self.pantalla.blit(self.paneles.boton(placa.size), placa)
         self.pantalla.blit(titulo, rect_titulo)
         botones = [
             ("Jugar", 300),
@@ -1052,111 +993,150 @@ class DefenseZone3HD:
         ]
         for texto, y in botones:
             rect_boton = pygame.Rect(450, y, 300, 50)
-            pygame.draw.rect(self.pantalla, GRIS_CLARO, rect_boton)
-            pygame.draw.rect(self.pantalla, NEGRO, rect_boton, 2)
-            texto_boton = self.fuente_pequeña.render(texto, True, NEGRO)
+            if self.paneles is not None:
+                self.pantalla.blit(self.paneles.boton(rect_boton.size), rect_boton)
+            else:
+                pygame.draw.rect(self.pantalla, GRIS_CLARO, rect_boton)
+                pygame.draw.rect(self.pantalla, NEGRO, rect_boton, 2)
+            texto_boton = TEXTOS.render(self.fuente_pequeña, texto, self.color_texto_ui)
             rect_texto = texto_boton.get_rect(center=rect_boton.center)
             self.pantalla.blit(texto_boton, rect_texto)
 
     def dibujar_juego(self):
+        self._dibujar_paneles_ui(self.pantalla)
+        self._dibujar_escenario(self.pantalla)
+        
+        if self.estado_juego in [EstadoJuego.JUGANDO, EstadoJuego.TUTORIAL]:
+            self.dibujar_vista_previa()
         
+        self._dibujar_entidades()
+        self.dibujar_ui()
+        if self.estado_juego == EstadoJuego.JUGANDO:
+            self.interfaz.dibujar_juego()
+
+    def _dibujar_escenario(self, superficie: pygame.Surface):
+        """Camino, cobertura y torres."""
         if len(self.camino) > 1:
-            pygame.draw.lines(self.pantalla, GRIS, False, self.camino, 5)
+            pygame.draw.lines(superficie, GRIS, False, self.camino, 5)
+        if self.mostrar_cobertura:
+            self.dibujar_cobertura(superficie)
         
         
+        if self.sprites_torres is not None:
+            self.sprites_torres.dibujar(superficie, self.torres, self.simulacion.ruta)
+            return
         for torre in self.torres:
             if hasattr(torre, 'dibujar'):
-                torre.dibujar(self.pantalla)
+                torre.dibujar(superficie)
             else:
                 
-                pygame.draw.circle(self.pantalla, AZUL, (torre.x, torre.y), 20)
+                pygame.draw.circle(superficie, AZUL, (torre.x, torre.y), 20)
                 
                 if hasattr(torre, 'rango'):
-                    pygame.draw.circle(self.pantalla, (0, 0, 255, 50), (torre.x, torre.y), torre.rango, 1)
-        
-        
-        for enemigo in self.enemigos:
-            if hasattr(enemigo, 'dibujar'):
-                enemigo.dibujar(self.pantalla)
-            else:
-                
-                color_enemigo = ROJO
-                if hasattr(enemigo, '__class__'):
-                    if 'Rapido' in enemigo.__class__.__name__:
-                        color_enemigo = AMARILLO
-                    elif 'Tanque' in enemigo.__class__.__name__:
-                        color_enemigo = GRIS_OSCURO
-                
-                pygame.draw.rect(self.pantalla, color_enemigo, (enemigo.x-10, enemigo.y-10, 20, 20))
-            
-            
-            self.dibujar_barra_vida_enemigo(enemigo)
-        
-        
-        for proyectil in self.proyectiles:
-            proyectil.dibujar(self.pantalla)
-        
-        self.dibujar_ui()
-
-    def dibujar_barra_vida_enemigo(self, enemigo):
-        """Dibuja una barra de vida sobre el enemigo"""
-        if hasattr(enemigo, 'hp') and hasattr(enemigo, 'hp_max'):
-            if enemigo.hp < enemigo.hp_max:
-                ancho_barra = 30
-                alto_barra = 4
-                x_barra = enemigo.x - ancho_barra // 2
-                y_barra = enemigo.y - 20
-                
-                
-                pygame.draw.rect(self.pantalla, ROJO, 
-                               (x_barra, y_barra, ancho_barra, alto_barra))
-                
-                
-                porcentaje_vida = max(0, enemigo.hp / enemigo.hp_max)
-                ancho_vida = int(ancho_barra * porcentaje_vida)
-                pygame.draw.rect(self.pantalla, VERDE, 
-                               (x_barra, y_barra, ancho_vida, alto_barra))
+                    pygame.draw.circle(superficie, (0, 0, 255, 50), (torre.x, torre.y), torre.rango, 1)
+
+    def _dibujar_entidades(self):
+        # Cuerpo, barra de vida y marca de ralentización, igual que Enemigo.dibujar
+        self.sprites_enemigos.dibujar(self.pantalla, self.enemigos, pygame.time.get_ticks())
+        self.proyectiles.dibujar(self.pantalla)
+        self.efectos.dibujar(self.pantalla)
+
+    def dibujar_vista_previa(self) -> Optional[pygame.Rect]:
+        """Círculo verde o rojo bajo el cursor según se pueda construir ahí"""
+        x, y = pygame.mouse.get_pos()
+        if self.simulacion.torre_en(x, y) is not None:
+            return None
+        color = VERDE if self.posicion_valida_torre(x, y) else ROJO
+        rect = pygame.draw.circle(self.pantalla, color, (x, y), 20, 2)
+        return rect.union(pygame.draw.circle(self.pantalla, color, (x, y),
+                                             int(self.rangos_torres[self.tipo_torre_seleccionada]), 1))
+
+    def dibujar_cobertura(self, superficie: Optional[pygame.Surface] = None):
+        """Resalta los tramos del camino que alcanzan las torres (más intenso = más torres)"""
+        superficie = superficie or self.pantalla
+        ruta = self.simulacion.ruta
+        for inicio, fin, solapes in self.simulacion.cobertura_ruta():
+            intensidad = min(255, 80 + solapes * 50)
+            puntos = ruta.tramo(inicio, fin)
+            pygame.draw.lines(superficie, (0, intensidad, 0), False, puntos, 7)
 
     def dibujar_ui(self):
-        dinero = self.gestor_recursos.obtener('dinero')
-        vidas = self.gestor_recursos.obtener('vidas')
-        texto_dinero = self.fuente_pequeña.render(f"Dinero: ${dinero}", True, NEGRO)
-        texto_vidas  = self.fuente_pequeña.render(f"Vidas: {vidas}", True, NEGRO)
-        self.pantalla.blit(texto_dinero, (10, 10))
-        self.pantalla.blit(texto_vidas, (10, 40))
-        
+        self._dibujar_ui_estatica(self.pantalla)
+        self._dibujar_ui_dinamica()
+
+    def _dibujar_paneles_ui(self, superficie: pygame.Surface):
+        """Marcos de los contadores y de la lista de teclas, debajo del camino."""
+        if self.paneles is None:
+            return
+        alto_linea = self.fuente_pequeña.get_linesize()
+        alto_contadores = 2 * self.margen_ui + 5 * SEPARACION_CONTADORES + alto_linea
+        superficie.blit(self.paneles.ventana((ANCHO_PANEL_CONTADORES, alto_contadores)), (0, 0))
+        alto_teclas = 2 * self.margen_ui + 8 * SEPARACION_TECLAS + alto_linea
+        superficie.blit(self.paneles.ventana((ANCHO_PANEL_TECLAS, alto_teclas)),
+                        (ANCHO_VENTANA - ANCHO_PANEL_TECLAS, 0))
+
+    def _dibujar_ui_estatica(self, superficie: pygame.Surface):
+        """Lista de teclas; solo cambia al seleccionar otra torre."""
         info_torres = [
             ("1 - Cañón: $50", 'cañon'),
             ("2 - Misil: $100", 'misil'),
-            ("3 - Láser: $75", 'laser')
+            ("3 - Láser: $75", 'laser'),
+            ("C - Cobertura", None),
+            ("F - Velocidad", None),
+            ("F3 - Rendimiento", None),
+            ("F9 - Perfil", None),
+            ("F10 - Traza", None),
+            ("Clic dcho. - Vender", None)
         ]
-        y_offset = 10
+        y_offset = self.margen_ui
         for texto, tipo_torre in info_torres:
-            color = VERDE if tipo_torre == self.tipo_torre_seleccionada else NEGRO
-            texto_torre = self.fuente_pequeña.render(texto, True, color)
-            self.pantalla.blit(texto_torre, (ANCHO_VENTANA - 200, y_offset))
-            y_offset += 25
-        
+            color = VERDE if tipo_torre == self.tipo_torre_seleccionada else self.color_texto_ui
+            texto_torre = TEXTOS.render(self.fuente_pequeña, texto, color)
+            superficie.blit(texto_torre, (ANCHO_VENTANA - 200, y_offset))
+            y_offset += SEPARACION_TECLAS
+
+    def _dibujar_ui_dinamica(self) -> List[pygame.Rect]:
+        """Contadores de la partida; devuelve los rectángulos que ocupan."""
+        etiquetas = self.etiquetas_ui
+        velocidad = "máx" if self.velocidad == VELOCIDAD_MAXIMA else f"x{self.velocidad}"
+        # (superficie, fila); perfil y traza quedan debajo del panel
+        lineas = [
+            (etiquetas['dinero'].superficie(self.gestor_recursos.obtener('dinero')), 0),
+            (etiquetas['vidas'].superficie(self.gestor_recursos.obtener('vidas')), 1),
+        ]
         if self.generador_oleadas:
-            texto_oleada = self.fuente_pequeña.render(f"Oleada: {self.generador_oleadas.numero_oleada}", True, NEGRO)
-            self.pantalla.blit(texto_oleada, (10, 70))
-        
-        
-        texto_enemigos = self.fuente_pequeña.render(f"Enemigos: {len(self.enemigos)}", True, NEGRO)
-        self.pantalla.blit(texto_enemigos, (10, 100))
-        
-        texto_torres = self.fuente_pequeña.render(f"Torres: {len(self.torres)}", True, NEGRO)
-        self.pantalla.blit(texto_torres, (10, 130))
+            lineas.append((etiquetas['oleada'].superficie(self.generador_oleadas.numero_oleada), 2))
+        lineas += [
+            (etiquetas['enemigos'].superficie(len(self.enemigos)), 3),
+            (etiquetas['torres'].superficie(len(self.torres)), 4),
+            (etiquetas['velocidad'].superficie(velocidad, self.ticks_por_segundo), 5),
+        ]
+        if self.perfil.activa:
+            lineas.append((etiquetas['perfil'].superficie(self.perfil.nombre), 6))
+        if self.trazas is not None:
+            lineas.append((etiquetas['trazas'].superficie(len(self.trazas)), 7))
+        margen = self.margen_ui
+        return [self.pantalla.blit(superficie, (margen, margen + fila * SEPARACION_CONTADORES))
+                for superficie, fila in lineas]
+
+    def _dibujar_ventana_mensaje(self):
+        """Marco detrás de los mensajes de pausa y fin de partida, si hay arte."""
+        if self.paneles is None:
+            return
+        ventana = pygame.Rect(0, 0, 520, 170)
+        ventana.center = (ANCHO_VENTANA // 2, ALTO_VENTANA // 2 + 35)
+        self.pantalla.blit(self.paneles.ventana(ventana.size), ventana)
 
     def dibujar_pausa(self):
         overlay = pygame.Surface((ANCHO_VENTANA, ALTO_VENTANA))
         overlay.set_alpha(128)
         overlay.fill(NEGRO)
         self.pantalla.blit(overlay, (0, 0))
-        texto_pausa = self.fuente.render("JUEGO PAUSADO", True, BLANCO)
+        self._dibujar_ventana_mensaje()
+        texto_pausa = TEXTOS.render(self.fuente, "JUEGO PAUSADO", BLANCO)
         rect_pausa = texto_pausa.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2))
         self.pantalla.blit(texto_pausa, rect_pausa)
-        texto_reanudar = self.fuente_pequeña.render("Presiona ESC para continuar", True, BLANCO)
+        texto_reanudar = TEXTOS.render(self.fuente_pequeña, "Presiona ESC para continuar", BLANCO)
         rect_reanudar = texto_reanudar.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2 + 50))
         self.pantalla.blit(texto_reanudar, rect_reanudar)
 
@@ -1165,28 +1145,91 @@ class DefenseZone3HD:
         overlay.set_alpha(128)
         overlay.fill(ROJO)
         self.pantalla.blit(overlay, (0, 0))
-        texto_game_over = self.fuente.render("GAME OVER", True, BLANCO)
+        self._dibujar_ventana_mensaje()
+        texto_game_over = TEXTOS.render(self.fuente, "GAME OVER", BLANCO)
         rect_game_over = texto_game_over.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2))
         self.pantalla.blit(texto_game_over, rect_game_over)
         if self.generador_oleadas:
-            texto_oleada = self.fuente_pequeña.render(f"Llegaste a la oleada: {self.generador_oleadas.numero_oleada}", True, BLANCO)
+            texto_oleada = TEXTOS.render(self.fuente_pequeña, f"Llegaste a la oleada: {self.generador_oleadas.numero_oleada}", BLANCO)
             rect_oleada = texto_oleada.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2 + 40))
             self.pantalla.blit(texto_oleada, rect_oleada)
-        texto_reiniciar = self.fuente_pequeña.render("Presiona ESC para volver al menú", True, BLANCO)
+        texto_reiniciar = TEXTOS.render(self.fuente_pequeña, "Presiona ESC para volver al menú", BLANCO)
         rect_reiniciar = texto_reiniciar.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2 + 70))
         self.pantalla.blit(texto_reiniciar, rect_reiniciar)
 
     def ejecutar(self):
-        while self.ejecutando:
-            dt = self.reloj.tick(FPS)
-            self.manejar_eventos()
-            self.actualizar(dt)
-            self.dibujar()
+        if self.perfilar:
+            self.perfil.iniciar("partida")
+        try:
+            while self.ejecutando:
+                maxima = self.velocidad == VELOCIDAD_MAXIMA
+                dt = self.reloj.tick() if maxima else self.reloj.tick(FPS)
+                dibujar = not maxima or (self._iteracion + 1) % ITERACIONES_POR_DIBUJO_MAXIMA == 0
+                if self.mostrar_rendimiento or self.trazas is not None:
+                    self._frame_medido(dt, dibujar)
+                else:
+                    self.manejar_eventos()
+                    self.actualizar(dt)
+                    if dibujar:
+                        self.dibujar()
+                self._iteracion += 1
+        finally:
+            # También si el bucle falla: es cuando más hacen falta el perfil y la traza
+            self.perfil.detener()
+            self.exportar_trazas()
+        if self.grabador is not None:
+            self.grabador.guardar(self.archivo_grabacion)
+            print(f"Partida grabada en {self.archivo_grabacion} (semilla {self.simulacion.semilla})")
         pygame.quit()
 
+    def _frame_medido(self, dt: float, dibujar: bool):
+        """Un frame del bucle con el tiempo de cada fase enviado al medidor y a las trazas."""
+        # La simulación mide sus propias fases dentro de actualizar
+        reloj = time.perf_counter
+        t0 = reloj()
+        self.manejar_eventos()
+        t1 = reloj()
+        self.actualizar(dt)
+        t2 = reloj()
+        if dibujar:
+            self.dibujar()
+        t3 = reloj()
+        # Lo que se lee tras los eventos: una tecla puede haber activado o quitado algo
+        medidor = self.medidor if self.mostrar_rendimiento else None
+        if medidor is not None:
+            medidor.acumular('eventos', t1 - t0)
+            if dibujar:
+                medidor.acumular('dibujo', t3 - t2 - medidor.acumulado('flip'))
+            medidor.terminar_frame(dt)
+        trazas = self.trazas
+        if trazas is not None:
+            trazas.registrar('frame', t0, t3, {'frame': self._iteracion, 'dt_ms': dt,
+                                               'enemigos': len(self.enemigos),
+                                               'proyectiles': len(self.proyectiles)})
+            trazas.registrar('manejar_eventos', t0, t1)
+            trazas.registrar('actualizar', t1, t2)
+            if dibujar:
+                trazas.registrar('dibujar', t2, t3)
+
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Defense Zone 3 HD")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="semilla de la partida (por defecto, aleatoria)")
+    parser.add_argument("--grabar", metavar="ARCHIVO", default=None,
+                        help="guarda las órdenes de la partida para reproducirla con grabacion.py")
+    parser.add_argument("--perfilar", action="store_true",
+                        help="perfila con cProfile todo el bucle principal (F9 inicia/detiene una captura)")
+    parser.add_argument("--perfilar-oleada", type=int, metavar="N", default=None,
+                        help="guarda un perfil aparte de la oleada N (0 = de cada oleada)")
+    parser.add_argument("--trazas", action="store_true",
+                        help="graba spans de cada frame desde el inicio (F10 exporta; si no, F10 empieza)")
+    parser.add_argument("--perfiles", metavar="DIRECTORIO", default="perfiles",
+                        help="directorio de los .pstats, sus resúmenes y las trazas")
+    argumentos = parser.parse_args()
     try:
-        juego = DefenseZone3HD()
+        juego = DefenseZone3HD(argumentos.semilla, argumentos.grabar, argumentos.perfilar,
+                               argumentos.perfilar_oleada, argumentos.perfiles, argumentos.trazas)
         juego.ejecutar()
     except Exception as e:
         print(f"Error crítico del juego: {e}") 
\ No newline at end of file
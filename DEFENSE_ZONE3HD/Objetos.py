@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
+import itertools
 import pygame
 
+# Contador compartido de IDs; más barato que consultar el reloj por instancia
+_contador_ids = itertools.count(1)
+
 class Objetos(ABC):
-    
+    # Posición y estado son atributos planos en ranuras: son los campos más
+    # leídos del bucle de juego y así se evita una propiedad por acceso
+    __slots__ = ('x', 'y', 'activo', '_id')
     
     def __init__(self, x: float, y: float):
         """
@@ -12,45 +18,12 @@ class Objetos(ABC):
             x (float): Posición inicial en el eje X
             y (float): Posición inicial en el eje Y
         """
-        # Encapsulamiento: propiedades protegidas de la clase
-        self._x = float(x)
-        self._y = float(y)
-        self._activo = True
+        self.x = float(x)
+        self.y = float(y)
+        self.activo = True
         
         # ID único para cada objeto (útil para depuración)
-        import time
-        self._id = int(time.time() * 1000000) % 1000000
-    
-    # Propiedades usando decoradores (getter/setter) - Encapsulamiento
-    @property
-    def x(self) -> float:
-        """Getter para la posición X"""
-        return self._x
-    
-    @x.setter
-    def x(self, valor: float):
-        """Setter para la posición X con validación"""
-        self._x = float(valor)
-    
-    @property
-    def y(self) -> float:
-        """Getter para la posición Y"""
-        return self._y
-    
-    @y.setter
-    def y(self, valor: float):
-        """Setter para la posición Y con validación"""
-        self._y = float(valor)
-    
-    @property
-    def activo(self) -> bool:
-        """Getter para el estado activo"""
-        return self._activo
-    
-    @activo.setter
-    def activo(self, valor: bool):
-        """Setter para el estado activo"""
-        self._activo = bool(valor)
+        self._id = next(_contador_ids)
     
     @property
     def id(self) -> int:
@@ -64,7 +37,7 @@ class Objetos(ABC):
         Returns:
             tuple: (x, y) posición del objeto
         """
-        return (self._x, self._y)
+        return (self.x, self.y)
     
     def establecer_posicion(self, x: float, y: float):
         """
@@ -74,8 +47,8 @@ class Objetos(ABC):
             x (float): Nueva posición X
             y (float): Nueva posición Y
         """
-        self._x = float(x)
-        self._y = float(y)
+        self.x = float(x)
+        self.y = float(y)
     
     def distancia_a(self, otro_objeto) -> float:
         """
@@ -91,8 +64,8 @@ class Objetos(ABC):
             raise TypeError("El objeto debe ser una instancia de ObjetoJuego")
         
         import math
-        dx = self._x - otro_objeto.x
-        dy = self._y - otro_objeto.y
+        dx = self.x - otro_objeto.x
+        dy = self.y - otro_objeto.y
         return math.sqrt(dx * dx + dy * dy)
     
     def esta_colisionando_con(self, otro_objeto, radio_colision: float = 10.0) -> bool:
@@ -113,11 +86,11 @@ class Objetos(ABC):
     
     def desactivar(self):
         """Desactivar el objeto (marcarlo para eliminación)"""
-        self._activo = False
+        self.activo = False
     
     def reactivar(self):
         """Reactivar el objeto"""
-        self._activo = True
+        self.activo = True
     
     # Métodos abstractos que DEBEN ser implementados por las subclases
     @abstractmethod
@@ -148,11 +121,11 @@ class Objetos(ABC):
     
     def __str__(self) -> str:
         """Representación string del objeto para depuración"""
-        return f"{self.__class__.__name__}(id={self._id}, pos=({self._x:.1f}, {self._y:.1f}), activo={self._activo})"
+        return f"{self.__class__.__name__}(id={self._id}, pos=({self.x:.1f}, {self.y:.1f}), activo={self.activo})"
     
     def __repr__(self) -> str:
         """Representación técnica del objeto"""
-        return f"{self.__class__.__name__}(x={self._x}, y={self._y})"
+        return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
     
     def __eq__(self, otro) -> bool:
         """Comparación de igualdad basada en ID"""
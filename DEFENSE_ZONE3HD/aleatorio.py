@@ -0,0 +1,55 @@
+import hashlib
+import random
+import numpy as np
+from typing import Dict, Optional
+
+
+class FlujosAleatorios:
+    """
+    Generadores aleatorios con nombre, derivados de una única semilla.
+
+    Cada subsistema (oleadas, movimiento, animación...) pide su propio flujo
+    por nombre. La semilla de cada flujo se deriva de la semilla global y del
+    nombre, así que añadir tiradas en un subsistema no altera la secuencia de
+    los demás y una misma semilla reproduce siempre la misma partida.
+    """
+
+    def __init__(self, semilla: Optional[int] = None):
+        if semilla is None:
+            semilla = random.SystemRandom().randrange(2**32)
+        self.semilla = int(semilla)
+        self._flujos: Dict[str, random.Random] = {}
+        self._generadores: Dict[str, np.random.Generator] = {}
+
+    def semilla_de(self, nombre: str) -> int:
+        """Semilla de 64 bits del flujo ``nombre``."""
+        resumen = hashlib.sha256(f"{self.semilla}:{nombre}".encode()).digest()
+        return int.from_bytes(resumen[:8], 'little')
+
+    def flujo(self, nombre: str) -> random.Random:
+        """``random.Random`` con nombre; siempre la misma instancia para un nombre."""
+        flujo = self._flujos.get(nombre)
+        if flujo is None:
+            flujo = self._flujos[nombre] = random.Random(self.semilla_de(nombre))
+        return flujo
+
+    def generador(self, nombre: str) -> np.random.Generator:
+        """Generador de NumPy con nombre, para las tiradas vectorizadas."""
+        generador = self._generadores.get(nombre)
+        if generador is None:
+            generador = self._generadores[nombre] = np.random.default_rng(self.semilla_de(nombre))
+        return generador
+
+
+# Flujos de las entidades creadas fuera de una Simulacion (semilla fija)
+FLUJOS_PREDETERMINADOS = FlujosAleatorios(0)
+
+
+if __name__ == "__main__":
+    print("Probando FlujosAleatorios...")
+    a = FlujosAleatorios(1234)
+    b = FlujosAleatorios(1234)
+    print(f"Oleadas iguales: {[a.flujo('oleadas').random() for _ in range(3)] == [b.flujo('oleadas').random() for _ in range(3)]}")
+    print(f"Flujos independientes: {a.flujo('oleadas').random() != a.flujo('animacion').random()}")
+    print(f"NumPy: {a.generador('movimiento').uniform(0.9, 1.1, 3)}")
+    print("¡Prueba de flujos aleatorios completada!")
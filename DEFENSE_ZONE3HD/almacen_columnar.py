@@ -0,0 +1,64 @@
+import numpy as np
+from typing import Dict, Tuple, Callable
+
+
+class AlmacenColumnar:
+    """
+    Base para almacenes en formato estructura-de-arreglos.
+
+    Cada subclase declara sus columnas en ``COLUMNAS`` como
+    ``{nombre: (tipo NumPy, conversión a Python)}``. Las filas ``[0, n)`` son
+    las ocupadas; la capacidad crece al doble cuando hace falta y las filas
+    retiradas se eliminan compactando sin alterar el orden de las demás.
+    Las columnas nunca se liberan, así que las filas funcionan como un pool:
+    cada reserva por debajo del máximo histórico reutiliza memoria ya creada.
+    """
+
+    COLUMNAS: Dict[str, Tuple[type, Callable]] = {}
+
+    def __init__(self, capacidad: int = 64):
+        self._capacidad = max(1, capacidad)
+        self.columnas = {nombre: np.zeros(self._capacidad, dtype=tipo)
+                         for nombre, (tipo, _) in self.COLUMNAS.items()}
+        self.n = 0
+        self.maximo_n = 0
+        self.reservas = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _reservar_fila(self) -> int:
+        if self.n >= self._capacidad:
+            self._crecer()
+        fila = self.n
+        self.n += 1
+        self.reservas += 1
+        if self.n > self.maximo_n:
+            self.maximo_n = self.n
+        return fila
+
+    def estadisticas(self) -> dict:
+        """Uso de filas con el mismo formato que PoolObjetos.estadisticas."""
+        reutilizadas = self.reservas - self.maximo_n
+        return {
+            'en_uso': self.n,
+            'libres': self._capacidad - self.n,
+            'maximo_en_uso': self.maximo_n,
+            'creados': self.maximo_n,
+            'reutilizados': reutilizadas,
+            'tasa_reutilizacion': reutilizadas / self.reservas if self.reservas else 0.0,
+        }
+
+    def _crecer(self):
+        self._capacidad *= 2
+        for nombre, columna in self.columnas.items():
+            nueva = np.zeros(self._capacidad, dtype=columna.dtype)
+            nueva[:len(columna)] = columna
+            self.columnas[nombre] = nueva
+
+    def _compactar_columnas(self, vivos: np.ndarray):
+        """Conserva solo las filas marcadas en ``vivos`` (longitud ``n``)."""
+        restantes = int(np.count_nonzero(vivos))
+        for columna in self.columnas.values():
+            columna[:restantes] = columna[:self.n][vivos]
+        self.n = restantes
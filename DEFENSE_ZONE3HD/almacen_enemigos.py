@@ -0,0 +1,342 @@
+import numpy as np
+from typing import Callable, List, Tuple, Optional, Iterator
+from almacen_columnar import AlmacenColumnar
+from espacial import RejillaEspacial
+from ruta import Ruta
+from aleatorio import FLUJOS_PREDETERMINADOS
+
+
+TIPOS_ENEMIGO = ('basico', 'rapido', 'tanque')
+ID_TIPO_ENEMIGO = {tipo: indice for indice, tipo in enumerate(TIPOS_ENEMIGO)}
+ID_RAPIDO = ID_TIPO_ENEMIGO['rapido']
+
+TIPOS_DAÑO = ('normal', 'explosivo', 'perforante')
+ID_TIPO_DAÑO = {tipo: indice for indice, tipo in enumerate(TIPOS_DAÑO)}
+
+DURACION_PARPADEO_DAÑO = 150  # milisegundos
+
+# Columna -> (tipo NumPy, conversión a Python). Cada columna, salvo 'tipo',
+# respalda un atributo de Enemigo: 'x', 'y' y 'activo' los públicos de
+# Objetos y el resto el protegido equivalente ('vida' -> '_vida').
+COLUMNAS = {
+    'x': (np.float64, float),
+    'y': (np.float64, float),
+    'activo': (np.bool_, bool),
+    'vida': (np.int32, int),
+    'vida_maxima': (np.int32, int),
+    'velocidad': (np.float64, float),
+    'recompensa': (np.int32, int),
+    'distancia_ruta': (np.float64, float),
+    'duracion_ralentizacion': (np.float64, float),
+    'factor_ralentizacion': (np.float64, float),
+    'tiempo_daño': (np.float64, float),
+    'armadura': (np.int32, int),
+    'tipo': (np.int8, int),
+}
+CAMPOS_VISTA = [nombre for nombre in COLUMNAS if nombre != 'tipo']
+# Ranura (__slots__) donde cada enemigo guarda el campo mientras no está en un almacén
+RANURAS_LOCALES = tuple('_local_' + nombre for nombre in CAMPOS_VISTA)
+
+
+class CampoAlmacen:
+    """
+    Atributo de un enemigo respaldado por una columna del AlmacenEnemigos.
+
+    Mientras el enemigo está registrado en un almacén, leer o escribir el
+    atributo accede directamente a su fila; cuando no lo está, el valor se
+    guarda en la ranura ``_local_<columna>`` de la propia instancia. Así las
+    clases de enemigo funcionan como vistas ligeras sin cambiar el código
+    que usa sus atributos.
+    """
+
+    __slots__ = ('columna', 'conversion', 'local')
+
+    def __init__(self, columna: str):
+        self.columna = columna
+        self.conversion = COLUMNAS[columna][1]
+        self.local = '_local_' + columna
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        almacen = obj._almacen
+        if almacen is not None:
+            return self.conversion(almacen.columnas[self.columna][obj._fila])
+        return getattr(obj, self.local)
+
+    def __set__(self, obj, valor):
+        almacen = obj._almacen
+        if almacen is not None:
+            almacen.columnas[self.columna][obj._fila] = valor
+        else:
+            setattr(obj, self.local, self.conversion(valor))
+
+
+class AlmacenEnemigos(AlmacenColumnar):
+    """
+    Almacén de enemigos en formato estructura-de-arreglos (NumPy).
+
+    Las posiciones, vida, velocidad, distancia recorrida, ralentizaciones y
+    tipo de todos los enemigos viven en columnas contiguas. El movimiento es
+    una suma por enemigo sobre la distancia recorrida en la Ruta compartida;
+    las posiciones se derivan de ella con una sola búsqueda vectorizada. Fin
+    de las ralentizaciones, llegada al final de la ruta y la liquidación de
+    muertes y recompensas también se resuelven en bloque en cada paso.
+
+    Se comporta como una secuencia de enemigos (``append``, ``clear``,
+    ``len``, iteración), cuyos elementos son vistas sobre las filas.
+
+    Las búsquedas por alcance (``en_rango``, ``mas_cercano``) usan una
+    RejillaEspacial que se reconstruye, como mucho una vez por paso, la
+    primera vez que se consulta tras mover, añadir o eliminar enemigos.
+    """
+
+    COLUMNAS = COLUMNAS
+
+    def __init__(self, camino, capacidad: int = 64, ancho: int = 1300, alto: int = 800,
+                 rng: Optional[np.random.Generator] = None):
+        super().__init__(capacidad)
+        self.ruta = Ruta.desde(camino)
+        self.vistas: List = []
+        self._rng = rng if rng is not None else FLUJOS_PREDETERMINADOS.generador('movimiento')
+        # Se llama con cada enemigo que sale del almacén (p. ej. para devolverlo a su pool)
+        self.al_retirar: Optional[Callable] = None
+        self.rejilla = RejillaEspacial(ancho, alto)
+        # Los índices de consulta se reconstruyen cuando cambia la versión
+        self._version = 0
+        self._version_rejilla = -1
+        self._version_progreso = -1
+        self._filas_por_progreso = np.empty(0, dtype=np.intp)
+        self._progreso_ordenado = np.empty(0)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.vistas)
+
+    def __getitem__(self, indice):
+        return self.vistas[indice]
+
+    def append(self, enemigo):
+        """Registra un enemigo; desde ahora su estado vive en el almacén."""
+        if enemigo._almacen is not None:
+            return
+        fila = self._reservar_fila()
+        for nombre, local in zip(CAMPOS_VISTA, RANURAS_LOCALES):
+            self.columnas[nombre][fila] = getattr(enemigo, local)
+        self.columnas['tipo'][fila] = ID_TIPO_ENEMIGO.get(enemigo.tipo_enemigo, 0)
+        enemigo._almacen = self
+        enemigo._fila = fila
+        self.vistas.append(enemigo)
+        self._version += 1
+
+    def clear(self):
+        for enemigo in self.vistas:
+            self._desvincular(enemigo)
+            if self.al_retirar is not None:
+                self.al_retirar(enemigo)
+        self.vistas.clear()
+        self.n = 0
+        self._version += 1
+
+    def _desvincular(self, enemigo):
+        """Copia el estado de la fila a la instancia y la separa del almacén."""
+        fila = enemigo._fila
+        for nombre, local in zip(CAMPOS_VISTA, RANURAS_LOCALES):
+            conversion = COLUMNAS[nombre][1]
+            setattr(enemigo, local, conversion(self.columnas[nombre][fila]))
+        enemigo._almacen = None
+        enemigo._fila = -1
+
+    def actualizar(self, dt: float, liquidar: bool = True) -> Tuple[int, int]:
+        """
+        Avanza un paso a todos los enemigos.
+
+        Los que llegan al final de la ruta solo se marcan como inactivos; la
+        retirada se hace en ``liquidar``, que aquí se llama al final salvo que
+        se pida lo contrario (la Simulacion liquida una vez al cerrar el paso).
+
+        Args:
+            dt: Delta time en milisegundos
+            liquidar: Si es False, no se retiran los enemigos inactivos
+
+        Returns:
+            (fugas, recompensa) de ``liquidar``, o (0, 0) si no se liquida
+        """
+        n = self.n
+        if n == 0:
+            return 0, 0
+        self._version += 1
+        c = {nombre: columna[:n] for nombre, columna in self.columnas.items()}
+        activo, distancia = c['activo'], c['distancia_ruta']
+
+        # Parpadeo de daño
+        tiempo_daño = c['tiempo_daño']
+        np.subtract(tiempo_daño, dt, out=tiempo_daño, where=tiempo_daño > 0)
+
+        # Fin de las ralentizaciones
+        duracion = c['duracion_ralentizacion']
+        ralentizados = activo & (duracion > 0)
+        duracion[ralentizados] -= dt
+        c['factor_ralentizacion'][ralentizados & (duracion <= 0)] = 1.0
+
+        # Avance sobre la ruta
+        total = self.ruta.longitud_total
+        moviendose = activo & (distancia < total)
+        velocidad = c['velocidad'] * c['factor_ralentizacion']
+        rapidos = moviendose & (c['tipo'] == ID_RAPIDO)
+        velocidad[rapidos] *= self._rng.uniform(0.9, 1.1, size=int(rapidos.sum()))
+        distancia += velocidad * (dt / 1000.0) * moviendose
+        c['x'][:], c['y'][:] = self.ruta.posiciones(distancia)
+
+        # Llegada al final de la ruta
+        activo[distancia >= total] = False
+
+        if liquidar:
+            return self.liquidar()
+        return 0, 0
+
+    def liquidar(self) -> Tuple[int, int]:
+        """
+        Retira de una vez todos los enemigos marcados como inactivos.
+
+        Returns:
+            (fugas, recompensa): enemigos que llegaron al final de la ruta y
+            dinero total ganado por los enemigos eliminados
+        """
+        n = self.n
+        activo = self.columnas['activo'][:n]
+        retirados = ~activo
+        if not retirados.any():
+            return 0, 0
+        fugados = retirados & (self.columnas['distancia_ruta'][:n] >= self.ruta.longitud_total)
+        fugas = int(fugados.sum())
+        recompensa = int(self.columnas['recompensa'][:n][retirados & ~fugados].sum())
+        self._compactar(activo.copy())
+        return fugas, recompensa
+
+    def _compactar(self, vivos: np.ndarray):
+        """Elimina las filas inactivas conservando el orden de las demás."""
+        muertas = np.flatnonzero(~vivos)
+        # Estado final de las filas retiradas, leído columna a columna
+        valores = [self.columnas[nombre][muertas].tolist() for nombre in CAMPOS_VISTA]
+        for indice, fila in enumerate(muertas.tolist()):
+            enemigo = self.vistas[fila]
+            for local, columna in zip(RANURAS_LOCALES, valores):
+                setattr(enemigo, local, columna[indice])
+            enemigo._almacen = None
+            enemigo._fila = -1
+            if self.al_retirar is not None:
+                self.al_retirar(enemigo)
+        self.vistas = [enemigo for enemigo, vivo in zip(self.vistas, vivos.tolist()) if vivo]
+        self._compactar_columnas(vivos)
+        self._version += 1
+        # Las filas anteriores a la primera retirada no cambian de posición
+        for fila in range(int(muertas[0]) if len(muertas) else 0, len(self.vistas)):
+            self.vistas[fila]._fila = fila
+
+    def aplicar_impactos(self, filas: np.ndarray, daños: np.ndarray, tipos_daño: np.ndarray):
+        """
+        Aplica un lote de impactos en una sola pasada.
+
+        Usa las mismas reglas de resistencia que ``_calcular_resistencia_daño``
+        de cada clase de enemigo. Una fila puede aparecer varias veces.
+
+        Args:
+            filas: Fila del enemigo alcanzado por cada impacto
+            daños: Daño base de cada impacto
+            tipos_daño: Índice en TIPOS_DAÑO de cada impacto
+        """
+        if len(filas) == 0:
+            return
+        tipo = self.columnas['tipo'][filas]
+        armadura = self.columnas['armadura'][filas]
+        daño = np.asarray(daños, dtype=np.int64).copy()
+
+        explosivo_rapido = (tipo == ID_RAPIDO) & (tipos_daño == ID_TIPO_DAÑO['explosivo'])
+        daño[explosivo_rapido] = (daño[explosivo_rapido] * 1.2).astype(np.int64)
+        blindado = (armadura > 0) & (tipos_daño != ID_TIPO_DAÑO['perforante'])
+        daño[blindado] = np.maximum(1, daño[blindado] - armadura[blindado])
+
+        vida = self.columnas['vida']
+        np.subtract.at(vida, filas, daño.astype(vida.dtype))
+        self.columnas['tiempo_daño'][filas] = DURACION_PARPADEO_DAÑO
+        muertos = filas[vida[filas] <= 0]
+        vida[muertos] = 0
+        self.columnas['activo'][muertos] = False
+        if len(muertos):
+            self._version += 1
+
+    def _rejilla_actual(self) -> RejillaEspacial:
+        if self._version_rejilla != self._version:
+            n = self.n
+            self.rejilla.reconstruir(self.columnas['x'][:n], self.columnas['y'][:n],
+                                     self.columnas['activo'][:n])
+            self._version_rejilla = self._version
+        return self.rejilla
+
+    def _orden_progreso(self):
+        """Filas activas ordenadas por distancia recorrida y esas distancias."""
+        if self._version_progreso != self._version:
+            filas = np.flatnonzero(self.columnas['activo'][:self.n])
+            distancias = self.columnas['distancia_ruta'][filas]
+            orden = np.argsort(distancias, kind='stable')
+            self._filas_por_progreso = filas[orden]
+            self._progreso_ordenado = distancias[orden]
+            self._version_progreso = self._version
+        return self._filas_por_progreso, self._progreso_ordenado
+
+    def mas_avanzado(self, intervalos: List[Tuple[float, float]]) -> Optional[object]:
+        """
+        Enemigo activo más avanzado cuya distancia cae en alguno de los intervalos.
+
+        Cada intervalo cuesta dos búsquedas binarias sobre los enemigos
+        ordenados por progreso.
+        """
+        filas, progreso = self._orden_progreso()
+        if len(filas) == 0:
+            return None
+        mejor = -1
+        for inicio, fin in intervalos:
+            hasta = int(np.searchsorted(progreso, fin, side='right'))
+            if hasta > 0 and progreso[hasta - 1] >= inicio:
+                if mejor < 0 or progreso[hasta - 1] > progreso[mejor]:
+                    mejor = hasta - 1
+        if mejor < 0:
+            return None
+        return self.vistas[filas[mejor]]
+
+    def ocupacion_intervalos(self, inicios: np.ndarray, fines: np.ndarray) -> np.ndarray:
+        """
+        Para cada intervalo [inicio, fin] de la ruta, si contiene algún enemigo activo.
+
+        Todos los intervalos se resuelven juntos con dos búsquedas binarias
+        vectorizadas sobre los enemigos ordenados por progreso.
+        """
+        _, progreso = self._orden_progreso()
+        desde = np.searchsorted(progreso, inicios, side='left')
+        hasta = np.searchsorted(progreso, fines, side='right')
+        return hasta > desde
+
+    def pares_en_radio(self, x: np.ndarray, y: np.ndarray, radios: np.ndarray):
+        """
+        Broadphase por lotes: pares (consulta, fila de enemigo activo) en contacto.
+
+        Cada consulta solo se compara con los enemigos de su celda de la
+        rejilla y de las adyacentes.
+        """
+        consultas, filas = self._rejilla_actual().pares_vecinos(x, y, radios)
+        activos = self.columnas['activo'][filas]
+        return consultas[activos], filas[activos]
+
+    def en_rango(self, x: float, y: float, radio: float) -> List:
+        """Enemigos activos a distancia <= radio de (x, y), en orden de llegada."""
+        filas = np.sort(self._rejilla_actual().consultar_rango(x, y, radio))
+        return [self.vistas[fila] for fila in filas.tolist()]
+
+    def mas_cercano(self, x: float, y: float, radio: float) -> Optional[object]:
+        """Enemigo activo más cercano a (x, y) dentro del radio, o None."""
+        if self.n == 0:
+            return None
+        fila = self._rejilla_actual().mas_cercano(x, y, radio)
+        if fila < 0:
+            return None
+        return self.vistas[fila]
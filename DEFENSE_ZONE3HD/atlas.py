@@ -0,0 +1,294 @@
+"""
+Atlas de texturas para los sprites de assets/.
+
+Cada grupo de carpetas (tanques, efectos, interfaz) se escala al tamaño de
+juego, se recorta a lo visible y se empaqueta en una o varias páginas PNG.
+Mapa/Mapa.png se queda fuera: su carretera pintada no sigue la polilínea de
+``crear_camino`` y los enemigos irían campo a través.
+Las páginas y su índice JSON se guardan en assets/atlas/ la primera vez y
+las siguientes ejecuciones cargan solo esas páginas (una imagen por página
+en lugar de un archivo por sprite); si cambia algún PNG de origen se
+reconstruyen. Cada página se convierte una vez al formato de la pantalla
+con ``convert_alpha`` y los sprites son subsuperficies suyas, así que
+blitearlos no convierte nada. Lo que se deriva de esos sprites (tanques
+girados, paneles de la interfaz a otro tamaño) se hornea una vez al
+arrancar y se empaqueta igual, en memoria, con ``Atlas.desde_sprites``.
+
+Desde la línea de comandos construye los atlas por adelantado:
+
+Uso:
+    python atlas.py [--grupo efectos] [--reconstruir]
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Sequence, Tuple
+import pygame
+
+DIRECTORIO_ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "assets")
+DIRECTORIO_ATLAS = os.path.join(DIRECTORIO_ASSETS, "atlas")
+ANCHO_PAGINA = 2048
+# Píxeles libres entre sprites para que el escalado de uno no toque al vecino
+SEPARACION = 1
+VERSION_FORMATO = 1
+
+# Grupo -> (carpetas dentro de assets/, escala respecto al PNG original)
+GRUPOS_ATLAS: Dict[str, Tuple[Tuple[str, ...], float]] = {
+    'tanques': (('tanque', 'tanque_enemigo'), 0.25),
+    'efectos': (('explosiones',), 0.25),
+    'interfaz': (('Interfaz', 'Marcador'), 0.5),
+}
+# Fotogramas del impacto de un proyectil, en orden
+SECUENCIA_IMPACTO = "explosiones/Sprite_Fire_Shots_Impact_A_"
+
+# (superficie, dx, dy): se blitea en (x - dx, y - dy) para centrarla en (x, y)
+Sprite = Tuple[pygame.Surface, int, int]
+# (página, x, y, ancho, alto, dx, dy)
+Region = Tuple[int, int, int, int, int, int, int]
+
+
+def _archivos_grupo(grupo: str, directorio_assets: str) -> List[Tuple[str, str]]:
+    """(nombre, ruta) de cada PNG del grupo; el nombre es 'carpeta/archivo' sin extensión."""
+    carpetas, _ = GRUPOS_ATLAS[grupo]
+    archivos = []
+    for carpeta in carpetas:
+        ruta_carpeta = os.path.join(directorio_assets, carpeta)
+        for archivo in sorted(os.listdir(ruta_carpeta)):
+            if archivo.lower().endswith(".png"):
+                archivos.append((f"{carpeta}/{os.path.splitext(archivo)[0]}",
+                                 os.path.join(ruta_carpeta, archivo)))
+    return archivos
+
+
+def _firma(grupo: str, archivos: List[Tuple[str, str]]) -> str:
+    """Cambia si cambia cualquier PNG de origen, la escala o el formato del atlas."""
+    _, escala = GRUPOS_ATLAS[grupo]
+    resumen = hashlib.sha1(f"{VERSION_FORMATO}:{escala}:{ANCHO_PAGINA}:{SEPARACION}".encode())
+    for nombre, ruta in archivos:
+        estado = os.stat(ruta)
+        resumen.update(f"{nombre}:{estado.st_size}:{estado.st_mtime_ns}".encode())
+    return resumen.hexdigest()
+
+
+def empaquetar(imagenes: Dict[str, pygame.Surface],
+               ancho_pagina: int = ANCHO_PAGINA) -> Tuple[List[pygame.Surface], Dict[str, Tuple[int, int, int]]]:
+    """
+    Empaqueta por estantes: de más alta a más baja, de izquierda a derecha,
+    y un estante nuevo (o una página nueva) cuando no cabe.
+
+    Returns:
+        Las páginas y, por nombre, (página, x, y) de cada imagen
+    """
+    orden = sorted(imagenes, key=lambda nombre: (-imagenes[nombre].get_height(),
+                                                  -imagenes[nombre].get_width(), nombre))
+    posiciones: Dict[str, Tuple[int, int, int]] = {}
+    tamaños_paginas: List[List[int]] = []
+    pagina, x, y, alto_estante = -1, 0, 0, 0
+    for nombre in orden:
+        ancho, alto = imagenes[nombre].get_size()
+        if ancho > ancho_pagina or alto > ancho_pagina:
+            raise ValueError(f"{nombre} ({ancho}x{alto}) no cabe en una página de {ancho_pagina}")
+        if pagina >= 0 and x + ancho > ancho_pagina:
+            x, y, alto_estante = 0, y + alto_estante + SEPARACION, 0
+        if pagina < 0 or y + alto > ancho_pagina:
+            pagina, x, y, alto_estante = pagina + 1, 0, 0, 0
+            tamaños_paginas.append([0, 0])
+        posiciones[nombre] = (pagina, x, y)
+        x += ancho + SEPARACION
+        alto_estante = max(alto_estante, alto)
+        usado = tamaños_paginas[pagina]
+        usado[0], usado[1] = max(usado[0], x - SEPARACION), max(usado[1], y + alto)
+
+    paginas = [pygame.Surface(tamaño, pygame.SRCALPHA) for tamaño in tamaños_paginas]
+    for nombre, (pagina, x, y) in posiciones.items():
+        paginas[pagina].blit(imagenes[nombre], (x, y))
+    return paginas, posiciones
+
+
+def componer(capas: Sequence[Sprite]) -> Sprite:
+    """Superpone sprites anclados en el mismo punto (p. ej. casco y cañón de un tanque)."""
+    izquierda = min(-dx for _, dx, _ in capas)
+    arriba = min(-dy for _, _, dy in capas)
+    derecha = max(superficie.get_width() - dx for superficie, dx, _ in capas)
+    abajo = max(superficie.get_height() - dy for superficie, _, dy in capas)
+    resultado = pygame.Surface((derecha - izquierda, abajo - arriba), pygame.SRCALPHA)
+    for superficie, dx, dy in capas:
+        resultado.blit(superficie, (-dx - izquierda, -dy - arriba))
+    return resultado, -izquierda, -arriba
+
+
+def girar(sprite: Sprite, grados: float, escala: float = 1.0) -> Sprite:
+    """
+    El sprite girado ``grados`` en sentido horario alrededor de su ancla y
+    escalado, recortado a lo visible. Los PNG de assets/ miran hacia arriba.
+    """
+    superficie, dx, dy = sprite
+    # Centrar el ancla para que rotozoom gire alrededor de ella
+    radio = max(dx, dy, superficie.get_width() - dx, superficie.get_height() - dy)
+    centrada = pygame.Surface((2 * radio, 2 * radio), pygame.SRCALPHA)
+    centrada.blit(superficie, (radio - dx, radio - dy))
+    girada = pygame.transform.rotozoom(centrada, -grados, escala)
+    caja = girada.get_bounding_rect()
+    if caja.w == 0 or caja.h == 0:
+        caja = pygame.Rect(0, 0, 1, 1)
+    return (girada.subsurface(caja).copy(),
+            girada.get_width() // 2 - caja.x, girada.get_height() // 2 - caja.y)
+
+
+class Atlas:
+    """Páginas de un grupo y sus sprites como subsuperficies, por nombre."""
+
+    def __init__(self, paginas: List[pygame.Surface], regiones: Dict[str, Region]):
+        if pygame.display.get_surface() is not None:
+            paginas = [pagina.convert_alpha() for pagina in paginas]
+        self.paginas = paginas
+        self.regiones = regiones
+        self._sprites: Dict[str, Sprite] = {
+            nombre: (paginas[pagina].subsurface((x, y, ancho, alto)), dx, dy)
+            for nombre, (pagina, x, y, ancho, alto, dx, dy) in regiones.items()
+        }
+
+    @classmethod
+    def construir(cls, grupo: str, directorio_assets: str = DIRECTORIO_ASSETS) -> "Atlas":
+        """Carga, escala, recorta y empaqueta los PNG del grupo."""
+        _, escala = GRUPOS_ATLAS[grupo]
+        recortes: Dict[str, pygame.Surface] = {}
+        anclas: Dict[str, Tuple[int, int]] = {}
+        for nombre, ruta in _archivos_grupo(grupo, directorio_assets):
+            imagen = pygame.image.load(ruta)
+            if pygame.display.get_surface() is not None:
+                imagen = imagen.convert_alpha()
+            tamaño = (max(1, round(imagen.get_width() * escala)), max(1, round(imagen.get_height() * escala)))
+            imagen = pygame.transform.smoothscale(imagen, tamaño)
+            caja = imagen.get_bounding_rect()
+            if caja.w == 0 or caja.h == 0:
+                caja = pygame.Rect(0, 0, 1, 1)
+            recortes[nombre] = imagen.subsurface(caja).copy()
+            # El sprite se centra donde estaba el centro del PNG original
+            anclas[nombre] = (tamaño[0] // 2 - caja.x, tamaño[1] // 2 - caja.y)
+
+        paginas, posiciones = empaquetar(recortes)
+        regiones = {nombre: (pagina, x, y, *recortes[nombre].get_size(), *anclas[nombre])
+                    for nombre, (pagina, x, y) in posiciones.items()}
+        return cls(paginas, regiones)
+
+    @classmethod
+    def desde_sprites(cls, sprites: Dict[str, Sprite]) -> "Atlas":
+        """Empaqueta sprites ya horneados (girados, compuestos...) en un atlas en memoria."""
+        paginas, posiciones = empaquetar({nombre: superficie for nombre, (superficie, _, _) in sprites.items()})
+        regiones = {nombre: (pagina, x, y, *sprites[nombre][0].get_size(), sprites[nombre][1], sprites[nombre][2])
+                    for nombre, (pagina, x, y) in posiciones.items()}
+        return cls(paginas, regiones)
+
+    def guardar(self, grupo: str, firma: str, directorio: str = DIRECTORIO_ATLAS):
+        os.makedirs(directorio, exist_ok=True)
+        archivos_paginas = []
+        for numero, pagina in enumerate(self.paginas):
+            archivo = f"{grupo}_{numero}.png"
+            pygame.image.save(pagina, os.path.join(directorio, archivo))
+            archivos_paginas.append(archivo)
+        indice = {'version': VERSION_FORMATO, 'firma': firma,
+                  'paginas': archivos_paginas, 'regiones': self.regiones}
+        with open(os.path.join(directorio, f"{grupo}.json"), 'w', encoding='utf-8') as archivo:
+            json.dump(indice, archivo, indent=1)
+
+    @classmethod
+    def cargar(cls, grupo: str, directorio_assets: str = DIRECTORIO_ASSETS,
+               directorio: str = DIRECTORIO_ATLAS, reconstruir: bool = False) -> "Atlas":
+        """
+        Atlas del grupo desde assets/atlas/, o construido y guardado si falta
+        o está desactualizado. Si no se puede escribir, se usa solo en memoria.
+        """
+        firma = _firma(grupo, _archivos_grupo(grupo, directorio_assets))
+        ruta_indice = os.path.join(directorio, f"{grupo}.json")
+        if not reconstruir and os.path.isfile(ruta_indice):
+            try:
+                with open(ruta_indice, encoding='utf-8') as archivo:
+                    indice = json.load(archivo)
+                if indice.get('firma') == firma:
+                    paginas = [pygame.image.load(os.path.join(directorio, nombre)) for nombre in indice['paginas']]
+                    return cls(paginas, {nombre: tuple(region) for nombre, region in indice['regiones'].items()})
+            except (OSError, ValueError, KeyError, pygame.error):
+                pass
+        atlas = cls.construir(grupo, directorio_assets)
+        try:
+            atlas.guardar(grupo, firma, directorio)
+        except (OSError, pygame.error):
+            pass
+        return atlas
+
+    def sprite(self, nombre: str) -> Sprite:
+        return self._sprites[nombre]
+
+    def secuencia(self, prefijo: str) -> List[Sprite]:
+        """Fotogramas cuyo nombre empieza por ``prefijo``, en orden de nombre."""
+        return [self._sprites[nombre] for nombre in sorted(self._sprites) if nombre.startswith(prefijo)]
+
+    def blit(self, nombre: str, x: float, y: float) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """Elemento para ``Surface.blits`` que centra el sprite en (x, y)."""
+        superficie, dx, dy = self._sprites[nombre]
+        return superficie, (int(x) - dx, int(y) - dy)
+
+    def panel(self, nombre: str, ancho: int, alto: int, borde: int) -> pygame.Surface:
+        """
+        El sprite a otro tamaño sin deformar su marco (nueve partes): las
+        esquinas de ``borde`` píxeles se copian tal cual y solo se estiran
+        los lados y el centro. Para hornear una vez, no para cada frame.
+        """
+        superficie, _, _ = self._sprites[nombre]
+        w, h = superficie.get_size()
+        borde = min(borde, w // 2, h // 2, ancho // 2, alto // 2)
+        resultado = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        columnas = ((0, borde, 0, borde), (borde, w - 2 * borde, borde, ancho - 2 * borde),
+                    (w - borde, borde, ancho - borde, borde))
+        filas = ((0, borde, 0, borde), (borde, h - 2 * borde, borde, alto - 2 * borde),
+                 (h - borde, borde, alto - borde, borde))
+        for x, w_origen, x_destino, w_destino in columnas:
+            for y, h_origen, y_destino, h_destino in filas:
+                if min(w_origen, h_origen, w_destino, h_destino) <= 0:
+                    continue
+                parte = superficie.subsurface((x, y, w_origen, h_origen))
+                if (w_origen, h_origen) != (w_destino, h_destino):
+                    parte = pygame.transform.smoothscale(parte, (w_destino, h_destino))
+                resultado.blit(parte, (x_destino, y_destino))
+        if pygame.display.get_surface() is not None:
+            resultado = resultado.convert_alpha()
+        return resultado
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._sprites
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Construye los atlas de texturas de assets/")
+    parser.add_argument("--grupo", choices=sorted(GRUPOS_ATLAS), default=None, help="solo este grupo")
+    parser.add_argument("--reconstruir", action="store_true", help="ignorar los atlas ya guardados")
+    argumentos = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print("Probando Atlas...")
+    for grupo in [argumentos.grupo] if argumentos.grupo else sorted(GRUPOS_ATLAS):
+        inicio = time.perf_counter()
+        atlas = Atlas.cargar(grupo, reconstruir=argumentos.reconstruir)
+        construido = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        atlas = Atlas.cargar(grupo)
+        desde_cache = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for _, ruta in _archivos_grupo(grupo, DIRECTORIO_ASSETS):
+            pygame.image.load(ruta).convert_alpha()
+        sueltos = time.perf_counter() - inicio
+        tamaños = ", ".join(f"{pagina.get_width()}x{pagina.get_height()}" for pagina in atlas.paginas)
+        print(f"{grupo}: {len(atlas)} sprites en {len(atlas.paginas)} página(s) ({tamaños}); "
+              f"primera carga {construido * 1000:.0f} ms, desde assets/atlas {desde_cache * 1000:.0f} ms, "
+              f"PNG sueltos {sueltos * 1000:.0f} ms")
+    impacto = Atlas.cargar('efectos').secuencia(SECUENCIA_IMPACTO)
+    print(f"Fotogramas de impacto: {[superficie.get_size() for superficie, _, _ in impacto]}")
+    print("¡Prueba de atlas completada!")
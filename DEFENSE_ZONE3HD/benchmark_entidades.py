@@ -0,0 +1,141 @@
+"""
+Benchmark de memoria y rendimiento de las entidades del juego.
+
+Mide los bytes por instancia (con tracemalloc) de enemigos, torres y
+misiles sueltos, y el tiempo de los bucles calientes que trabajan objeto a
+objeto: actualizar enemigos fuera del almacén y leer/escribir posiciones.
+
+Los resultados se guardan en JSON para comparar dos commits. El script
+solo usa la API pública de las entidades y no importa nada del resto de
+benchmarks, así que se puede copiar a un checkout anterior (p. ej. antes
+de los __slots__) y medir allí:
+
+    git worktree add /tmp/antes <commit>
+    cp benchmark_entidades.py /tmp/antes/DEFENSE_ZONE3HD/
+    (cd /tmp/antes/DEFENSE_ZONE3HD && python benchmark_entidades.py -o antes.json)
+    python benchmark_entidades.py -o despues.json --comparar /tmp/antes/DEFENSE_ZONE3HD/antes.json
+
+Uso:
+    python benchmark_entidades.py [cantidad] [-o archivo.json] [--comparar base.json]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from Enemigo import EnemigoBasico, EnemigoRapido, EnemigoTanque
+from misiles import misiles
+from simulacion import TorreCañon, crear_camino
+
+
+def medir_memoria(fabrica, cantidad: int) -> float:
+    """Bytes asignados por instancia al crear ``cantidad`` objetos."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [fabrica(i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (despues - antes) / cantidad
+
+
+def medir_tiempo(funcion, repeticiones: int = 5) -> float:
+    """Mejor tiempo de ``repeticiones`` ejecuciones, en milisegundos."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def ejecutar(cantidad: int = 5000) -> dict:
+    camino = crear_camino()
+    clases = [EnemigoBasico, EnemigoRapido, EnemigoTanque]
+
+    def crear_enemigo(i):
+        enemigo = clases[i % 3](*camino[0])
+        enemigo.ruta = camino
+        return enemigo
+
+    resultados = {
+        'bytes_enemigo': medir_memoria(crear_enemigo, cantidad),
+        'bytes_torre': medir_memoria(lambda i: TorreCañon(i % 1300, i % 800), cantidad),
+        'bytes_misil': medir_memoria(lambda i: misiles(0, 0, 100, 100), cantidad),
+    }
+
+    enemigos = [crear_enemigo(i) for i in range(cantidad)]
+    torres = [TorreCañon(i % 1300, i % 800) for i in range(cantidad)]
+
+    def actualizar_enemigos():
+        for _ in range(10):
+            for enemigo in enemigos:
+                enemigo.actualizar(16.67)
+
+    def mover_posiciones(objetos):
+        for _ in range(10):
+            for objeto in objetos:
+                objeto.x = objeto.x + 0.5
+                objeto.y = objeto.y - 0.5
+                if not objeto.activo:
+                    pass
+
+    resultados['ms_actualizar_10_frames'] = medir_tiempo(actualizar_enemigos, 3)
+    resultados['ms_posicion_enemigos_10_frames'] = medir_tiempo(lambda: mover_posiciones(enemigos), 3)
+    resultados['ms_posicion_torres_10_frames'] = medir_tiempo(lambda: mover_posiciones(torres), 3)
+    return resultados
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def comparar(base: dict, actual: dict):
+    print(f"\nComparación con {base.get('commit') or 'base'}:")
+    for clave, ahora in actual['resultados'].items():
+        antes = base.get('resultados', {}).get(clave)
+        if antes is None:
+            continue
+        print(f"  {clave:32} {antes:9.1f} -> {ahora:9.1f} ({ahora / antes:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de memoria y tiempo de las entidades")
+    parser.add_argument("cantidad", type=int, nargs="?", default=5000, help="instancias por medición")
+    parser.add_argument("-o", "--salida", default="benchmark_entidades.json")
+    parser.add_argument("--comparar", default=None, help="JSON de otro commit con el que comparar")
+    argumentos = parser.parse_args()
+
+    print(f"Benchmark de entidades ({argumentos.cantidad} instancias)...")
+    informe = {
+        'commit': _commit_actual(),
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'cantidad': argumentos.cantidad,
+        'resultados': ejecutar(argumentos.cantidad),
+    }
+    for clave, valor in informe['resultados'].items():
+        print(f"{clave}: {valor:.1f}")
+
+    with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(informe, archivo, indent=2)
+    print(f"Resultados en {argumentos.salida}")
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        if base.get('cantidad') != informe['cantidad']:
+            print(f"Aviso: la base se midió con {base.get('cantidad')} instancias")
+        comparar(base, informe)
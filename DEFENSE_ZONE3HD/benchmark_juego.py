@@ -0,0 +1,227 @@
+"""
+Benchmark de frames completos del juego por escenarios.
+
+Cada escenario fija N enemigos repartidos por el camino, M torres de cada
+tipo y K proyectiles vivos (se reponen entre frames, fuera de la medición,
+para que la carga sea constante). Se mide por separado el manejo de
+eventos (con eventos sintéticos), ``actualizar`` y ``dibujar_juego`` sobre
+una superficie fuera de pantalla con el driver dummy de SDL, y se informa
+media, p95 y p99 de cada fase y del frame completo. Una segunda pasada con
+tracemalloc mide los bytes asignados por frame.
+
+Los resultados se guardan en JSON para comparar dos commits:
+
+    python benchmark_juego.py -o antes.json
+    python benchmark_juego.py -o despues.json --comparar antes.json
+
+Los sonidos y recursos se buscan junto al paquete, así que funciona tanto
+desde DEFENSE_ZONE3HD/ como desde la raíz (python DEFENSE_ZONE3HD/benchmark_juego.py).
+
+Uso:
+    python benchmark_juego.py [-f frames] [-e nombre:N,M,K ...] [-o archivo.json] [--comparar base.json]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import Main
+from simulacion import CLASES_TORRES, CLASES_ENEMIGOS
+
+# nombre: (enemigos, torres de cada tipo, proyectiles)
+ESCENARIOS = {
+    'ligero': (20, 1, 10),
+    'medio': (200, 3, 100),
+    'pesado': (1000, 8, 500),
+}
+FRAMES_CALENTAMIENTO = 30
+DT_FRAME = 1000.0 / Main.FPS
+
+
+def _percentiles(tiempos: List[float]) -> Dict[str, float]:
+    muestras = np.array(tiempos) * 1000.0
+    return {
+        'media_ms': float(muestras.mean()),
+        'p95_ms': float(np.percentile(muestras, 95)),
+        'p99_ms': float(np.percentile(muestras, 99)),
+        'max_ms': float(muestras.max()),
+    }
+
+
+class EscenarioBenchmark:
+    """Un juego preparado con una carga fija de enemigos, torres y proyectiles."""
+
+    def __init__(self, enemigos: int, torres_por_tipo: int, proyectiles: int, semilla: int = 0):
+        self.enemigos = enemigos
+        self.proyectiles = proyectiles
+        self._rng = random.Random(semilla)
+        self.juego = Main.DefenseZone3HD(semilla)
+        self.juego.pantalla = pygame.Surface((Main.ANCHO_VENTANA, Main.ALTO_VENTANA))
+        self.juego.iniciar_juego()
+        self.simulacion = self.juego.simulacion
+        self.simulacion.gestor_recursos.recursos.update({'dinero': 10**9, 'vidas': 10**9})
+        self._colocar_torres(torres_por_tipo)
+        self.reponer()
+
+    def _colocar_torres(self, por_tipo: int):
+        simulacion = self.simulacion
+        rango = max(clase(0, 0).rango for clase in CLASES_TORRES.values())
+        sitios = [(x, y) for x in range(30, simulacion.ancho, 45) for y in range(30, simulacion.alto, 45)
+                  if simulacion.ruta.intervalos_en_radio(x, y, rango)]
+        self._rng.shuffle(sitios)
+        tipos = sorted(CLASES_TORRES) * por_tipo
+        for x, y in sitios:
+            if not tipos:
+                break
+            if simulacion.posicion_valida_torre(x, y):
+                simulacion.colocar_torre(x, y, tipos.pop())
+
+    def reponer(self):
+        """Devuelve la carga a N enemigos y K proyectiles (no se mide)."""
+        simulacion = self.simulacion
+        ruta = simulacion.ruta
+        tipos = sorted(CLASES_ENEMIGOS)
+        while len(simulacion.enemigos) < self.enemigos:
+            x, y = ruta.posicion(self._rng.uniform(0, ruta.longitud_total * 0.9))
+            enemigo = simulacion.pools_enemigos[self._rng.choice(tipos)].adquirir(x, y)
+            enemigo.ruta = ruta
+            simulacion.enemigos.append(enemigo)
+        while len(simulacion.proyectiles) < self.proyectiles:
+            simulacion.proyectiles.disparar(
+                self._rng.uniform(0, simulacion.ancho), self._rng.uniform(0, simulacion.alto),
+                self._rng.uniform(0, simulacion.ancho), self._rng.uniform(0, simulacion.alto))
+
+    def _publicar_eventos(self):
+        x, y = self._rng.randrange(Main.ANCHO_VENTANA), self._rng.randrange(Main.ALTO_VENTANA)
+        for dx in range(4):
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(x + dx, y), rel=(1, 0), buttons=(0, 0, 0)))
+        for tecla in (pygame.K_2, pygame.K_1):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=tecla, mod=0, unicode='', scancode=0))
+
+    def frame(self) -> Tuple[float, float, float]:
+        """Un frame completo; devuelve los segundos de eventos, actualizar y dibujar."""
+        self._publicar_eventos()
+        t0 = time.perf_counter()
+        self.juego.manejar_eventos()
+        t1 = time.perf_counter()
+        self.juego.actualizar(DT_FRAME)
+        t2 = time.perf_counter()
+        self.juego.pantalla.fill(Main.BLANCO)
+        self.juego.dibujar_juego()
+        t3 = time.perf_counter()
+        return t1 - t0, t2 - t1, t3 - t2
+
+
+def ejecutar_escenario(enemigos: int, torres: int, proyectiles: int, frames: int) -> dict:
+    escenario = EscenarioBenchmark(enemigos, torres, proyectiles)
+    for _ in range(FRAMES_CALENTAMIENTO):
+        escenario.frame()
+        escenario.reponer()
+
+    fases = {'eventos': [], 'actualizar': [], 'dibujar': [], 'frame': []}
+    gc_antes = [estadistica['collections'] for estadistica in gc.get_stats()]
+    for _ in range(frames):
+        eventos, actualizar, dibujar = escenario.frame()
+        fases['eventos'].append(eventos)
+        fases['actualizar'].append(actualizar)
+        fases['dibujar'].append(dibujar)
+        fases['frame'].append(eventos + actualizar + dibujar)
+        escenario.reponer()
+    gc_despues = [estadistica['collections'] for estadistica in gc.get_stats()]
+
+    # Segunda pasada, más corta, solo para las asignaciones (tracemalloc ralentiza)
+    asignados = []
+    tracemalloc.start()
+    for _ in range(max(10, frames // 4)):
+        antes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        escenario.frame()
+        asignados.append(tracemalloc.get_traced_memory()[1] - antes)
+        escenario.reponer()
+    tracemalloc.stop()
+
+    resultado = {fase: _percentiles(tiempos) for fase, tiempos in fases.items()}
+    resultado['parametros'] = {'enemigos': enemigos, 'torres_por_tipo': torres,
+                               'proyectiles': proyectiles, 'frames': frames}
+    resultado['cargas'] = {'enemigos': len(escenario.simulacion.enemigos),
+                           'torres': len(escenario.simulacion.torres),
+                           'proyectiles': len(escenario.simulacion.proyectiles)}
+    resultado['asignaciones'] = {'bytes_pico_por_frame_media': float(np.mean(asignados)),
+                                 'bytes_pico_por_frame_max': int(max(asignados))}
+    resultado['gc_colecciones'] = [despues - antes for antes, despues in zip(gc_antes, gc_despues)]
+    return resultado
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def comparar(base: dict, actual: dict):
+    print(f"\nComparación con {base.get('commit') or 'base'} (frame, media y p99):")
+    for nombre, datos in actual['escenarios'].items():
+        anterior = base.get('escenarios', {}).get(nombre)
+        if anterior is None:
+            continue
+        for fase in ('actualizar', 'dibujar', 'frame'):
+            antes, ahora = anterior[fase], datos[fase]
+            print(f"  {nombre:8} {fase:10} media {antes['media_ms']:7.3f} -> {ahora['media_ms']:7.3f} ms "
+                  f"({ahora['media_ms'] / antes['media_ms']:.2f}x), "
+                  f"p99 {antes['p99_ms']:7.3f} -> {ahora['p99_ms']:7.3f} ms")
+
+
+def _leer_escenario(texto: str) -> Tuple[str, Tuple[int, int, int]]:
+    nombre, valores = texto.split(':')
+    enemigos, torres, proyectiles = (int(valor) for valor in valores.split(','))
+    return nombre, (enemigos, torres, proyectiles)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de frames del juego")
+    parser.add_argument("-f", "--frames", type=int, default=300)
+    parser.add_argument("-e", "--escenario", action="append", type=_leer_escenario, default=None,
+                        help="escenario propio nombre:enemigos,torres_por_tipo,proyectiles")
+    parser.add_argument("-o", "--salida", default="benchmark_juego.json")
+    parser.add_argument("--comparar", default=None, help="JSON de otro commit con el que comparar")
+    argumentos = parser.parse_args()
+
+    escenarios = dict(argumentos.escenario) if argumentos.escenario else ESCENARIOS
+    informe = {
+        'commit': _commit_actual(),
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'pygame': pygame.version.ver,
+        'plataforma': platform.platform(),
+        'escenarios': {},
+    }
+    for nombre, (enemigos, torres, proyectiles) in escenarios.items():
+        print(f"Escenario {nombre}: {enemigos} enemigos, {torres} torres por tipo, {proyectiles} proyectiles...")
+        datos = ejecutar_escenario(enemigos, torres, proyectiles, argumentos.frames)
+        informe['escenarios'][nombre] = datos
+        for fase in ('eventos', 'actualizar', 'dibujar', 'frame'):
+            print(f"  {fase:10} media {datos[fase]['media_ms']:7.3f} ms  p95 {datos[fase]['p95_ms']:7.3f}  "
+                  f"p99 {datos[fase]['p99_ms']:7.3f}")
+        print(f"  asignado por frame: {datos['asignaciones']['bytes_pico_por_frame_media'] / 1024:.1f} KiB")
+
+    with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(informe, archivo, indent=2)
+    print(f"Resultados en {argumentos.salida}")
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            comparar(json.load(archivo), informe)
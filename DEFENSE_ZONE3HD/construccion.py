@@ -0,0 +1,110 @@
+import math
+import numpy as np
+from typing import Tuple
+from ruta import Ruta
+
+
+class MapaConstruccion:
+    """
+    Máscara rasterizada de dónde se puede construir una torre.
+
+    El mapa se divide en celdas de ``tamaño_celda`` píxeles. La capa del
+    camino se calcula una sola vez con la distancia de cada celda a los
+    segmentos de la ruta (no solo a sus vértices); la de las torres es un
+    contador por celda que se suma al colocar una torre y se resta al
+    venderla, tocando solo las celdas de su alrededor. Validar una posición
+    es una consulta a un arreglo, así que puede hacerse cada frame para la
+    vista previa bajo el cursor.
+
+    Una celda se bloquea si cualquier punto dentro de ella quedaría a menos
+    de la distancia mínima, de modo que la cuadrícula nunca admite una
+    posición inválida (a cambio de rechazar un borde de media diagonal).
+    """
+
+    def __init__(self, camino, ancho: int, alto: int, distancia_camino: float,
+                 distancia_torres: float, tamaño_celda: int = 4):
+        self.ruta = Ruta.desde(camino)
+        self.ancho = ancho
+        self.alto = alto
+        self.tamaño_celda = tamaño_celda
+        self.distancia_torres = distancia_torres
+        self.filas = math.ceil(alto / tamaño_celda)
+        self.columnas = math.ceil(ancho / tamaño_celda)
+        # Margen para que el bloqueo cubra toda la celda y no solo su centro
+        self._margen = tamaño_celda * math.sqrt(2) / 2
+        self._centros_x = (np.arange(self.columnas) + 0.5) * tamaño_celda
+        self._centros_y = (np.arange(self.filas) + 0.5) * tamaño_celda
+
+        self.libre_camino = self._distancia_al_camino() >= distancia_camino + self._margen
+        self.libre_camino.flags.writeable = False
+        self.bloqueos_torres = np.zeros((self.filas, self.columnas), dtype=np.int16)
+        # Aumenta con cada cambio de la capa de torres (p. ej. para rehornear el fondo)
+        self.version = 0
+
+    def _distancia_al_camino(self) -> np.ndarray:
+        """Distancia de cada centro de celda al segmento de ruta más cercano."""
+        px = self._centros_x[None, :]
+        py = self._centros_y[:, None]
+        ruta = self.ruta
+        if len(ruta.longitudes) == 0:
+            x0, y0 = ruta.vertices[0]
+            return np.hypot(px - x0, py - y0)
+        minima = np.full((self.filas, self.columnas), np.inf)
+        for (x0, y0), (dx, dy), longitud in zip(ruta.vertices[:-1], ruta.direcciones, ruta.longitudes):
+            t = np.clip((px - x0) * dx + (py - y0) * dy, 0.0, longitud)
+            np.minimum(minima, np.hypot(px - x0 - dx * t, py - y0 - dy * t), out=minima)
+        return minima
+
+    def celda(self, x: float, y: float) -> Tuple[int, int]:
+        return int(y // self.tamaño_celda), int(x // self.tamaño_celda)
+
+    def es_valida(self, x: float, y: float) -> bool:
+        if not (0 <= x < self.ancho and 0 <= y < self.alto):
+            return False
+        fila, columna = self.celda(x, y)
+        return bool(self.libre_camino[fila, columna]) and self.bloqueos_torres[fila, columna] == 0
+
+    def _zona_torre(self, x: float, y: float):
+        """Rebanada de celdas alrededor de una torre y máscara de las bloqueadas."""
+        radio = self.distancia_torres + self._margen
+        c0 = max(0, int((x - radio) // self.tamaño_celda))
+        c1 = min(self.columnas, int((x + radio) // self.tamaño_celda) + 1)
+        f0 = max(0, int((y - radio) // self.tamaño_celda))
+        f1 = min(self.filas, int((y + radio) // self.tamaño_celda) + 1)
+        dx = self._centros_x[None, c0:c1] - x
+        dy = self._centros_y[f0:f1, None] - y
+        return (slice(f0, f1), slice(c0, c1)), dx * dx + dy * dy < radio * radio
+
+    def agregar_torre(self, x: float, y: float):
+        zona, bloqueadas = self._zona_torre(x, y)
+        self.bloqueos_torres[zona] += bloqueadas
+        self.version += 1
+
+    def quitar_torre(self, x: float, y: float):
+        zona, bloqueadas = self._zona_torre(x, y)
+        self.bloqueos_torres[zona] -= bloqueadas
+        self.version += 1
+
+    def reconstruir_torres(self, torres):
+        self.bloqueos_torres.fill(0)
+        self.version += 1
+        for torre in torres:
+            self.agregar_torre(torre.x, torre.y)
+
+    def construible(self) -> np.ndarray:
+        """Máscara completa (filas x columnas) de celdas donde se puede construir."""
+        return self.libre_camino & (self.bloqueos_torres == 0)
+
+
+if __name__ == "__main__":
+    print("Probando MapaConstruccion...")
+    camino = [(50, 400), (200, 400), (200, 200), (400, 200)]
+    mapa = MapaConstruccion(camino, 1300, 800, distancia_camino=50, distancia_torres=60)
+    print(f"Celdas: {mapa.filas}x{mapa.columnas}, construibles: {int(mapa.construible().sum())}")
+    print(f"Mitad de un segmento (125, 410): {mapa.es_valida(125, 410)}")
+    print(f"Lejos del camino (600, 600): {mapa.es_valida(600, 600)}")
+    mapa.agregar_torre(600, 600)
+    print(f"Junto a una torre (640, 600): {mapa.es_valida(640, 600)}")
+    mapa.quitar_torre(600, 600)
+    print(f"Tras venderla: {mapa.es_valida(640, 600)}")
+    print("¡Prueba de mapa de construcción completada!")
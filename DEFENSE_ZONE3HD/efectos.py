@@ -0,0 +1,91 @@
+import pygame
+from typing import List, Optional, Tuple
+from Objetos import Objetos
+from pool_objetos import PoolObjetos
+
+DURACION_IMPACTO = 250  # milisegundos
+
+# (superficie, dx, dy) de un fotograma del atlas, ver atlas.Sprite
+Fotograma = Tuple[pygame.Surface, int, int]
+
+
+class EfectoImpacto(Objetos):
+    """Destello breve en el punto donde un proyectil alcanza a un enemigo."""
+
+    __slots__ = ('tiempo_restante',)
+
+    def __init__(self, x: float, y: float):
+        super().__init__(x, y)
+        self.tiempo_restante = DURACION_IMPACTO
+
+    def reiniciar(self, x: float, y: float):
+        self.establecer_posicion(x, y)
+        self.activo = True
+        self.tiempo_restante = DURACION_IMPACTO
+
+    def actualizar(self, dt: float):
+        self.tiempo_restante -= dt
+        if self.tiempo_restante <= 0:
+            self.activo = False
+
+    @property
+    def progreso(self) -> float:
+        return 1.0 - self.tiempo_restante / DURACION_IMPACTO
+
+    def dibujar(self, pantalla: pygame.Surface):
+        progreso = self.progreso
+        radio = int(4 + 12 * progreso)
+        color = (255, int(200 * (1.0 - progreso)), 0)
+        pygame.draw.circle(pantalla, color, (int(self.x), int(self.y)), radio, 2)
+
+
+class GestorEfectos:
+    """
+    Efectos visuales activos, reutilizados a través de un PoolObjetos.
+
+    Los efectos terminados se devuelven al pool en lugar de descartarse, de
+    modo que en las oleadas más intensas no se crean objetos nuevos. Con
+    ``fotogramas_impacto`` (sacados de un atlas) los impactos se animan con
+    esos sprites en un único ``blits``; sin ellos se dibujan con primitivas.
+    """
+
+    def __init__(self, fotogramas_impacto: Optional[List[Fotograma]] = None):
+        self.pool = PoolObjetos(EfectoImpacto)
+        self.activos: List[EfectoImpacto] = []
+        self.fotogramas_impacto = fotogramas_impacto or []
+
+    def crear_impacto(self, x: float, y: float) -> EfectoImpacto:
+        efecto = self.pool.adquirir(x, y)
+        self.activos.append(efecto)
+        return efecto
+
+    def actualizar(self, dt: float):
+        terminados = False
+        for efecto in self.activos:
+            efecto.actualizar(dt)
+            if not efecto.activo:
+                self.pool.liberar(efecto)
+                terminados = True
+        if terminados:
+            self.activos = [efecto for efecto in self.activos if efecto.activo]
+
+    def dibujar(self, pantalla: pygame.Surface):
+        fotogramas = self.fotogramas_impacto
+        if not fotogramas:
+            for efecto in self.activos:
+                efecto.dibujar(pantalla)
+            return
+        ultimo = len(fotogramas) - 1
+        secuencia = []
+        for efecto in self.activos:
+            superficie, dx, dy = fotogramas[min(ultimo, int(efecto.progreso * len(fotogramas)))]
+            secuencia.append((superficie, (int(efecto.x) - dx, int(efecto.y) - dy)))
+        pantalla.blits(secuencia, False)
+
+    def clear(self):
+        for efecto in self.activos:
+            self.pool.liberar(efecto)
+        self.activos.clear()
+
+    def __len__(self) -> int:
+        return len(self.activos)
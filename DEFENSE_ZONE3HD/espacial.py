@@ -0,0 +1,142 @@
+import math
+import numpy as np
+
+
+class RejillaEspacial:
+    """
+    Hash espacial de rejilla uniforme sobre coordenadas del mundo.
+
+    Las filas de un almacén se ordenan por celda (orden por filas de la
+    rejilla) y se guarda el desplazamiento de inicio de cada celda, de modo
+    que las celdas contiguas de una misma fila de la rejilla forman un único
+    tramo. Una consulta por radio solo examina los tramos que cubren el
+    cuadrado que rodea al círculo. Los puntos fuera del área se asignan a la
+    celda del borde más próxima.
+    """
+
+    def __init__(self, ancho: int = 1300, alto: int = 800, tamaño_celda: float = 64):
+        self.tamaño_celda = float(tamaño_celda)
+        self.columnas_rejilla = max(1, math.ceil(ancho / self.tamaño_celda))
+        self.filas_rejilla = max(1, math.ceil(alto / self.tamaño_celda))
+        total = self.columnas_rejilla * self.filas_rejilla
+        self._inicio = np.zeros(total + 1, dtype=np.intp)
+        self._orden = np.empty(0, dtype=np.intp)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+    def _celdas(self, x: np.ndarray, y: np.ndarray):
+        cx = np.clip((x // self.tamaño_celda).astype(np.intp), 0, self.columnas_rejilla - 1)
+        cy = np.clip((y // self.tamaño_celda).astype(np.intp), 0, self.filas_rejilla - 1)
+        return cx, cy
+
+    def reconstruir(self, x: np.ndarray, y: np.ndarray, activos: np.ndarray):
+        """
+        Vuelve a indexar todas las filas activas.
+
+        Args:
+            x, y: Posiciones de las filas (se guardan copias)
+            activos: Máscara de filas a indexar
+        """
+        self._x = np.array(x, dtype=np.float64)
+        self._y = np.array(y, dtype=np.float64)
+        filas = np.flatnonzero(activos)
+        cx, cy = self._celdas(self._x[filas], self._y[filas])
+        celda = cy * self.columnas_rejilla + cx
+        orden = np.argsort(celda, kind='stable')
+        self._orden = filas[orden]
+        conteo = np.bincount(celda, minlength=len(self._inicio) - 1)
+        self._inicio[0] = 0
+        np.cumsum(conteo, out=self._inicio[1:])
+
+    def candidatos(self, x: float, y: float, radio: float) -> np.ndarray:
+        """Filas de las celdas que tocan el cuadrado de lado 2·radio centrado en (x, y)."""
+        if len(self._orden) == 0:
+            return self._orden
+        t = self.tamaño_celda
+        cx0 = min(max(int((x - radio) // t), 0), self.columnas_rejilla - 1)
+        cx1 = min(max(int((x + radio) // t), 0), self.columnas_rejilla - 1)
+        cy0 = min(max(int((y - radio) // t), 0), self.filas_rejilla - 1)
+        cy1 = min(max(int((y + radio) // t), 0), self.filas_rejilla - 1)
+        inicio = self._inicio
+        tramos = []
+        for cy in range(cy0, cy1 + 1):
+            base = cy * self.columnas_rejilla
+            a = inicio[base + cx0]
+            b = inicio[base + cx1 + 1]
+            if b > a:
+                tramos.append(self._orden[a:b])
+        if not tramos:
+            return self._orden[:0]
+        if len(tramos) == 1:
+            return tramos[0]
+        return np.concatenate(tramos)
+
+    def consultar_rango(self, x: float, y: float, radio: float) -> np.ndarray:
+        """Filas indexadas a distancia <= radio de (x, y)."""
+        filas = self.candidatos(x, y, radio)
+        if len(filas) == 0:
+            return filas
+        dx = self._x[filas] - x
+        dy = self._y[filas] - y
+        return filas[dx * dx + dy * dy <= radio * radio]
+
+    def mas_cercano(self, x: float, y: float, radio: float) -> int:
+        """
+        Fila indexada más cercana a (x, y) dentro del radio, o -1.
+
+        En caso de empate gana la fila de menor índice.
+        """
+        filas = self.candidatos(x, y, radio)
+        if len(filas) == 0:
+            return -1
+        distancia = np.hypot(self._x[filas] - x, self._y[filas] - y)
+        minima = distancia.min()
+        if minima > radio:
+            return -1
+        return int(filas[distancia == minima].min())
+
+    def pares_vecinos(self, x: np.ndarray, y: np.ndarray, radios: np.ndarray):
+        """
+        Pares (consulta, fila) a distancia <= radio, para muchas consultas a la vez.
+
+        Cada consulta solo examina su celda y las ocho adyacentes, por lo que
+        los radios no deben superar ``tamaño_celda``.
+
+        Returns:
+            (consultas, filas): índice de la consulta y fila indexada de cada par
+        """
+        vacio = np.empty(0, dtype=np.intp)
+        if len(self._orden) == 0 or len(x) == 0:
+            return vacio, vacio
+        cx, cy = self._celdas(x, y)
+        cx0 = np.maximum(cx - 1, 0)
+        cx1 = np.minimum(cx + 1, self.columnas_rejilla - 1)
+
+        # Un tramo contiguo por cada una de las tres filas de celdas vecinas
+        consultas, inicios, longitudes = [], [], []
+        indices = np.arange(len(x))
+        for desplazamiento in (-1, 0, 1):
+            fila_celda = cy + desplazamiento
+            valida = (fila_celda >= 0) & (fila_celda < self.filas_rejilla)
+            base = fila_celda[valida] * self.columnas_rejilla
+            a = self._inicio[base + cx0[valida]]
+            b = self._inicio[base + cx1[valida] + 1]
+            consultas.append(indices[valida])
+            inicios.append(a)
+            longitudes.append(b - a)
+        consultas = np.concatenate(consultas)
+        inicios = np.concatenate(inicios)
+        longitudes = np.concatenate(longitudes)
+
+        total = int(longitudes.sum())
+        if total == 0:
+            return vacio, vacio
+        consultas = np.repeat(consultas, longitudes)
+        desplazamientos = np.arange(total) - np.repeat(np.cumsum(longitudes) - longitudes, longitudes)
+        filas = self._orden[np.repeat(inicios, longitudes) + desplazamientos]
+
+        dx = self._x[filas] - x[consultas]
+        dy = self._y[filas] - y[consultas]
+        radio = radios[consultas]
+        cerca = dx * dx + dy * dy <= radio * radio
+        return consultas[cerca], filas[cerca]
@@ -0,0 +1,141 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+# TTF incluidas con el juego (p. ej. arial.ttf, arial-bold.ttf); si no hay, se usa SysFont
+DIRECTORIO_FUENTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "assets", "fuentes")
+TAMAÑO_CACHE_TEXTOS = 512
+
+Color = Tuple[int, ...]
+
+
+class RegistroFuentes:
+    """
+    Fuentes compartidas, resueltas una sola vez por (nombre, tamaño, negrita).
+
+    ``pygame.font.SysFont`` consulta fontconfig en cada llamada (en Linux,
+    milisegundos); aquí se paga solo la primera vez. Si en ``directorio``
+    hay una TTF/OTF con ese nombre se usa esa, de modo que el juego se ve
+    igual en todas las máquinas.
+    """
+
+    def __init__(self, directorio: str = DIRECTORIO_FUENTES):
+        self.directorio = directorio
+        self._fuentes: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+
+    def _archivo_incluido(self, nombre: str, negrita: bool) -> Tuple[Optional[str], bool]:
+        """Ruta de la TTF incluida, y si ya es la versión en negrita."""
+        sufijos = ("-bold", "bd", "") if negrita else ("",)
+        for sufijo in sufijos:
+            for extension in (".ttf", ".otf"):
+                ruta = os.path.join(self.directorio, f"{nombre}{sufijo}{extension}")
+                if os.path.isfile(ruta):
+                    return ruta, bool(sufijo)
+        return None, False
+
+    def fuente(self, nombre: str, tamaño: int, negrita: bool = False) -> pygame.font.Font:
+        clave = (nombre.lower(), int(tamaño), negrita)
+        fuente = self._fuentes.get(clave)
+        if fuente is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            ruta, es_negrita = self._archivo_incluido(clave[0], negrita)
+            if ruta is not None:
+                fuente = pygame.font.Font(ruta, clave[1])
+                # Si solo existe la versión normal, pygame simula la negrita
+                fuente.set_bold(negrita and not es_negrita)
+            else:
+                fuente = pygame.font.SysFont(nombre, clave[1], bold=negrita)
+            self._fuentes[clave] = fuente
+        return fuente
+
+    def __len__(self) -> int:
+        return len(self._fuentes)
+
+
+class CacheTextos:
+    """
+    Superficies de texto ya renderizadas, por (fuente, texto, color).
+
+    Los textos fijos (botones, menú, tutorial) se renderizan una vez; al
+    llenarse se descarta el que lleva más tiempo sin usarse (LRU). Las
+    superficies devueltas se comparten: no deben modificarse.
+    """
+
+    def __init__(self, capacidad: int = TAMAÑO_CACHE_TEXTOS):
+        self.capacidad = capacidad
+        self._superficies: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def render(self, fuente: pygame.font.Font, texto: str, color: Color,
+               antialias: bool = True) -> pygame.Surface:
+        clave = (fuente, texto, tuple(color), antialias)
+        superficies = self._superficies
+        superficie = superficies.get(clave)
+        if superficie is not None:
+            superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+        self.fallos += 1
+        superficie = fuente.render(texto, antialias, color)
+        superficies[clave] = superficie
+        if len(superficies) > self.capacidad:
+            superficies.popitem(last=False)
+        return superficie
+
+    def clear(self):
+        self._superficies.clear()
+
+    def __len__(self) -> int:
+        return len(self._superficies)
+
+
+class Etiqueta:
+    """
+    Texto con un valor que cambia (dinero, vidas...): solo se vuelve a
+    renderizar cuando cambia el valor, sin pasar por la caché compartida.
+    """
+
+    def __init__(self, fuente: pygame.font.Font, formato: str, color: Color):
+        self.fuente = fuente
+        self.formato = formato
+        self.color = color
+        self._valor = object()
+        self._superficie: Optional[pygame.Surface] = None
+
+    def superficie(self, *valor) -> pygame.Surface:
+        if valor != self._valor:
+            self._valor = valor
+            self._superficie = self.fuente.render(self.formato.format(*valor), True, self.color)
+        return self._superficie
+
+
+FUENTES = RegistroFuentes()
+TEXTOS = CacheTextos()
+
+
+if __name__ == "__main__":
+    import time
+    print("Probando RegistroFuentes y CacheTextos...")
+    pygame.init()
+    inicio = time.perf_counter()
+    for _ in range(100):
+        pygame.font.SysFont("arial", 24)
+    sysfont = (time.perf_counter() - inicio) * 10
+    inicio = time.perf_counter()
+    for _ in range(100):
+        FUENTES.fuente("arial", 24)
+    registro = (time.perf_counter() - inicio) * 10
+    print(f"SysFont: {sysfont:.3f} ms por llamada, registro: {registro:.4f} ms")
+
+    fuente = FUENTES.fuente("arial", 18, negrita=True)
+    for _ in range(3):
+        TEXTOS.render(fuente, "Menu", (0, 0, 0))
+    print(f"Caché: {len(TEXTOS)} textos, {TEXTOS.aciertos} aciertos, {TEXTOS.fallos} fallos")
+    dinero = Etiqueta(fuente, "Dinero: ${}", (0, 0, 0))
+    print(f"Etiqueta reutilizada: {dinero.superficie(200) is dinero.superficie(200)}, "
+          f"nueva al cambiar: {dinero.superficie(200) is not dinero.superficie(150)}")
+    print("¡Prueba de fuentes completada!")
@@ -1,10 +1,12 @@
 import pygame
 import math
+from fuentes import FUENTES, Etiqueta
 
 class gestor_recursos:
     def __init__(self, initial_money, initial_lives):
         self.money = initial_money
         self.lives = initial_lives
+        self._etiquetas = None
 
     def can_afford(self, cost):
         """Verifica si el jugador tiene suficiente dinero."""
@@ -28,8 +30,12 @@ class gestor_recursos:
         
     def draw_ui(self, screen):
         """Dibuja la información de la UI en la pantalla."""
-        font = pygame.font.SysFont("Arial", 24)
-        money_text = font.render(f"Dinero: ${self.money}", True, (255, 255, 255))
-        lives_text = font.render(f"Vidas: {self.lives}", True, (255, 255, 255))
+        if self._etiquetas is None:
+            # Valores que cambian a menudo: cada etiqueta guarda solo su último render
+            font = FUENTES.fuente("Arial", 24)
+            self._etiquetas = (Etiqueta(font, "Dinero: ${}", (255, 255, 255)),
+                               Etiqueta(font, "Vidas: {}", (255, 255, 255)))
+        money_text = self._etiquetas[0].superficie(self.money)
+        lives_text = self._etiquetas[1].superficie(self.lives)
         screen.blit(money_text, (10, 10))
         screen.blit(lives_text, (10, 40))
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Grabación y reproducción de partidas.
+
+Una grabación guarda la configuración inicial de la Simulacion (semilla,
+camino, dificultad, recursos) y las órdenes del jugador que alteran la
+partida, cada una con el tick en que se dio. Como la simulación avanza en
+pasos fijos y toda su aleatoriedad sale de flujos con semilla, reproducir
+las mismas órdenes en los mismos ticks da una partida idéntica bit a bit,
+tanto en tiempo real como ejecutando pasos tan rápido como se pueda.
+
+Uso:
+    python grabacion.py partida.json        # reproduce y compara la huella
+"""
+import json
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from simulacion import Simulacion, NivelDificultad, CLASES_TORRES, crear_camino
+
+VERSION_GRABACION = 1
+
+
+class GrabadorEntradas:
+    """
+    Registra las órdenes que recibe una Simulacion desde su primer tick.
+
+    Se engancha como ``simulacion.grabador``; la simulación le pasa cada
+    orden como (tick, tipo, argumentos).
+    """
+
+    def __init__(self, simulacion: Simulacion):
+        if simulacion.tick != 0:
+            raise ValueError("La grabación debe empezar antes del primer paso")
+        self.simulacion = simulacion
+        self.entradas: List[Tuple[int, str, tuple]] = []
+        self.configuracion = {
+            'version': VERSION_GRABACION,
+            'semilla': simulacion.semilla,
+            'camino': [list(punto) for punto in simulacion.camino],
+            'ancho': simulacion.ancho,
+            'alto': simulacion.alto,
+            'dificultad': simulacion.dificultad.name,
+            'dinero': simulacion.dinero_inicial,
+            'vidas': simulacion.vidas_iniciales,
+        }
+        simulacion.grabador = self
+
+    def registrar(self, tick: int, tipo: str, argumentos: tuple):
+        self.entradas.append((tick, tipo, tuple(argumentos)))
+
+    def a_diccionario(self) -> dict:
+        datos = dict(self.configuracion)
+        datos['entradas'] = [[tick, tipo, *argumentos] for tick, tipo, argumentos in self.entradas]
+        datos['ticks'] = self.simulacion.tick
+        datos['huella'] = self.simulacion.huella()
+        return datos
+
+    def guardar(self, ruta_archivo: str):
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(self.a_diccionario(), archivo, ensure_ascii=False, separators=(',', ':'))
+
+
+def cargar_grabacion(ruta_archivo: str) -> dict:
+    with open(ruta_archivo, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    if datos.get('version') != VERSION_GRABACION:
+        raise ValueError(f"Versión de grabación no soportada: {datos.get('version')}")
+    return datos
+
+
+def crear_simulacion(grabacion: dict) -> Simulacion:
+    """Simulacion nueva con la configuración inicial de una grabación."""
+    return Simulacion(
+        [tuple(punto) for punto in grabacion['camino']],
+        NivelDificultad[grabacion['dificultad']],
+        ancho=grabacion['ancho'],
+        alto=grabacion['alto'],
+        dinero=grabacion['dinero'],
+        vidas=grabacion['vidas'],
+        semilla=grabacion['semilla'],
+    )
+
+
+def reproducir(grabacion: dict, ticks: Optional[int] = None,
+               simulacion: Optional[Simulacion] = None) -> Simulacion:
+    """
+    Repite una grabación paso a paso, sin reloj real.
+
+    Cada orden se aplica cuando la simulación alcanza su tick, antes del
+    paso siguiente, igual que al grabarla.
+
+    Args:
+        grabacion: Datos de ``cargar_grabacion`` o ``GrabadorEntradas.a_diccionario``
+        ticks: Tick final (por defecto, el de la grabación)
+        simulacion: Simulacion recién creada a reutilizar (por defecto, una nueva)
+    """
+    if simulacion is None:
+        simulacion = crear_simulacion(grabacion)
+    final = grabacion['ticks'] if ticks is None else ticks
+    for tick, tipo, *argumentos in grabacion['entradas']:
+        if tick > final:
+            break
+        while simulacion.tick < tick:
+            simulacion.paso()
+        simulacion.aplicar_entrada(tipo, argumentos)
+    while simulacion.tick < final:
+        simulacion.paso()
+    return simulacion
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        grabacion = cargar_grabacion(sys.argv[1])
+    else:
+        print("Probando grabación y reproducción...")
+        original = Simulacion(crear_camino(), semilla=2024)
+        grabador = GrabadorEntradas(original)
+        original.iniciar_partida(NivelDificultad.DIFICIL)
+        for tick, x, y, tipo in [(0, 300, 300, 'cañon'), (900, 500, 520, 'laser'),
+                                 (2400, 700, 400, 'misil'), (4000, 900, 400, 'cañon')]:
+            while original.tick < tick:
+                original.avanzar(Simulacion.DT_PASO * 1.37)
+            dinero = original.gestor_recursos.obtener('dinero')
+            if original.posicion_valida_torre(x, y) and dinero >= CLASES_TORRES[tipo](x, y).costo:
+                original.colocar_torre(x, y, tipo)
+        while original.tick < 60 * 300 and not original.derrota:
+            original.avanzar(33.0)
+        grabacion = grabador.a_diccionario()
+        print(f"Entradas grabadas: {len(grabacion['entradas'])}, "
+              f"tamaño: {len(json.dumps(grabacion, separators=(',', ':')))} bytes")
+
+    inicio = time.perf_counter()
+    repetida = reproducir(grabacion)
+    segundos = time.perf_counter() - inicio
+    huella = repetida.huella()
+    print(f"Ticks: {repetida.tick} ({repetida.tick / max(segundos, 1e-9):.0f} ticks/s)")
+    print(f"Huella: {huella}")
+    print(f"Idéntica a la grabada: {huella == grabacion['huella']}")
+    print("¡Prueba de grabación completada!")
@@ -1,4 +1,6 @@
+from typing import Dict, Optional, Tuple
 import pygame
+from fuentes import TEXTOS
 
 BLANCO = (255, 255, 255)
 NEGRO = (0, 0, 0)
@@ -6,18 +8,55 @@ ROJO = (255, 0, 0)
 GRIS_OSCURO = (64, 64, 64)
 AZUL = (0, 0, 255)
 
+class PanelesInterfaz:
+    """
+    Marcos de assets/Interfaz y assets/Marcador (atlas 'interfaz') al
+    tamaño que pide cada elemento: botones con el de Header_Table y
+    ventanas (contadores, pausa) con Window. Cada tamaño se hornea una
+    vez con ``Atlas.panel`` y después es un blit.
+    """
+
+    BOTON = ('Marcador/Header_Table', 16)
+    VENTANA = ('Interfaz/Window', 16)
+    # Texto sobre los marcos, que son oscuros
+    COLOR_TEXTO = BLANCO
+
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self._horneados: Dict[Tuple[str, int, int], pygame.Surface] = {}
+
+    def _panel(self, marco: Tuple[str, int], tamaño: Tuple[int, int]) -> pygame.Surface:
+        nombre, borde = marco
+        clave = (nombre, *tamaño)
+        panel = self._horneados.get(clave)
+        if panel is None:
+            panel = self._horneados[clave] = self.atlas.panel(nombre, *tamaño, borde)
+        return panel
+
+    def boton(self, tamaño: Tuple[int, int]) -> pygame.Surface:
+        return self._panel(self.BOTON, tamaño)
+
+    def ventana(self, tamaño: Tuple[int, int]) -> pygame.Surface:
+        return self._panel(self.VENTANA, tamaño)
+
+
 class Boton:
-    def __init__(self, x, y, ancho, alto, texto, color_fondo, color_texto, fuente):
+    def __init__(self, x, y, ancho, alto, texto, color_fondo, color_texto, fuente,
+                 paneles: Optional[PanelesInterfaz] = None):
         self.rect = pygame.Rect(x, y, ancho, alto)
         self.texto = texto
         self.color_fondo = color_fondo
         self.color_texto = color_texto
         self.fuente = fuente
+        self.paneles = paneles
 
     def dibujar(self, pantalla):
-        pygame.draw.rect(pantalla, self.color_fondo, self.rect)
-        pygame.draw.rect(pantalla, NEGRO, self.rect, 2)
-        texto_render = self.fuente.render(self.texto, True, self.color_texto)
+        if self.paneles is not None:
+            pantalla.blit(self.paneles.boton(self.rect.size), self.rect)
+        else:
+            pygame.draw.rect(pantalla, self.color_fondo, self.rect)
+            pygame.draw.rect(pantalla, NEGRO, self.rect, 2)
+        texto_render = TEXTOS.render(self.fuente, self.texto, self.color_texto)
         pantalla.blit(
             texto_render,
             (
@@ -30,18 +69,18 @@ class Boton:
         return self.rect.collidepoint(pos)
 
 class Interfaz:
-    def __init__(self, pantalla, fuente, fuente_pequeña):
+    def __init__(self, pantalla, fuente, fuente_pequeña, paneles: Optional[PanelesInterfaz] = None):
         self.pantalla = pantalla
         self.fuente = fuente
         self.fuente_pequeña = fuente_pequeña
-        self.boton_salir_menu = Boton(1050, 700, 200, 50, "Salir", ROJO, BLANCO, fuente)
-        self.boton_salir_juego = Boton(1050, 700, 200, 50, "Menu", AZUL, BLANCO, fuente)
+        self.boton_salir_menu = Boton(1050, 700, 200, 50, "Salir", ROJO, BLANCO, fuente, paneles)
+        self.boton_salir_juego = Boton(1050, 700, 200, 50, "Menu", AZUL, BLANCO, fuente, paneles)
 
     def dibujar_menu(self):
         self.boton_salir_menu.dibujar(self.pantalla)
 
-    def dibujar_juego(self):
-        self.boton_salir_juego.dibujar(self.pantalla)
+    def dibujar_juego(self, pantalla=None):
+        self.boton_salir_juego.dibujar(pantalla or self.pantalla)
 
     def manejar_evento(self, evento, estado_juego):
         if evento.type == pygame.MOUSEBUTTONDOWN and evento.button == 1:
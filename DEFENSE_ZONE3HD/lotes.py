@@ -0,0 +1,183 @@
+"""
+Ejecución por lotes de partidas sin pantalla, repartidas entre procesos.
+
+Lee un archivo de escenarios (JSON) y juega cada escenario tantas veces
+como indique, con semillas consecutivas, en un ProcessPoolExecutor con un
+proceso por núcleo. Cada partida termina por victoria, derrota o al llegar
+a ``ticks_maximos``. Los resultados se escriben en un CSV, una fila por
+partida, en cuanto cada una termina; al final se resume por escenario.
+
+Formato del archivo de escenarios:
+    {
+      "escenarios": [
+        {
+          "nombre": "tres_cañones",
+          "dificultad": "MEDIO",
+          "semilla": 1,
+          "ejecuciones": 20,
+          "torres": [[300, 300, "cañon"], [500, 520, "laser"], [700, 400, "misil", 1800]],
+          "camino": [[50, 400], [200, 400], ...],
+          "ticks_maximos": 72000,
+          "dinero": 400
+        }
+      ]
+    }
+
+``camino``, ``ticks_maximos`` y ``dinero`` (dinero inicial en lugar del de la
+dificultad) son opcionales. Cada torre es (x, y, tipo) y, opcionalmente, el
+tick en que se coloca (0 por defecto).
+
+Uso:
+    python lotes.py escenarios.json [-o resultados.csv] [-j procesos]
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from simulacion import Simulacion, NivelDificultad, CLASES_TORRES, crear_camino
+
+TICKS_MAXIMOS = 60 * 60 * 20  # 20 minutos simulados
+
+COLUMNAS_RESULTADO = (
+    'escenario', 'ejecucion', 'semilla', 'dificultad', 'victoria', 'derrota',
+    'oleadas_superadas', 'fugas', 'dinero', 'vidas', 'torres_colocadas',
+    'ticks', 'ticks_por_segundo',
+)
+
+
+def cargar_escenarios(ruta_archivo: str) -> List[dict]:
+    with open(ruta_archivo, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    escenarios = datos['escenarios'] if isinstance(datos, dict) else datos
+    for indice, escenario in enumerate(escenarios):
+        escenario.setdefault('nombre', f"escenario_{indice}")
+        escenario.setdefault('dificultad', NivelDificultad.MEDIO.name)
+        escenario.setdefault('semilla', 0)
+        escenario.setdefault('ejecuciones', 1)
+        escenario.setdefault('torres', [])
+        escenario.setdefault('ticks_maximos', TICKS_MAXIMOS)
+        if escenario['dificultad'] not in NivelDificultad.__members__:
+            raise ValueError(f"Dificultad desconocida en {escenario['nombre']}: {escenario['dificultad']}")
+        for torre in escenario['torres']:
+            if torre[2] not in CLASES_TORRES:
+                raise ValueError(f"Tipo de torre desconocido en {escenario['nombre']}: {torre[2]}")
+    return escenarios
+
+
+def jugar_escenario(escenario: dict, ejecucion: int) -> Dict:
+    """
+    Juega una partida del escenario sin pantalla y devuelve sus métricas.
+
+    Se ejecuta en los procesos del pool, así que solo recibe y devuelve
+    datos simples (picklables).
+    """
+    camino = [tuple(punto) for punto in escenario['camino']] if 'camino' in escenario else crear_camino()
+    semilla = escenario['semilla'] + ejecucion
+    simulacion = Simulacion(camino, semilla=semilla)
+    simulacion.iniciar_partida(NivelDificultad[escenario['dificultad']])
+    if 'dinero' in escenario:
+        simulacion.gestor_recursos.recursos['dinero'] = escenario['dinero']
+
+    pendientes = sorted((torre[3] if len(torre) > 3 else 0, indice, torre)
+                        for indice, torre in enumerate(escenario['torres']))
+    colocadas = 0
+    ticks_maximos = escenario['ticks_maximos']
+    inicio = time.perf_counter()
+    while simulacion.tick < ticks_maximos and not simulacion.derrota and not simulacion.victoria:
+        while pendientes and pendientes[0][0] <= simulacion.tick:
+            x, y, tipo = pendientes.pop(0)[2][:3]
+            if (simulacion.posicion_valida_torre(x, y)
+                    and simulacion.gestor_recursos.obtener('dinero') >= CLASES_TORRES[tipo](x, y).costo):
+                simulacion.colocar_torre(x, y, tipo)
+                colocadas += 1
+        simulacion.paso()
+    segundos = time.perf_counter() - inicio
+
+    return {
+        'escenario': escenario['nombre'],
+        'ejecucion': ejecucion,
+        'semilla': semilla,
+        'dificultad': escenario['dificultad'],
+        'victoria': simulacion.victoria,
+        'derrota': simulacion.derrota,
+        'oleadas_superadas': simulacion.oleadas_superadas,
+        'fugas': simulacion.fugas,
+        'dinero': simulacion.gestor_recursos.obtener('dinero'),
+        'vidas': simulacion.gestor_recursos.obtener('vidas'),
+        'torres_colocadas': colocadas,
+        'ticks': simulacion.tick,
+        'ticks_por_segundo': simulacion.tick / segundos if segundos > 0 else 0.0,
+    }
+
+
+def ejecutar_lote(escenarios: List[dict], archivo_salida: str,
+                  procesos: Optional[int] = None) -> Dict[str, list]:
+    """
+    Reparte todas las partidas entre procesos y escribe cada resultado al terminar.
+
+    Returns:
+        Tabla por columnas: {columna: [valor de cada partida]}
+    """
+    tareas: List[Tuple[dict, int]] = [(escenario, ejecucion)
+                                      for escenario in escenarios
+                                      for ejecucion in range(escenario['ejecuciones'])]
+    tabla: Dict[str, list] = {columna: [] for columna in COLUMNAS_RESULTADO}
+    with open(archivo_salida, 'w', newline='', encoding='utf-8') as archivo, \
+            ProcessPoolExecutor(max_workers=procesos) as pool:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_RESULTADO)
+        escritor.writeheader()
+        futuros = [pool.submit(jugar_escenario, escenario, ejecucion) for escenario, ejecucion in tareas]
+        for terminadas, futuro in enumerate(as_completed(futuros), 1):
+            resultado = futuro.result()
+            escritor.writerow(resultado)
+            archivo.flush()
+            for columna in COLUMNAS_RESULTADO:
+                tabla[columna].append(resultado[columna])
+            print(f"[{terminadas}/{len(tareas)}] {resultado['escenario']} #{resultado['ejecucion']}: "
+                  f"oleadas {resultado['oleadas_superadas']}, fugas {resultado['fugas']}, "
+                  f"{resultado['ticks_por_segundo']:.0f} ticks/s")
+    return tabla
+
+
+def resumir(tabla: Dict[str, list]) -> Iterator[str]:
+    """Líneas con las medias por escenario."""
+    escenarios = list(dict.fromkeys(tabla['escenario']))
+    for nombre in escenarios:
+        filas = [i for i, escenario in enumerate(tabla['escenario']) if escenario == nombre]
+
+        def media(columna):
+            return sum(tabla[columna][i] for i in filas) / len(filas)
+
+        victorias = sum(1 for i in filas if tabla['victoria'][i])
+        yield (f"{nombre}: {len(filas)} partidas, victorias {victorias}, "
+               f"oleadas {media('oleadas_superadas'):.1f}, fugas {media('fugas'):.1f}, "
+               f"dinero {media('dinero'):.0f}, {media('ticks_por_segundo'):.0f} ticks/s por proceso")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partidas sin pantalla por lotes")
+    parser.add_argument("escenarios", help="archivo JSON de escenarios")
+    parser.add_argument("-o", "--salida", default="resultados_lote.csv",
+                        help="CSV donde se escribe cada partida al terminar")
+    parser.add_argument("-j", "--procesos", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por núcleo)")
+    argumentos = parser.parse_args()
+
+    escenarios = cargar_escenarios(argumentos.escenarios)
+    total = sum(escenario['ejecuciones'] for escenario in escenarios)
+    print(f"Lote: {len(escenarios)} escenarios, {total} partidas, "
+          f"{argumentos.procesos or os.cpu_count()} procesos")
+    inicio = time.perf_counter()
+    tabla = ejecutar_lote(escenarios, argumentos.salida, argumentos.procesos)
+    segundos = time.perf_counter() - inicio
+    for linea in resumir(tabla):
+        print(linea)
+    print(f"Total: {sum(tabla['ticks']) / segundos:.0f} ticks/s en {segundos:.1f} s; "
+          f"resultados en {argumentos.salida}")
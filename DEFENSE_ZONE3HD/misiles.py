@@ -1,61 +1,368 @@
 
 import pygame
 import math
+import numpy as np
+from typing import List, Optional, Tuple
 from Objetos import Objetos
+from almacen_columnar import AlmacenColumnar
+from almacen_enemigos import AlmacenEnemigos, ID_TIPO_DAÑO
 
-class misiles(Objetos):
-    def __init__(self, x: float, y: float, target_x: float, target_y: float, damage: int = 25):
-        super().__init__(x, y)
-        self.start_x = x
-        self.start_y = y
-        self.target_x = target_x
-        self.target_y = target_y
-        self.damage = damage
-        self.speed = 200.0 
-        self.activo = True
-        dx = self.target_x - self.x
-        dy = self.target_y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
-        if distance > 0:
-            self.direction_x = dx / distance
-            self.direction_y = dy / distance
+# Aspecto de cada clase de proyectil: (color, radio, dibujar estela)
+VISUAL_BALA = 0
+VISUAL_MISIL = 1
+VISUAL_TELEDIRIGIDO = 2
+ASPECTOS_PROYECTIL = {
+    VISUAL_BALA: ((255, 255, 0), 5, False),
+    VISUAL_MISIL: ((255, 100, 0), 3, True),
+    VISUAL_TELEDIRIGIDO: ((255, 0, 0), 3, True),
+}
+
+DISTANCIA_LLEGADA = 10
+DURACION_MAXIMA = 5000  # milisegundos de vida de un proyectil
+
+
+class MotorProyectiles(AlmacenColumnar):
+    """
+    Motor único de proyectiles en formato estructura-de-arreglos.
+
+    Sustituye a las actualizaciones individuales de cada misil: el
+    movimiento recto, el guiado de los teledirigidos (mezcla de dirección
+    según ``velocidad_giro``), la caducidad, la salida de la pantalla y la
+    llegada al destino se calculan de forma vectorizada, y los impactos
+    contra un AlmacenEnemigos se resuelven en una sola pasada por paso.
+    """
+
+    COLUMNAS = {
+        'x': (np.float64, float),
+        'y': (np.float64, float),
+        'dir_x': (np.float64, float),
+        'dir_y': (np.float64, float),
+        'velocidad': (np.float64, float),
+        'daño': (np.int32, int),
+        'radio_colision': (np.float64, float),
+        'objetivo_x': (np.float64, float),
+        'objetivo_y': (np.float64, float),
+        'velocidad_giro': (np.float64, float),
+        'tiempo_vida': (np.float64, float),
+        'tipo_daño': (np.int8, int),
+        'visual': (np.int8, int),
+        'activo': (np.bool_, bool),
+    }
+
+    def __init__(self, ancho: int = 1300, alto: int = 800, capacidad: int = 64):
+        super().__init__(capacidad)
+        self.ancho = ancho
+        self.alto = alto
+        # Enemigo perseguido por cada fila teledirigida y vista asociada (si la hay)
+        self._objetivos: List = []
+        self._vistas: List = []
+        self._num_vistas = 0
+
+    def disparar(self, x: float, y: float, objetivo_x: float, objetivo_y: float,
+                 daño: int = 25, velocidad: float = 300.0, radio_colision: float = 15.0,
+                 objetivo_enemigo=None, velocidad_giro: float = 0.0,
+                 tipo_daño: str = "normal", visual: int = VISUAL_BALA) -> int:
+        """
+        Añade un proyectil y devuelve su fila.
+
+        Si se indica ``objetivo_enemigo`` y ``velocidad_giro`` > 0 el proyectil
+        corrige su dirección hacia ese enemigo en cada paso.
+        """
+        fila = self._reservar_fila()
+        dx = objetivo_x - x
+        dy = objetivo_y - y
+        distancia = math.sqrt(dx * dx + dy * dy)
+        c = self.columnas
+        c['x'][fila] = x
+        c['y'][fila] = y
+        c['dir_x'][fila] = dx / distancia if distancia > 0 else 0.0
+        c['dir_y'][fila] = dy / distancia if distancia > 0 else 0.0
+        c['velocidad'][fila] = velocidad
+        c['daño'][fila] = daño
+        c['radio_colision'][fila] = radio_colision
+        c['objetivo_x'][fila] = objetivo_x
+        c['objetivo_y'][fila] = objetivo_y
+        c['velocidad_giro'][fila] = velocidad_giro if objetivo_enemigo is not None else 0.0
+        c['tiempo_vida'][fila] = DURACION_MAXIMA
+        c['tipo_daño'][fila] = ID_TIPO_DAÑO.get(tipo_daño, 0)
+        c['visual'][fila] = visual
+        c['activo'][fila] = True
+        self._objetivos.append(objetivo_enemigo)
+        self._vistas.append(None)
+        return fila
+
+    def clear(self):
+        for vista in self._vistas:
+            if vista is not None:
+                vista._desvincular()
+        self._objetivos.clear()
+        self._vistas.clear()
+        self._num_vistas = 0
+        self.n = 0
+
+    def _registrar_vista(self, fila: int, vista):
+        self._vistas[fila] = vista
+        self._num_vistas += 1
+
+    def actualizar(self, dt: float, enemigos=None, compactar: bool = True):
+        """
+        Avanza un paso a todos los proyectiles y resuelve sus impactos.
+
+        Args:
+            dt: Delta time en milisegundos
+            enemigos: AlmacenEnemigos (impactos en lote) o lista de enemigos
+            compactar: Si es False, los proyectiles terminados solo quedan
+                marcados y se retiran después con ``compactar()``
+
+        Returns:
+            Posiciones (x, y) de los impactos del paso
+        """
+        n = self.n
+        if n == 0:
+            return []
+        c = {nombre: columna[:n] for nombre, columna in self.columnas.items()}
+        activo = c['activo']
+
+        self._guiar_teledirigidos(c)
+
+        avance = c['velocidad'] * (dt / 1000.0)
+        c['x'] += c['dir_x'] * avance * activo
+        c['y'] += c['dir_y'] * avance * activo
+
+        en_vuelo = activo.copy()
+        if isinstance(enemigos, AlmacenEnemigos):
+            self._resolver_impactos(enemigos)
+        elif enemigos is not None:
+            self._resolver_impactos_objetos(enemigos)
         else:
-            self.direction_x = 0
-            self.direction_y = 0
-        self.color = (255, 100, 0)  
-        self.radius = 3
+            self._resolver_impactos_objetos([])
 
-    def actualizar(self, dt: float, enemigos: list = None):
-        """Actualiza la posición del misil y aplica daño si colisiona con un enemigo."""
-        if not self.activo:
+        x, y = c['x'], c['y']
+        impactaron = en_vuelo & ~activo
+        impactos = list(zip(x[impactaron].tolist(), y[impactaron].tolist()))
+        c['tiempo_vida'] -= dt
+        llegaron = np.hypot(x - c['objetivo_x'], y - c['objetivo_y']) < DISTANCIA_LLEGADA
+        fuera = (x < 0) | (x > self.ancho) | (y < 0) | (y > self.alto)
+        activo &= ~(llegaron | fuera | (c['tiempo_vida'] <= 0))
+
+        if compactar:
+            self.compactar()
+        return impactos
+
+    def compactar(self):
+        """Retira de una vez los proyectiles marcados como inactivos."""
+        activo = self.columnas['activo'][:self.n]
+        if not activo.all():
+            self._compactar(activo.copy())
+
+    def _guiar_teledirigidos(self, c):
+        filas = np.flatnonzero(c['activo'] & (c['velocidad_giro'] > 0))
+        if len(filas) == 0:
+            return
+        objetivos = [self._objetivos[fila] for fila in filas]
+        siguen = np.array([bool(getattr(e, 'activo', False)) for e in objetivos])
+        if not siguen.any():
             return
+        filas = filas[siguen]
+        ex = np.array([e.x for e, sigue in zip(objetivos, siguen) if sigue])
+        ey = np.array([e.y for e, sigue in zip(objetivos, siguen) if sigue])
+
+        dx = ex - c['x'][filas]
+        dy = ey - c['y'][filas]
+        distancia = np.hypot(dx, dy)
+        validas = distancia > 0
+        filas, dx, dy, distancia = filas[validas], dx[validas], dy[validas], distancia[validas]
+        giro = c['velocidad_giro'][filas]
+        dir_x = c['dir_x'][filas] + (dx / distancia - c['dir_x'][filas]) * giro
+        dir_y = c['dir_y'][filas] + (dy / distancia - c['dir_y'][filas]) * giro
+        magnitud = np.hypot(dir_x, dir_y)
+        magnitud[magnitud == 0] = 1.0
+        c['dir_x'][filas] = dir_x / magnitud
+        c['dir_y'][filas] = dir_y / magnitud
+
+    def detectar_impactos(self, enemigos: AlmacenEnemigos) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve en lote las filas (proyectil, enemigo) de los impactos del paso.
 
-        # Movimiento
-        movement_distance = self.speed * (dt / 1000.0)
-        self.x += self.direction_x * movement_distance
-        self.y += self.direction_y * movement_distance
+        Usa la rejilla espacial del almacén como broadphase: cada proyectil
+        solo se compara con los enemigos de su celda y las adyacentes, y
+        alcanza al primero (en orden de llegada) dentro de su radio.
+        """
+        vacio = np.empty(0, dtype=np.intp)
+        proyectiles = np.flatnonzero(self.columnas['activo'][:self.n])
+        if len(proyectiles) == 0 or enemigos.n == 0:
+            return vacio, vacio
+        consultas, filas_e = enemigos.pares_en_radio(
+            self.columnas['x'][proyectiles], self.columnas['y'][proyectiles],
+            self.columnas['radio_colision'][proyectiles])
+        if len(consultas) == 0:
+            return vacio, vacio
+        orden = np.lexsort((filas_e, consultas))
+        consultas, filas_e = consultas[orden], filas_e[orden]
+        primeros = np.flatnonzero(np.r_[True, consultas[1:] != consultas[:-1]])
+        return proyectiles[consultas[primeros]], filas_e[primeros]
 
-        # Colisión con enemigos
-        if enemigos is not None:
-            for enemigo in enemigos:
-                if self.colisiona_con_enemigo(enemigo):
+    def _resolver_impactos(self, enemigos: AlmacenEnemigos):
+        filas_p, filas_e = self.detectar_impactos(enemigos)
+        if len(filas_p) == 0:
+            return
+        enemigos.aplicar_impactos(filas_e, self.columnas['daño'][filas_p],
+                                  self.columnas['tipo_daño'][filas_p])
+        self.columnas['activo'][filas_p] = False
+
+    def _resolver_impactos_objetos(self, enemigos: list):
+        """Impactos contra enemigos sueltos (fuera de un AlmacenEnemigos)."""
+        for fila in np.flatnonzero(self.columnas['activo'][:self.n]):
+            candidatos = list(enemigos)
+            objetivo = self._objetivos[fila]
+            if objetivo is not None and objetivo not in candidatos:
+                candidatos.append(objetivo)
+            x = self.columnas['x'][fila]
+            y = self.columnas['y'][fila]
+            radio = self.columnas['radio_colision'][fila]
+            for enemigo in candidatos:
+                if not getattr(enemigo, 'activo', False):
+                    continue
+                if math.hypot(x - enemigo.x, y - enemigo.y) <= radio:
+                    daño = int(self.columnas['daño'][fila])
                     if hasattr(enemigo, "recibir_daño"):
-                        enemigo.recibir_daño(self.damage)
+                        enemigo.recibir_daño(daño)
                     else:
-                        enemigo.vida -= self.damage
+                        enemigo.vida -= daño
                         if enemigo.vida <= 0:
                             enemigo.activo = False
-                    self.activo = False
+                    self.columnas['activo'][fila] = False
                     break
 
-        # Llega al destino
-        distance_to_target = math.sqrt((self.x - self.target_x)**2 + (self.y - self.target_y)**2)
-        if distance_to_target < 10:  
-            self.activo = False
+    def _compactar(self, vivos: np.ndarray):
+        vivos_lista = vivos.tolist()
+        self._objetivos = [o for o, vivo in zip(self._objetivos, vivos_lista) if vivo]
+        if self._num_vistas:
+            for vista, vivo in zip(self._vistas, vivos_lista):
+                if vista is not None and not vivo:
+                    vista._desvincular()
+                    self._num_vistas -= 1
+            self._vistas = [v for v, vivo in zip(self._vistas, vivos_lista) if vivo]
+            for fila, vista in enumerate(self._vistas):
+                if vista is not None:
+                    vista._fila = fila
+        else:
+            # Sin vistas todas las entradas son None: basta con recortar la lista
+            del self._vistas[int(np.count_nonzero(vivos)):]
+        self._compactar_columnas(vivos)
+
+    def dibujar(self, pantalla: pygame.Surface):
+        n = self.n
+        if n == 0:
+            return
+        c = self.columnas
+        for x, y, dir_x, dir_y, visual in zip(c['x'][:n].tolist(), c['y'][:n].tolist(),
+                                              c['dir_x'][:n].tolist(), c['dir_y'][:n].tolist(),
+                                              c['visual'][:n].tolist()):
+            color, radio, estela = ASPECTOS_PROYECTIL[visual]
+            centro = (int(x), int(y))
+            pygame.draw.circle(pantalla, color, centro, radio)
+            if estela:
+                tail_length = 15
+                tail_x = x - dir_x * tail_length
+                tail_y = y - dir_y * tail_length
+                tail_color = (color[0] // 2, color[1] // 2, color[2] // 2)
+                pygame.draw.line(pantalla, tail_color, (int(tail_x), int(tail_y)), centro, 2)
+            else:
+                pygame.draw.circle(pantalla, (0, 0, 0), centro, radio, 2)
+
+
+class misiles(Objetos):
+    """
+    Vista de un proyectil dentro de un MotorProyectiles.
+
+    Si no se indica motor, el misil crea uno propio y ``actualizar`` lo hace
+    avanzar; dentro de un motor compartido es el motor quien actualiza todas
+    las filas y ``actualizar`` no hace nada.
+    """
+
+    __slots__ = (
+        '_motor_propio', '_motor', '_fila', '_estado_final', 'start_x', 'start_y',
+        'target_x', 'target_y', 'damage', 'speed', 'color', 'radius',
+    )
+
+    VISUAL = VISUAL_MISIL
+
+    def __init__(self, x: float, y: float, target_x: float, target_y: float, damage: int = 25,
+                 motor: Optional[MotorProyectiles] = None, objetivo_enemigo=None,
+                 velocidad_giro: float = 0.0):
+        self._motor_propio = motor is None
+        self._motor = MotorProyectiles(capacidad=1) if motor is None else motor
+        self._fila = self._motor.disparar(
+            x, y, target_x, target_y, daño=damage, velocidad=200.0, radio_colision=15,
+            objetivo_enemigo=objetivo_enemigo, velocidad_giro=velocidad_giro,
+            visual=self.VISUAL)
+        self._motor._registrar_vista(self._fila, self)
+        super().__init__(x, y)
+        self.start_x = x
+        self.start_y = y
+        self.target_x = target_x
+        self.target_y = target_y
+        self.damage = damage
+        self.speed = 200.0
+        self.color = ASPECTOS_PROYECTIL[self.VISUAL][0]
+        self.radius = ASPECTOS_PROYECTIL[self.VISUAL][1]
+
+    def _leer(self, columna: str):
+        if self._motor is not None:
+            return self._motor.columnas[columna][self._fila]
+        return self._estado_final[columna]
+
+    def _desvincular(self):
+        """Guarda el último estado de la fila cuando el motor la retira."""
+        self._estado_final = {nombre: conversion(self._motor.columnas[nombre][self._fila])
+                              for nombre, (_, conversion) in MotorProyectiles.COLUMNAS.items()}
+        self._estado_final['activo'] = False
+        self._motor = None
+        self._fila = -1
 
-        # Fuera de pantalla
-        if self.x < 0 or self.x > 1300 or self.y < 0 or self.y > 800:
-            self.activo = False
+    # El estado vive en el motor; Objetos solo guarda la posición inicial
+    @property
+    def x(self) -> float:
+        return float(self._leer('x'))
+
+    @x.setter
+    def x(self, valor: float):
+        if self._motor is not None:
+            self._motor.columnas['x'][self._fila] = valor
+
+    @property
+    def y(self) -> float:
+        return float(self._leer('y'))
+
+    @y.setter
+    def y(self, valor: float):
+        if self._motor is not None:
+            self._motor.columnas['y'][self._fila] = valor
+
+    @property
+    def activo(self) -> bool:
+        if self._motor is None:
+            return False
+        return bool(self._leer('activo'))
+
+    @activo.setter
+    def activo(self, valor: bool):
+        if self._motor is not None:
+            self._motor.columnas['activo'][self._fila] = bool(valor)
+
+    @property
+    def direction_x(self) -> float:
+        return float(self._leer('dir_x'))
+
+    @property
+    def direction_y(self) -> float:
+        return float(self._leer('dir_y'))
+
+    def actualizar(self, dt: float, enemigos: list = None):
+        """Actualiza la posición del misil y aplica daño si colisiona con un enemigo."""
+        if self._motor_propio and self._motor is not None:
+            self._motor.actualizar(dt, enemigos)
 
     def dibujar(self, pantalla: pygame.Surface):
         if self.activo:
@@ -79,40 +386,16 @@ class misiles(Objetos):
         return f"Misil(pos=({self.x:.1f}, {self.y:.1f}), objetivo=({self.target_x}, {self.target_y}), activo={self.activo})"
 
 class MisilTeledirigido(misiles):
-    def __init__(self, x: float, y: float, objetivo_enemigo, damage: int = 50):
-        super().__init__(x, y, objetivo_enemigo.x, objetivo_enemigo.y, damage)
-        self.objetivo_enemigo = objetivo_enemigo
-        self.velocidad_giro = 0.05  
-        self.color = (255, 0, 0)  
+    __slots__ = ('objetivo_enemigo', 'velocidad_giro')
 
-    def actualizar(self, dt: float, enemigos: list = None):
-        if not self.activo:
-            return
-        if hasattr(self.objetivo_enemigo, 'activo') and self.objetivo_enemigo.activo:
-            dx = self.objetivo_enemigo.x - self.x
-            dy = self.objetivo_enemigo.y - self.y
-            distance = math.sqrt(dx * dx + dy * dy)
-            if distance > 0:
-                new_direction_x = dx / distance
-                new_direction_y = dy / distance
-                self.direction_x += (new_direction_x - self.direction_x) * self.velocidad_giro
-                self.direction_y += (new_direction_y - self.direction_y) * self.velocidad_giro
-                dir_magnitude = math.sqrt(self.direction_x**2 + self.direction_y**2)
-                if dir_magnitude > 0:
-                    self.direction_x /= dir_magnitude
-                    self.direction_y /= dir_magnitude
-        super().actualizar(dt, enemigos)
-        # Colisión con el objetivo
-        if (hasattr(self.objetivo_enemigo, 'activo') and 
-            self.objetivo_enemigo.activo and 
-            self.colisiona_con_enemigo(self.objetivo_enemigo)):
-            if hasattr(self.objetivo_enemigo, "recibir_daño"):
-                self.objetivo_enemigo.recibir_daño(self.damage)
-            else:
-                self.objetivo_enemigo.vida -= self.damage
-                if self.objetivo_enemigo.vida <= 0:
-                    self.objetivo_enemigo.activo = False
-            self.activo = False
+    VISUAL = VISUAL_TELEDIRIGIDO
+
+    def __init__(self, x: float, y: float, objetivo_enemigo, damage: int = 50,
+                 motor: Optional[MotorProyectiles] = None):
+        super().__init__(x, y, objetivo_enemigo.x, objetivo_enemigo.y, damage, motor=motor,
+                         objetivo_enemigo=objetivo_enemigo, velocidad_giro=0.05)
+        self.objetivo_enemigo = objetivo_enemigo
+        self.velocidad_giro = 0.05
 
 if __name__ == "__main__":
     print("Probando clase misiles...")
@@ -121,4 +404,4 @@ if __name__ == "__main__":
     for i in range(5):
         misil.actualizar(16.67)
         print(f"Frame {i+1}: {misil}")
-    print("Prueba de misiles completada!")
\ No newline at end of file
+    print("Prueba de misiles completada!")
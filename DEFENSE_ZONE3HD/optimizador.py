@@ -0,0 +1,225 @@
+"""
+Optimizador de colocación de torres mediante partidas sin pantalla.
+
+Busca, para una dificultad y un presupuesto, la disposición de torres que
+sobrevive a más oleadas. Los sitios candidatos son los puntos de una rejilla
+donde se puede construir, ordenados por cuánta ruta cubren y separados entre
+sí lo mínimo exigido entre torres (así cualquier combinación es válida).
+
+La búsqueda es voraz (añadir la mejor torre mientras quede dinero) seguida
+de una búsqueda local que cambia una torre de sitio o de tipo. Cada
+disposición se puntúa con varias partidas de lotes.jugar_escenario,
+repartidas entre procesos, y la puntuación se memoriza por disposición
+(opcionalmente en un archivo, para retomar la búsqueda).
+
+Con las opciones por defecto (MEDIO, $200, 12 sitios x 3 tipos x 3
+semillas, hasta 72000 ticks por partida) juega 210 partidas y tarda unos
+7 minutos en un solo núcleo (unos 2 s por partida); con -j N baja casi en
+proporción. Cada paso voraz o de búsqueda local juega del orden de
+sitios x tipos x semillas partidas, así que --sitios y --semillas son lo
+primero que hay que bajar para una prueba rápida.
+
+Uso:
+    python optimizador.py [--presupuesto 300] [--dificultad MEDIO] [--semillas 3]
+                          [-j procesos] [-o mejor.json] [--cache memoria.json]
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from lotes import jugar_escenario, TICKS_MAXIMOS
+from simulacion import (
+    Simulacion, NivelDificultad, CLASES_TORRES, MODIFICADORES_DIFICULTAD,
+    DISTANCIA_MINIMA_TORRES, ANCHO_BASE, ALTO_BASE, crear_camino,
+)
+
+Torre = Tuple[int, int, str]
+Disposicion = Tuple[Torre, ...]
+# (oleadas superadas, tasa de victorias, -fugas, dinero restante), medias por partida
+Puntuacion = Tuple[float, float, float, float]
+
+
+class OptimizadorTorres:
+    """Búsqueda de la disposición de torres con más oleadas superadas."""
+
+    def __init__(self, dificultad: NivelDificultad = NivelDificultad.MEDIO,
+                 presupuesto: Optional[int] = None,
+                 camino: Optional[List[Tuple[int, int]]] = None,
+                 semillas: int = 3, semilla: int = 0,
+                 paso_rejilla: int = 40, max_sitios: int = 12,
+                 ticks_maximos: int = TICKS_MAXIMOS, max_pasadas: int = 2):
+        self.dificultad = dificultad
+        self.presupuesto = (MODIFICADORES_DIFICULTAD[dificultad]['dinero']
+                            if presupuesto is None else int(presupuesto))
+        self.camino = [tuple(punto) for punto in camino] if camino else crear_camino()
+        self.semillas = semillas
+        self.semilla = semilla
+        self.paso_rejilla = paso_rejilla
+        self.max_sitios = max_sitios
+        self.ticks_maximos = ticks_maximos
+        self.max_pasadas = max_pasadas
+        self.costos = {tipo: clase(0, 0).costo for tipo, clase in CLASES_TORRES.items()}
+        self.memoria: Dict[str, Puntuacion] = {}
+        self.partidas_jugadas = 0
+        # Las puntuaciones solo son comparables con la misma configuración
+        self._prefijo = (f"{dificultad.name}|{self.presupuesto}|{semilla}x{semillas}|"
+                         f"{ticks_maximos}|{self.camino}")
+
+    def clave(self, disposicion: Disposicion) -> str:
+        return self._prefijo + "|" + ";".join(f"{x},{y},{tipo}" for x, y, tipo in disposicion)
+
+    def costo(self, disposicion: Disposicion) -> int:
+        return sum(self.costos[tipo] for _, _, tipo in disposicion)
+
+    def sitios_candidatos(self) -> List[Tuple[int, int]]:
+        """Sitios construibles que más ruta cubren, a la distancia mínima entre torres."""
+        simulacion = Simulacion(self.camino)
+        rango = max(clase(0, 0).rango for clase in CLASES_TORRES.values())
+        puntuados = []
+        for x in range(self.paso_rejilla // 2, ANCHO_BASE, self.paso_rejilla):
+            for y in range(self.paso_rejilla // 2, ALTO_BASE, self.paso_rejilla):
+                if not simulacion.posicion_valida_torre(x, y):
+                    continue
+                cobertura = sum(fin - inicio for inicio, fin in
+                                simulacion.ruta.intervalos_en_radio(x, y, rango))
+                if cobertura > 0:
+                    puntuados.append((-cobertura, x, y))
+        puntuados.sort()
+        sitios: List[Tuple[int, int]] = []
+        for _, x, y in puntuados:
+            if all(math.hypot(x - sx, y - sy) >= DISTANCIA_MINIMA_TORRES for sx, sy in sitios):
+                sitios.append((x, y))
+                if len(sitios) >= self.max_sitios:
+                    break
+        return sitios
+
+    def escenario(self, disposicion: Disposicion) -> dict:
+        return {
+            'nombre': ";".join(f"{x},{y},{tipo}" for x, y, tipo in disposicion) or "sin_torres",
+            'dificultad': self.dificultad.name,
+            'semilla': self.semilla,
+            'ejecuciones': self.semillas,
+            'torres': [list(torre) for torre in disposicion],
+            'camino': [list(punto) for punto in self.camino],
+            'ticks_maximos': self.ticks_maximos,
+            'dinero': self.presupuesto,
+        }
+
+    def evaluar(self, disposiciones: Sequence[Disposicion], pool: Executor) -> List[Puntuacion]:
+        """Puntúa las disposiciones, jugando en paralelo solo las no memorizadas."""
+        nuevas = list(dict.fromkeys(d for d in disposiciones if self.clave(d) not in self.memoria))
+        futuros = [(disposicion, [pool.submit(jugar_escenario, self.escenario(disposicion), ejecucion)
+                                  for ejecucion in range(self.semillas)])
+                   for disposicion in nuevas]
+        for disposicion, partidas in futuros:
+            resultados = [futuro.result() for futuro in partidas]
+            self.partidas_jugadas += len(resultados)
+            n = len(resultados)
+            self.memoria[self.clave(disposicion)] = (
+                sum(r['oleadas_superadas'] for r in resultados) / n,
+                sum(1 for r in resultados if r['victoria']) / n,
+                -sum(r['fugas'] for r in resultados) / n,
+                sum(r['dinero'] for r in resultados) / n,
+            )
+        return [self.memoria[self.clave(disposicion)] for disposicion in disposiciones]
+
+    def _mejor(self, candidatas: List[Disposicion], pool: Executor) -> Tuple[Puntuacion, Disposicion]:
+        return max(zip(self.evaluar(candidatas, pool), candidatas))
+
+    def optimizar(self, procesos: Optional[int] = None,
+                  registro: Callable[[str], None] = print) -> Tuple[Disposicion, Puntuacion]:
+        sitios = self.sitios_candidatos()
+        tipos = sorted(CLASES_TORRES)
+        registro(f"{len(sitios)} sitios candidatos, presupuesto ${self.presupuesto}")
+
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            actual: Disposicion = ()
+            puntuacion = self.evaluar([actual], pool)[0]
+
+            # Fase voraz: añadir la torre que más mejora mientras quede dinero
+            while True:
+                usados = {(x, y) for x, y, _ in actual}
+                candidatas = [tuple(sorted(actual + ((x, y, tipo),)))
+                              for x, y in sitios if (x, y) not in usados
+                              for tipo in tipos
+                              if self.costo(actual) + self.costos[tipo] <= self.presupuesto]
+                if not candidatas:
+                    break
+                mejor_puntuacion, mejor = self._mejor(candidatas, pool)
+                if mejor_puntuacion <= puntuacion:
+                    break
+                actual, puntuacion = mejor, mejor_puntuacion
+                registro(f"+ {len(actual)} torres: {puntuacion[0]:.2f} oleadas ({self.partidas_jugadas} partidas)")
+
+            # Búsqueda local: mover una torre a otro sitio o cambiar su tipo
+            for _ in range(self.max_pasadas):
+                candidatas = []
+                for indice, (x0, y0, tipo0) in enumerate(actual):
+                    resto = actual[:indice] + actual[indice + 1:]
+                    usados = {(x, y) for x, y, _ in resto}
+                    for x, y in sitios:
+                        if (x, y) in usados:
+                            continue
+                        for tipo in tipos:
+                            if (x, y, tipo) != (x0, y0, tipo0) and \
+                                    self.costo(resto) + self.costos[tipo] <= self.presupuesto:
+                                candidatas.append(tuple(sorted(resto + ((x, y, tipo),))))
+                if not candidatas:
+                    break
+                mejor_puntuacion, mejor = self._mejor(candidatas, pool)
+                if mejor_puntuacion <= puntuacion:
+                    break
+                actual, puntuacion = mejor, mejor_puntuacion
+                registro(f"~ cambio: {puntuacion[0]:.2f} oleadas ({self.partidas_jugadas} partidas)")
+
+        return actual, puntuacion
+
+    def cargar_memoria(self, ruta_archivo: str):
+        if os.path.exists(ruta_archivo):
+            with open(ruta_archivo, encoding='utf-8') as archivo:
+                self.memoria.update({clave: tuple(valor) for clave, valor in json.load(archivo).items()})
+
+    def guardar_memoria(self, ruta_archivo: str):
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(self.memoria, archivo, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mejor disposición de torres para un presupuesto")
+    parser.add_argument("--presupuesto", type=int, default=None,
+                        help="dinero disponible (por defecto, el de la dificultad)")
+    parser.add_argument("--dificultad", default=NivelDificultad.MEDIO.name,
+                        choices=list(NivelDificultad.__members__))
+    parser.add_argument("--semillas", type=int, default=3, help="partidas por disposición")
+    parser.add_argument("--sitios", type=int, default=12, help="sitios candidatos")
+    parser.add_argument("--ticks", type=int, default=TICKS_MAXIMOS, help="ticks máximos por partida")
+    parser.add_argument("-j", "--procesos", type=int, default=None)
+    parser.add_argument("-o", "--salida", default=None,
+                        help="guarda la mejor disposición como escenario para lotes.py")
+    parser.add_argument("--cache", default=None, help="archivo de puntuaciones memorizadas")
+    argumentos = parser.parse_args()
+
+    optimizador = OptimizadorTorres(NivelDificultad[argumentos.dificultad], argumentos.presupuesto,
+                                    semillas=argumentos.semillas, max_sitios=argumentos.sitios,
+                                    ticks_maximos=argumentos.ticks)
+    if argumentos.cache:
+        optimizador.cargar_memoria(argumentos.cache)
+    inicio = time.perf_counter()
+    disposicion, puntuacion = optimizador.optimizar(argumentos.procesos)
+    if argumentos.cache:
+        optimizador.guardar_memoria(argumentos.cache)
+
+    print(f"Mejor disposición para ${optimizador.presupuesto} ({argumentos.dificultad}), "
+          f"{time.perf_counter() - inicio:.0f} s, {optimizador.partidas_jugadas} partidas:")
+    for x, y, tipo in disposicion:
+        print(f"  {tipo} en ({x}, {y})")
+    print(f"Oleadas superadas: {puntuacion[0]:.2f}, victorias: {puntuacion[1]:.0%}, "
+          f"fugas: {abs(puntuacion[2]):.1f}, dinero final: {puntuacion[3]:.0f}")
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'escenarios': [optimizador.escenario(disposicion)]}, archivo,
+                      ensure_ascii=False, indent=2)
@@ -0,0 +1,176 @@
+import heapq
+import itertools
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class PlanificadorGeneraciones:
+    """
+    Cola de generaciones de enemigos ordenada por tiempo simulado.
+
+    Guarda cada generación en un montículo mínimo con su tiempo absoluto (ms
+    del reloj de la Simulacion), así que consultar si toca generar algo es
+    mirar la cima y cada extracción cuesta O(log n). Las generaciones con el
+    mismo tiempo salen en el orden en que se programaron. El ``grupo``
+    permite cancelar de una vez las de un origen concreto (p. ej. el tutorial).
+    """
+
+    def __init__(self):
+        self._monticulo: List[Tuple[float, int, str, Optional[str]]] = []
+        self._orden = itertools.count()
+
+    def programar(self, tiempo: float, tipo_enemigo: str, grupo: Optional[str] = None):
+        heapq.heappush(self._monticulo, (float(tiempo), next(self._orden), tipo_enemigo, grupo))
+
+    def programar_oleada(self, tiempo_inicio: float, configuracion: Iterable[Dict],
+                         grupo: Optional[str] = None):
+        """
+        Programa una oleada; el ``retraso`` (s) de cada enemigo se cuenta
+        desde ``tiempo_inicio``, no desde el enemigo anterior.
+        """
+        for config_enemigo in configuracion:
+            self.programar(tiempo_inicio + config_enemigo['retraso'] * 1000.0,
+                           config_enemigo['tipo'], grupo)
+
+    @property
+    def proximo(self) -> Optional[float]:
+        """Tiempo de la siguiente generación, o None si no queda ninguna."""
+        return self._monticulo[0][0] if self._monticulo else None
+
+    def extraer_vencidos(self, tiempo_actual: float) -> List[str]:
+        """Saca, en orden, los tipos de enemigo cuyo tiempo ya llegó."""
+        vencidos = []
+        monticulo = self._monticulo
+        while monticulo and monticulo[0][0] <= tiempo_actual:
+            vencidos.append(heapq.heappop(monticulo)[2])
+        return vencidos
+
+    def cancelar(self, grupo: str) -> int:
+        """Descarta las generaciones pendientes de un grupo; devuelve cuántas."""
+        restantes = [entrada for entrada in self._monticulo if entrada[3] != grupo]
+        canceladas = len(self._monticulo) - len(restantes)
+        if canceladas:
+            heapq.heapify(restantes)
+            self._monticulo = restantes
+        return canceladas
+
+    def pendientes(self) -> List[Tuple[float, str, Optional[str]]]:
+        """Generaciones pendientes en orden de salida (tiempo, tipo, grupo)."""
+        return [(tiempo, tipo, grupo) for tiempo, _, tipo, grupo in sorted(self._monticulo)]
+
+    def clear(self):
+        self._monticulo.clear()
+
+    def __len__(self) -> int:
+        return len(self._monticulo)
+
+
+class PlanificadorTorres:
+    """
+    Torres ordenadas por el tick en que vuelven a estar listas para disparar.
+
+    Solo las torres cuyo tick ya llegó buscan objetivo; las que recargan no
+    cuestan nada. Una torre lista que no encuentra objetivo se duerme hasta
+    que algún enemigo entra en sus tramos de cobertura: ``despertar``
+    comprueba todas las dormidas a la vez con una consulta vectorizada al
+    almacén de enemigos. Las torres que salen en el mismo tick lo hacen en el
+    orden en que se colocaron, igual que al recorrer la lista de torres.
+    """
+
+    def __init__(self):
+        self._monticulo: List[Tuple[int, int, object]] = []
+        self._orden = itertools.count()
+        self._orden_torre: Dict[int, int] = {}
+        self._dormidas: Dict[int, object] = {}
+        self._intervalos_dormidas: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def agregar(self, torre, tick_listo: int):
+        orden = next(self._orden)
+        self._orden_torre[id(torre)] = orden
+        heapq.heappush(self._monticulo, (tick_listo, orden, torre))
+
+    def programar(self, torre, tick_listo: int):
+        """Vuelve a encolar una torre ya agregada (tras disparar o al despertar)."""
+        heapq.heappush(self._monticulo, (tick_listo, self._orden_torre[id(torre)], torre))
+
+    def reprogramar(self, torre, tick_listo: int):
+        """
+        Saca a una torre de la cola o del sueño y la encola para ``tick_listo``.
+        Para cuando cambian su cadencia o su cobertura (p. ej. al mejorarla).
+        """
+        orden = self._orden_torre[id(torre)]
+        if self._dormidas.pop(orden, None) is not None:
+            self._intervalos_dormidas = None
+        else:
+            self._monticulo = [entrada for entrada in self._monticulo if entrada[1] != orden]
+            heapq.heapify(self._monticulo)
+        heapq.heappush(self._monticulo, (tick_listo, orden, torre))
+
+    def dormir(self, torre):
+        """Aparta una torre hasta que haya enemigos en su cobertura."""
+        self._dormidas[self._orden_torre[id(torre)]] = torre
+        self._intervalos_dormidas = None
+
+    def despertar(self, enemigos, tick: int) -> int:
+        """Encola para ``tick`` las torres dormidas con enemigos en su cobertura."""
+        if not self._dormidas or len(enemigos) == 0:
+            return 0
+        if self._intervalos_dormidas is None:
+            inicios, fines, dueños = [], [], []
+            for orden, torre in self._dormidas.items():
+                for inicio, fin in torre.intervalos_cobertura:
+                    inicios.append(inicio)
+                    fines.append(fin)
+                    dueños.append(orden)
+            self._intervalos_dormidas = (np.array(inicios, dtype=np.float64),
+                                         np.array(fines, dtype=np.float64),
+                                         np.array(dueños, dtype=np.int64))
+        inicios, fines, dueños = self._intervalos_dormidas
+        if len(dueños) == 0:
+            return 0
+        ocupados = enemigos.ocupacion_intervalos(inicios, fines)
+        if not ocupados.any():
+            return 0
+        despiertas = np.unique(dueños[ocupados]).tolist()
+        for orden in despiertas:
+            heapq.heappush(self._monticulo, (tick, orden, self._dormidas.pop(orden)))
+        self._intervalos_dormidas = None
+        return len(despiertas)
+
+    def extraer_listas(self, tick: int) -> List[object]:
+        """Saca, en orden de colocación, las torres listas en ``tick``."""
+        listas = []
+        monticulo = self._monticulo
+        while monticulo and monticulo[0][0] <= tick:
+            listas.append(heapq.heappop(monticulo))
+        listas.sort(key=lambda entrada: entrada[1])
+        return [torre for _, _, torre in listas]
+
+    @property
+    def dormidas(self) -> int:
+        return len(self._dormidas)
+
+    @property
+    def en_espera(self) -> int:
+        return len(self._monticulo)
+
+    def clear(self):
+        self._monticulo.clear()
+        self._orden_torre.clear()
+        self._dormidas.clear()
+        self._intervalos_dormidas = None
+
+    def __len__(self) -> int:
+        return len(self._orden_torre)
+
+
+if __name__ == "__main__":
+    print("Probando PlanificadorGeneraciones...")
+    planificador = PlanificadorGeneraciones()
+    planificador.programar_oleada(1000.0, [{'tipo': 'basico', 'retraso': i * 1.0} for i in range(5)])
+    planificador.programar(4500.0, 'tanque', grupo='tutorial')
+    print(f"Pendientes: {planificador.pendientes()}")
+    print(f"Hasta 2500 ms: {planificador.extraer_vencidos(2500.0)}")
+    print(f"Cancelados del tutorial: {planificador.cancelar('tutorial')}")
+    print(f"Próximo: {planificador.proximo}, quedan {len(planificador)}")
+    print("¡Prueba de planificador completada!")
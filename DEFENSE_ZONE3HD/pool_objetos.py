@@ -0,0 +1,86 @@
+from typing import Callable, Dict, List, Optional
+
+
+class PoolObjetos:
+    """
+    Reserva de instancias reutilizables con adquisición y liberación explícitas.
+
+    ``adquirir`` devuelve una instancia liberada antes (reiniciada con
+    ``reiniciar(*args)``) o crea una nueva con la fábrica si no queda
+    ninguna libre. ``liberar`` la devuelve a la reserva; solo se aceptan
+    instancias prestadas por este mismo pool.
+    """
+
+    def __init__(self, fabrica: Callable, reiniciar: Optional[Callable] = None):
+        self._fabrica = fabrica
+        self._reiniciar = reiniciar
+        self._libres: List = []
+        self._prestados: Dict[int, object] = {}
+        self.creados = 0
+        self.reutilizados = 0
+        self.maximo_en_uso = 0
+
+    def adquirir(self, *args):
+        if self._libres:
+            objeto = self._libres.pop()
+            if self._reiniciar is not None:
+                self._reiniciar(objeto, *args)
+            else:
+                objeto.reiniciar(*args)
+            self.reutilizados += 1
+        else:
+            objeto = self._fabrica(*args)
+            self.creados += 1
+        self._prestados[id(objeto)] = objeto
+        if len(self._prestados) > self.maximo_en_uso:
+            self.maximo_en_uso = len(self._prestados)
+        return objeto
+
+    def liberar(self, objeto) -> bool:
+        """Devuelve una instancia al pool; False si no era de este pool."""
+        if self._prestados.pop(id(objeto), None) is None:
+            return False
+        self._libres.append(objeto)
+        return True
+
+    @property
+    def en_uso(self) -> int:
+        return len(self._prestados)
+
+    @property
+    def libres(self) -> int:
+        return len(self._libres)
+
+    @property
+    def tasa_reutilizacion(self) -> float:
+        total = self.creados + self.reutilizados
+        return self.reutilizados / total if total > 0 else 0.0
+
+    def estadisticas(self) -> dict:
+        return {
+            'en_uso': self.en_uso,
+            'libres': self.libres,
+            'maximo_en_uso': self.maximo_en_uso,
+            'creados': self.creados,
+            'reutilizados': self.reutilizados,
+            'tasa_reutilizacion': self.tasa_reutilizacion,
+        }
+
+
+if __name__ == "__main__":
+    print("Probando PoolObjetos...")
+
+    class Particula:
+        def __init__(self, x):
+            self.x = x
+
+        def reiniciar(self, x):
+            self.x = x
+
+    pool = PoolObjetos(Particula)
+    activas = [pool.adquirir(i) for i in range(10)]
+    for particula in activas[:6]:
+        pool.liberar(particula)
+    activas = [pool.adquirir(i) for i in range(8)]
+    print(f"Estadísticas: {pool.estadisticas()}")
+    print("¡Prueba de pool completada!")
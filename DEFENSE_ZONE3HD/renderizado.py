@@ -0,0 +1,118 @@
+from typing import Callable, Hashable, Iterable, List, Optional
+import numpy as np
+import pygame
+
+
+# Si lo que cambia en un frame supera esta fracción de la pantalla (o este
+# número de rectángulos), sale más barato volcar la pantalla entera
+FRACCION_MAXIMA_SUCIA = 0.5
+MAXIMO_RECTANGULOS = 768
+
+
+def rectangulos_alrededor(xs: np.ndarray, ys: np.ndarray, semiancho: int, semialto: int) -> List[pygame.Rect]:
+    """Un rectángulo de 2*semiancho x 2*semialto centrado en cada punto."""
+    ancho, alto = 2 * semiancho, 2 * semialto
+    izquierdas = (xs - semiancho).astype(np.int32).tolist()
+    arribas = (ys - semialto).astype(np.int32).tolist()
+    return [pygame.Rect(x, y, ancho, alto) for x, y in zip(izquierdas, arribas)]
+
+
+class RenderizadorCapas:
+    """
+    Dibujo por capas con rectángulos sucios.
+
+    Lo que no se mueve (camino, torres, interfaz fija) se hornea una vez en
+    ``fondo`` con la función ``dibujar_fondo`` y solo se vuelve a hornear
+    cuando cambia la ``clave`` que se pasa a ``preparar``. Cada frame se
+    borran las entidades del frame anterior copiando el fondo sobre sus
+    rectángulos, se dibujan las nuevas marcando los suyos con ``marcar`` y
+    ``presentar`` envía a la ventana solo la unión de ambos con
+    ``pygame.display.update``. Si el frame cambia casi toda la pantalla, o
+    tras ``invalidar`` (menú, pausa...), se copia el fondo entero y se
+    hace ``flip``.
+    """
+
+    def __init__(self, dibujar_fondo: Callable[[pygame.Surface], None]):
+        self._dibujar_fondo = dibujar_fondo
+        self.fondo: Optional[pygame.Surface] = None
+        self._clave: Optional[Hashable] = None
+        self._anteriores: List[pygame.Rect] = []
+        self._actuales: List[pygame.Rect] = []
+        self._completo = True
+        self.volcados_completos = 0
+        self.volcados_parciales = 0
+
+    def invalidar(self):
+        """El próximo frame se vuelca entero (alguien dibujó fuera del renderizador)."""
+        self._completo = True
+
+    def preparar(self, pantalla: pygame.Surface, clave: Hashable):
+        """Hornea el fondo si cambió la clave y borra lo dibujado en el frame anterior."""
+        if self.fondo is None or self.fondo.get_size() != pantalla.get_size() or clave != self._clave:
+            self.fondo = pantalla.copy()
+            self._dibujar_fondo(self.fondo)
+            self._clave = clave
+            self._completo = True
+
+        area = pantalla.get_width() * pantalla.get_height()
+        if self._completo or len(self._anteriores) > MAXIMO_RECTANGULOS \
+                or self._area(self._anteriores) > area * FRACCION_MAXIMA_SUCIA:
+            pantalla.blit(self.fondo, (0, 0))
+            self._completo = True
+        else:
+            pantalla.blits([(self.fondo, rect, rect) for rect in self._anteriores], False)
+        self._actuales = []
+
+    def marcar(self, rect: Optional[pygame.Rect]):
+        if rect is not None:
+            self._actuales.append(rect)
+
+    def marcar_varios(self, rects: Iterable[pygame.Rect]):
+        self._actuales.extend(rects)
+
+    @staticmethod
+    def _area(rects: List[pygame.Rect]) -> int:
+        return sum(rect.w * rect.h for rect in rects)
+
+    def presentar(self, pantalla: pygame.Surface):
+        area = pantalla.get_width() * pantalla.get_height()
+        sucios = self._anteriores + self._actuales
+        if self._completo or len(sucios) > 2 * MAXIMO_RECTANGULOS \
+                or self._area(sucios) > area * FRACCION_MAXIMA_SUCIA:
+            pygame.display.flip()
+            self.volcados_completos += 1
+        else:
+            limites = pantalla.get_rect()
+            pygame.display.update([rect.clip(limites) for rect in sucios])
+            self.volcados_parciales += 1
+        self._anteriores = self._actuales
+        self._actuales = []
+        self._completo = False
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    print("Probando RenderizadorCapas...")
+    pygame.init()
+    pantalla = pygame.display.set_mode((400, 300))
+
+    def fondo(superficie):
+        superficie.fill((255, 255, 255))
+        pygame.draw.lines(superficie, (128, 128, 128), False, [(0, 150), (200, 150), (200, 50)], 5)
+
+    renderizador = RenderizadorCapas(fondo)
+    for paso in range(30):
+        renderizador.preparar(pantalla, clave=paso // 10)
+        xs = np.array([20.0 + paso * 5, 300.0])
+        ys = np.array([150.0, 100.0 + paso])
+        for x, y in zip(xs, ys):
+            pygame.draw.circle(pantalla, (255, 0, 0), (int(x), int(y)), 10)
+        renderizador.marcar_varios(rectangulos_alrededor(xs, ys, 12, 12))
+        renderizador.presentar(pantalla)
+    # Tras la última presentación, borrar las entidades debe dejar el fondo intacto
+    renderizador.preparar(pantalla, clave=2)
+    iguales = pygame.image.tobytes(pantalla, "RGB") == pygame.image.tobytes(renderizador.fondo, "RGB")
+    print(f"Volcados completos {renderizador.volcados_completos}, parciales {renderizador.volcados_parciales}")
+    print(f"Sin restos de entidades: {iguales}")
+    print("¡Prueba de renderizador completada!")
@@ -0,0 +1,271 @@
+import cProfile
+import gc
+import io
+import os
+import pstats
+import time
+from typing import Dict, Optional
+import numpy as np
+import pygame
+from fuentes import FUENTES
+
+
+# Secciones del frame en el orden en que se muestran
+SECCIONES_FRAME = ('eventos', 'enemigos', 'objetivos', 'proyectiles', 'resto_sim', 'dibujo', 'flip')
+COLORES_SECCIONES = {
+    'eventos': (200, 200, 200),
+    'enemigos': (230, 80, 80),
+    'objetivos': (80, 160, 230),
+    'proyectiles': (240, 200, 60),
+    'resto_sim': (170, 110, 220),
+    'dibujo': (90, 200, 110),
+    'flip': (255, 140, 40),
+}
+FRAMES_HISTORIAL = 180
+# Funciones que se listan en el resumen de cada captura de cProfile
+FUNCIONES_RESUMEN = 25
+# Presupuesto de un frame a 60 FPS, en ms (línea de referencia de la gráfica)
+PRESUPUESTO_FRAME = 1000.0 / 60
+
+
+def ruta_sin_usar(directorio: str, nombre: str, extension: str) -> str:
+    """
+    ``<directorio>/<nombre>_<fecha>_<ms>`` (sin la extensión) que aún no
+    existe con ``extension``. Dos archivos del mismo milisegundo (p. ej.
+    oleadas muy cortas, o una traza justo antes de salir) se numeran
+    ``_2``, ``_3``... en lugar de pisarse.
+    """
+    ahora = time.time()
+    base = os.path.join(directorio, f"{nombre}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(ahora))}"
+                                    f"_{int(ahora * 1000) % 1000:03d}")
+    libre, numero = base, 1
+    while os.path.exists(libre + extension):
+        numero += 1
+        libre = f"{base}_{numero}"
+    return libre
+
+
+class MedidorRendimiento:
+    """
+    Tiempos por subsistema de cada frame, en un historial circular.
+
+    Quien mide llama a ``acumular(seccion, segundos)``; la Simulacion lo hace
+    por cada paso (varios por frame a velocidades altas se suman). Mientras
+    el medidor no está activo nadie lo llama: el juego y la simulación solo
+    comprueban una referencia, así que tenerlo oculto no cuesta nada.
+    """
+
+    def __init__(self, frames_historial: int = FRAMES_HISTORIAL):
+        self.frames_historial = frames_historial
+        self.tiempos = np.zeros((frames_historial, len(SECCIONES_FRAME)))
+        self.duraciones = np.zeros(frames_historial)
+        self.frames = 0
+        self._indices = {seccion: i for i, seccion in enumerate(SECCIONES_FRAME)}
+        self._actual = np.zeros(len(SECCIONES_FRAME))
+        self._colecciones_inicio = [datos['collections'] for datos in gc.get_stats()]
+
+    def acumular(self, seccion: str, segundos: float):
+        self._actual[self._indices[seccion]] += segundos
+
+    def acumulado(self, seccion: str) -> float:
+        """Segundos acumulados en la sección durante el frame en curso."""
+        return float(self._actual[self._indices[seccion]])
+
+    def terminar_frame(self, dt: float):
+        """Guarda las secciones acumuladas y la duración real del frame (ms)."""
+        fila = self.frames % self.frames_historial
+        self.tiempos[fila] = self._actual * 1000.0
+        self.duraciones[fila] = dt
+        self._actual.fill(0.0)
+        self.frames += 1
+
+    def reiniciar(self):
+        self.tiempos.fill(0.0)
+        self.duraciones.fill(0.0)
+        self._actual.fill(0.0)
+        self.frames = 0
+
+    def _validos(self) -> int:
+        return min(self.frames, self.frames_historial)
+
+    def medias(self) -> Dict[str, float]:
+        """Media en ms de cada sección sobre el historial."""
+        n = self._validos()
+        if n == 0:
+            return {seccion: 0.0 for seccion in SECCIONES_FRAME}
+        medias = self.tiempos[:n].mean(axis=0)
+        return {seccion: float(medias[i]) for i, seccion in enumerate(SECCIONES_FRAME)}
+
+    def historial(self) -> np.ndarray:
+        """Duraciones de frame (ms) de la más antigua a la más reciente."""
+        n = self._validos()
+        if self.frames <= self.frames_historial:
+            return self.duraciones[:n]
+        return np.roll(self.duraciones, -(self.frames % self.frames_historial))
+
+    def colecciones_gc(self):
+        """Colecciones del GC por generación desde que se creó el medidor."""
+        return [datos['collections'] - inicio
+                for datos, inicio in zip(gc.get_stats(), self._colecciones_inicio)]
+
+
+class HUDRendimiento:
+    """Panel con el reparto del frame, la gráfica de duraciones, entidades y pools."""
+
+    ANCHO = 330
+    ALTO_GRAFICA = 60
+    MAXIMO_GRAFICA = PRESUPUESTO_FRAME * 3
+
+    def __init__(self, medidor: MedidorRendimiento):
+        self.medidor = medidor
+        self.fuente = FUENTES.fuente("consolas,couriernew,monospace", 14)
+        self.alto_linea = self.fuente.get_linesize()
+
+    def _lineas(self, simulacion, efectos) -> list:
+        medidor = self.medidor
+        medias = medidor.medias()
+        historial = medidor.historial()
+        trabajo = sum(medias.values())
+        lineas = [(f"Frame {historial.mean() if len(historial) else 0.0:5.1f} ms "
+                   f"(máx {historial.max() if len(historial) else 0.0:5.1f}), trabajo {trabajo:5.2f} ms", None)]
+        for seccion in SECCIONES_FRAME:
+            lineas.append((f"  {seccion:<12}{medias[seccion]:6.2f} ms", seccion))
+        lineas.append((f"Enemigos {len(simulacion.enemigos)}  proyectiles {len(simulacion.proyectiles)}  "
+                       f"torres {len(simulacion.torres)}", None))
+        planificador = simulacion.planificador_torres
+        lineas.append((f"  torres dormidas {planificador.dormidas}, en espera {planificador.en_espera}", None))
+        estadisticas = simulacion.estadisticas_pools()
+        estadisticas['efectos'] = efectos.pool.estadisticas()
+        for nombre, datos in estadisticas.items():
+            lineas.append((f"  {nombre:<16}{datos['en_uso']:5}/{datos['maximo_en_uso']:<5}"
+                           f"reuso {datos['tasa_reutilizacion']:4.0%}", None))
+        lineas.append((f"GC pendientes {gc.get_count()}, colecciones {medidor.colecciones_gc()}", None))
+        return lineas
+
+    def dibujar(self, pantalla: pygame.Surface, simulacion, efectos,
+                x: Optional[int] = None, y: int = 280) -> pygame.Rect:
+        lineas = self._lineas(simulacion, efectos)
+        alto = len(lineas) * self.alto_linea + self.ALTO_GRAFICA + 20
+        if x is None:
+            x = pantalla.get_width() - self.ANCHO - 10
+
+        fondo = pygame.Surface((self.ANCHO, alto))
+        fondo.set_alpha(200)
+        fondo.fill((20, 20, 20))
+        pantalla.blit(fondo, (x, y))
+
+        y_linea = y + 5
+        for texto, seccion in lineas:
+            if seccion is not None:
+                pygame.draw.rect(pantalla, COLORES_SECCIONES[seccion], (x + 6, y_linea + 3, 8, 8))
+            pantalla.blit(self.fuente.render(texto, True, (235, 235, 235)), (x + 6, y_linea))
+            y_linea += self.alto_linea
+
+        self._dibujar_grafica(pantalla, pygame.Rect(x + 6, y_linea + 5, self.ANCHO - 12, self.ALTO_GRAFICA))
+        return pygame.Rect(x, y, self.ANCHO, alto)
+
+    def _dibujar_grafica(self, pantalla: pygame.Surface, area: pygame.Rect):
+        """Duración de los últimos frames y, debajo, la parte de cada sección."""
+        pygame.draw.rect(pantalla, (60, 60, 60), area, 1)
+        escala = area.height / self.MAXIMO_GRAFICA
+        y_presupuesto = area.bottom - int(PRESUPUESTO_FRAME * escala)
+        pygame.draw.line(pantalla, (90, 90, 160), (area.left, y_presupuesto), (area.right, y_presupuesto))
+
+        historial = self.medidor.historial()
+        n = len(historial)
+        if n < 2:
+            return
+        paso_x = area.width / (self.medidor.frames_historial - 1)
+        alturas = np.minimum(historial, self.MAXIMO_GRAFICA) * escala
+        xs = area.left + np.arange(n) * paso_x
+        puntos = list(zip(xs.tolist(), (area.bottom - alturas).tolist()))
+        pygame.draw.lines(pantalla, (240, 240, 240), False, puntos)
+
+        # Barra apilada del último frame medido, a la derecha de la gráfica
+        fila = (self.medidor.frames - 1) % self.medidor.frames_historial
+        y_barra = area.bottom
+        for i, seccion in enumerate(SECCIONES_FRAME):
+            alto = int(min(self.medidor.tiempos[fila, i], self.MAXIMO_GRAFICA) * escala)
+            if alto > 0:
+                y_barra -= alto
+                pygame.draw.rect(pantalla, COLORES_SECCIONES[seccion], (area.right - 6, y_barra, 5, alto))
+
+
+class CapturaPerfil:
+    """
+    Captura de cProfile que se inicia y se detiene a voluntad.
+
+    Al detenerla se guardan ``<nombre>_<fecha>_<ms>.pstats`` (para snakeviz,
+    ``python -m pstats``, etc.) y un ``.txt`` con las funciones de mayor
+    tiempo acumulado. Solo puede haber una captura activa a la vez, porque
+    cProfile no admite dos perfiladores simultáneos.
+    """
+
+    def __init__(self, directorio: str = "perfiles", funciones: int = FUNCIONES_RESUMEN):
+        self.directorio = directorio
+        self.funciones = funciones
+        self.nombre: Optional[str] = None
+        self._perfil: Optional[cProfile.Profile] = None
+        self._inicio = 0.0
+
+    @property
+    def activa(self) -> bool:
+        return self._perfil is not None
+
+    def iniciar(self, nombre: str):
+        if self.activa:
+            return
+        self.nombre = nombre
+        self._inicio = time.perf_counter()
+        self._perfil = cProfile.Profile()
+        self._perfil.enable()
+
+    def detener(self) -> Optional[str]:
+        """Detiene la captura, la guarda y devuelve la ruta del .pstats."""
+        if not self.activa:
+            return None
+        self._perfil.disable()
+        perfil, self._perfil = self._perfil, None
+        segundos = time.perf_counter() - self._inicio
+
+        os.makedirs(self.directorio, exist_ok=True)
+        base = ruta_sin_usar(self.directorio, self.nombre, ".pstats")
+        perfil.dump_stats(base + ".pstats")
+        resumen = io.StringIO()
+        resumen.write(f"Captura {self.nombre}: {segundos:.2f} s\n")
+        pstats.Stats(perfil, stream=resumen).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.funciones)
+        with open(base + ".txt", 'w', encoding='utf-8') as archivo:
+            archivo.write(resumen.getvalue())
+        print(f"Perfil {self.nombre} ({segundos:.1f} s) guardado en {base}.pstats")
+        return base + ".pstats"
+
+
+if __name__ == "__main__":
+    import tempfile
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from simulacion import Simulacion, crear_camino
+    from efectos import GestorEfectos
+
+    print("Probando MedidorRendimiento...")
+    pygame.init()
+    simulacion = Simulacion(crear_camino(), semilla=1)
+    simulacion.iniciar_partida()
+    medidor = MedidorRendimiento()
+    simulacion.medidor = medidor
+    for _ in range(240):
+        inicio = time.perf_counter()
+        simulacion.avanzar(1000.0 / 60)
+        medidor.terminar_frame((time.perf_counter() - inicio) * 1000.0)
+    for seccion, media in medidor.medias().items():
+        print(f"{seccion}: {media:.3f} ms")
+    pantalla = pygame.Surface((1300, 800))
+    HUDRendimiento(medidor).dibujar(pantalla, simulacion, GestorEfectos())
+    print(f"Historial: {len(medidor.historial())} frames, GC: {medidor.colecciones_gc()}")
+
+    captura = CapturaPerfil(tempfile.mkdtemp(), funciones=5)
+    captura.iniciar("prueba")
+    simulacion.avanzar_pasos(600)
+    ruta_perfil = captura.detener()
+    with open(ruta_perfil[:-len(".pstats")] + ".txt", encoding='utf-8') as archivo:
+        print(archivo.read().strip().splitlines()[0])
+    print("¡Prueba de medidor de rendimiento completada!")
@@ -0,0 +1,179 @@
+import math
+from bisect import bisect_right
+import numpy as np
+from functools import lru_cache
+from typing import List, Sequence, Tuple, Union
+
+
+class Ruta:
+    """
+    Camino inmutable parametrizado por longitud de arco.
+
+    Precalcula las longitudes acumuladas, las direcciones unitarias y los
+    extremos de cada segmento. Un enemigo solo guarda la distancia recorrida
+    sobre la ruta; su posición se obtiene con una búsqueda binaria sobre las
+    longitudes acumuladas. Distancias negativas prolongan el primer segmento
+    hacia atrás (enemigos que esperan antes de la entrada) y las mayores que
+    la longitud total quedan en el último punto.
+
+    Las instancias se comparten entre todos los enemigos; ``Ruta.desde``
+    devuelve siempre la misma para un mismo camino. Sigue comportándose como
+    una secuencia de puntos (``len``, índices, iteración).
+    """
+
+    def __init__(self, puntos: Sequence[Tuple[float, float]]):
+        if len(puntos) == 0:
+            raise ValueError("La ruta necesita al menos un punto")
+        self._puntos = tuple((float(x), float(y)) for x, y in puntos)
+        vertices = np.array(self._puntos, dtype=np.float64).reshape(-1, 2)
+        tramos = np.diff(vertices, axis=0)
+        longitudes = np.hypot(tramos[:, 0], tramos[:, 1])
+        direcciones = np.zeros_like(tramos)
+        np.divide(tramos, longitudes[:, None], out=direcciones, where=longitudes[:, None] > 0)
+        acumuladas = np.concatenate(([0.0], np.cumsum(longitudes)))
+
+        self.vertices = vertices
+        self.longitudes = longitudes
+        self.acumuladas = acumuladas
+        self.direcciones = direcciones
+        self.longitud_total = float(acumuladas[-1])
+        for tabla in (self.vertices, self.longitudes, self.acumuladas, self.direcciones):
+            tabla.flags.writeable = False
+        # Copias en listas para las consultas de un solo enemigo, sin pasar por NumPy
+        self._acumuladas_lista = acumuladas.tolist()
+        self._direcciones_lista = [tuple(d) for d in direcciones.tolist()]
+
+    @classmethod
+    def desde(cls, camino: Union['Ruta', Sequence[Tuple[float, float]]]) -> 'Ruta':
+        """Ruta compartida para un camino (la propia ruta si ya lo es)."""
+        if isinstance(camino, Ruta):
+            return camino
+        return _ruta_compartida(tuple((float(x), float(y)) for x, y in camino))
+
+    def __len__(self) -> int:
+        return len(self._puntos)
+
+    def __getitem__(self, indice):
+        return self._puntos[indice]
+
+    def __iter__(self):
+        return iter(self._puntos)
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, Ruta):
+            return self._puntos == otra._puntos
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._puntos)
+
+    def indices_segmento(self, distancias: np.ndarray) -> np.ndarray:
+        """Segmento sobre el que cae cada distancia (0 .. número de segmentos - 1)."""
+        indices = np.searchsorted(self.acumuladas, distancias, side='right') - 1
+        return np.clip(indices, 0, max(0, len(self.longitudes) - 1))
+
+    def posiciones(self, distancias: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Coordenadas (x, y) de un arreglo de distancias sobre la ruta."""
+        distancias = np.asarray(distancias, dtype=np.float64)
+        if len(self.longitudes) == 0:
+            return (np.full(distancias.shape, self.vertices[0, 0]),
+                    np.full(distancias.shape, self.vertices[0, 1]))
+        s = np.minimum(distancias, self.longitud_total)
+        i = self.indices_segmento(s)
+        avance = s - self.acumuladas[i]
+        x = self.vertices[i, 0] + self.direcciones[i, 0] * avance
+        y = self.vertices[i, 1] + self.direcciones[i, 1] * avance
+        return x, y
+
+    def posicion(self, distancia: float) -> Tuple[float, float]:
+        if not self._direcciones_lista:
+            return self._puntos[0]
+        if distancia >= self.longitud_total:
+            return self._puntos[-1]
+        i = min(max(bisect_right(self._acumuladas_lista, distancia) - 1, 0),
+                len(self._direcciones_lista) - 1)
+        avance = distancia - self._acumuladas_lista[i]
+        x, y = self._puntos[i]
+        dx, dy = self._direcciones_lista[i]
+        return x + dx * avance, y + dy * avance
+
+    def indice_segmento(self, distancia: float) -> int:
+        return int(self.indices_segmento(np.array([distancia]))[0])
+
+    def distancia_de(self, x: float, y: float) -> float:
+        """
+        Distancia sobre la ruta del punto de la ruta más cercano a (x, y).
+
+        Antes del primer segmento se admite una distancia negativa, de modo
+        que un enemigo colocado detrás de la entrada conserva su separación.
+        """
+        if len(self.longitudes) == 0:
+            return 0.0
+        relativo = np.array([x, y]) - self.vertices[:-1]
+        t = np.einsum('ij,ij->i', relativo, self.direcciones)
+        t = np.minimum(t, self.longitudes)
+        t[1:] = np.maximum(t[1:], 0.0)
+        cercanos = self.vertices[:-1] + self.direcciones * t[:, None]
+        separacion = np.hypot(cercanos[:, 0] - x, cercanos[:, 1] - y)
+        i = int(np.argmin(separacion))
+        return float(self.acumuladas[i] + t[i])
+
+    def intervalos_en_radio(self, cx: float, cy: float, radio: float) -> List[Tuple[float, float]]:
+        """
+        Tramos de la ruta, en longitud de arco, a distancia <= radio de (cx, cy).
+
+        Devuelve intervalos ``(inicio, fin)`` ordenados y sin solapes; los
+        tramos contiguos a través de un vértice se fusionan en uno solo.
+        """
+        intervalos: List[Tuple[float, float]] = []
+        for i in range(len(self.longitudes)):
+            longitud = self.longitudes[i]
+            if longitud <= 0:
+                continue
+            dx, dy = self.direcciones[i]
+            ox = self.vertices[i, 0] - cx
+            oy = self.vertices[i, 1] - cy
+            # |o + d·t|² <= r²  ->  t² + 2bt + c <= 0
+            b = ox * dx + oy * dy
+            discriminante = b * b - (ox * ox + oy * oy - radio * radio)
+            if discriminante < 0:
+                continue
+            raiz = math.sqrt(discriminante)
+            t0 = -b - raiz
+            t1 = min(-b + raiz, longitud)
+            if i > 0:
+                t0 = max(t0, 0.0)
+            if t0 > t1:
+                continue
+            inicio = float(self.acumuladas[i] + t0)
+            fin = float(self.acumuladas[i] + t1)
+            if intervalos and inicio <= intervalos[-1][1] + 1e-9:
+                intervalos[-1] = (intervalos[-1][0], max(fin, intervalos[-1][1]))
+            else:
+                intervalos.append((inicio, fin))
+        return intervalos
+
+    def tramo(self, inicio: float, fin: float) -> List[Tuple[float, float]]:
+        """Puntos de la polilínea que recorre la ruta entre dos distancias."""
+        puntos = [self.posicion(inicio)]
+        for indice, distancia in enumerate(self.acumuladas.tolist()):
+            if inicio < distancia < fin:
+                puntos.append(self._puntos[indice])
+        puntos.append(self.posicion(fin))
+        return puntos
+
+
+@lru_cache(maxsize=32)
+def _ruta_compartida(puntos: Tuple[Tuple[float, float], ...]) -> Ruta:
+    return Ruta(puntos)
+
+
+if __name__ == "__main__":
+    print("Probando Ruta...")
+    ruta = Ruta.desde([(50, 400), (200, 400), (200, 200), (400, 200)])
+    print(f"Longitud total: {ruta.longitud_total}")
+    for distancia in (-60, 0, 150, 250, 350, 1000):
+        print(f"Distancia {distancia}: {ruta.posicion(distancia)}")
+    print(f"Distancia de (200, 300): {ruta.distancia_de(200, 300)}")
+    print(f"Compartida: {ruta is Ruta.desde([(50, 400), (200, 400), (200, 200), (400, 200)])}")
+    print("¡Prueba de ruta completada!")
@@ -0,0 +1,655 @@
+import hashlib
+import math
+import random
+import time
+from enum import Enum
+from typing import Iterable, List, Dict, Optional, Tuple
+from Enemigo import Enemigo, EnemigoBasico, EnemigoRapido, EnemigoTanque
+from almacen_enemigos import AlmacenEnemigos
+from ruta import Ruta
+from aleatorio import FlujosAleatorios
+from pool_objetos import PoolObjetos
+from planificador import PlanificadorGeneraciones, PlanificadorTorres
+from construccion import MapaConstruccion
+from misiles import MotorProyectiles, VISUAL_BALA
+from torres import torres, NIVEL_MAXIMO
+from Excepcion_juego import ExcepcionRecursosInsuficientes
+
+
+# Resolución de referencia sobre la que está diseñado el mapa
+ANCHO_BASE = 1300
+ALTO_BASE = 800
+
+CAMINO_BASE = [
+    (50, 400), (200, 400), (200, 200), (400, 200),
+    (400, 600), (600, 600), (600, 300), (800, 300),
+    (800, 500), (1000, 500), (1000, 200), (1150, 200)
+]
+
+
+def crear_camino(ancho: int = ANCHO_BASE, alto: int = ALTO_BASE) -> List[Tuple[int, int]]:
+    """Escala el camino base a la resolución indicada."""
+    escala_x = ancho / ANCHO_BASE
+    escala_y = alto / ALTO_BASE
+    return [(int(x * escala_x), int(y * escala_y)) for x, y in CAMINO_BASE]
+
+
+class NivelDificultad(Enum):
+    FACIL = 1
+    MEDIO = 2
+    DIFICIL = 3
+
+
+# Separación mínima de una torre nueva al camino y a las demás torres
+DISTANCIA_MINIMA_CAMINO = 50
+DISTANCIA_MINIMA_TORRES = 60
+
+MODIFICADORES_DIFICULTAD = {
+    NivelDificultad.FACIL: {'dinero': 300, 'vidas': 5},
+    NivelDificultad.MEDIO: {'dinero': 200, 'vidas': 3},
+    NivelDificultad.DIFICIL: {'dinero': 150, 'vidas': 1}
+}
+
+
+class GestorRecursos:
+    def __init__(self, dinero: int = 0, vidas: int = 0):
+        self.recursos = {"dinero": dinero, "vidas": vidas}
+
+    def gastar(self, clave: str, valor: int) -> bool:
+        actual = self.recursos.get(clave, 0)
+        if actual >= valor:
+            self.recursos[clave] = actual - valor
+            return True
+        return False
+
+    def ganar(self, clave: str, valor: int) -> None:
+        self.recursos[clave] = self.recursos.get(clave, 0) + valor
+
+    def obtener(self, clave: str) -> int:
+        return self.recursos.get(clave, 0)
+
+
+class TorreBase(torres):
+    __slots__ = ('intervalo_disparo', 'objetivo', 'tipo')
+
+    def __init__(self, x: int, y: int):
+        super().__init__(x, y)
+        self.costo = 50
+        self.ultimo_disparo = 0
+        self.intervalo_disparo = 1000
+        self.objetivo = None
+        self.tipo = None
+
+    def puede_disparar(self, tiempo_actual: float) -> bool:
+        return tiempo_actual - self.ultimo_disparo >= self.intervalo_disparo
+
+    def mejorar(self) -> bool:
+        if not super().mejorar():
+            return False
+        # La recarga en la simulación se mide con intervalo_disparo, no con cadencia_fuego
+        self.intervalo_disparo = max(200, int(self.intervalo_disparo * 0.85))
+        return True
+
+    def encontrar_objetivo(self, enemigos: List[Enemigo]) -> Optional[Enemigo]:
+        if isinstance(enemigos, AlmacenEnemigos):
+            if self.intervalos_cobertura is not None and enemigos.ruta is self.ruta_cobertura:
+                return enemigos.mas_avanzado(self.intervalos_cobertura)
+            return enemigos.mas_cercano(self.x, self.y, self.rango)
+        objetivo_mas_cercano = None
+        distancia_minima = float('inf')
+        for enemigo in enemigos:
+            if getattr(enemigo, "activo", False):
+                distancia = math.sqrt((self.x - enemigo.x)**2 + (self.y - enemigo.y)**2)
+                if distancia <= self.rango and distancia < distancia_minima:
+                    distancia_minima = distancia
+                    objetivo_mas_cercano = enemigo
+        return objetivo_mas_cercano
+
+    def disparar(self, objetivo: Enemigo, motor: MotorProyectiles, tiempo_actual: float):
+        motor.disparar(self.x, self.y, objetivo.x, objetivo.y, daño=self.daño,
+                       velocidad=300.0, radio_colision=15, visual=VISUAL_BALA)
+        self.ultimo_disparo = tiempo_actual
+
+class TorreCañon(TorreBase):
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int):
+        super().__init__(x, y)
+        self.costo = 50
+        self.rango = 100
+        self.daño = 35
+        self.intervalo_disparo = 1500
+        self.tipo = 'cañon'
+
+class TorreMisil(TorreBase):
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int):
+        super().__init__(x, y)
+        self.costo = 100
+        self.rango = 120
+        self.daño = 50
+        self.intervalo_disparo = 2000
+        self.tipo = 'misil'
+
+class TorreLaser(TorreBase):
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int):
+        super().__init__(x, y)
+        self.costo = 75
+        self.rango = 80
+        self.daño = 65
+        self.intervalo_disparo = 800
+        self.tipo = 'laser'
+
+
+CLASES_TORRES = {
+    'cañon': TorreCañon,
+    'misil': TorreMisil,
+    'laser': TorreLaser
+}
+
+CLASES_ENEMIGOS = {
+    'basico': EnemigoBasico,
+    'rapido': EnemigoRapido,
+    'tanque': EnemigoTanque
+}
+
+
+class GeneradorOleadas:
+    def __init__(self, dificultad: NivelDificultad, rng: Optional[random.Random] = None):
+        self.dificultad = dificultad
+        self._rng = rng if rng is not None else random.Random()
+        self.numero_oleada = 1
+        self.configuraciones_oleadas = self._generar_configuraciones()
+
+    def _generar_configuraciones(self) -> List[List[Dict]]:
+        configuraciones = []
+        multiplicador = {
+            NivelDificultad.FACIL: 0.8,
+            NivelDificultad.MEDIO: 1.0,
+            NivelDificultad.DIFICIL: 1.3
+        }[self.dificultad]
+        for oleada in range(1, 11):
+            config_oleada = []
+            num_enemigos = min(oleada * 3, 15)
+            for i in range(int(num_enemigos * multiplicador)):
+                if oleada <= 3:
+                    tipo = 'basico'
+                elif oleada <= 6:
+                    tipo = self._rng.choice(['basico', 'rapido'])
+                else:
+                    tipo = self._rng.choice(['basico', 'rapido', 'tanque'])
+                config_oleada.append({
+                    'tipo': tipo,
+                    'retraso': i * 1.0
+                })
+            configuraciones.append(config_oleada)
+        return configuraciones
+
+    def __next__(self):
+        if self.numero_oleada <= len(self.configuraciones_oleadas):
+            config = self.configuraciones_oleadas[self.numero_oleada - 1]
+            self.numero_oleada += 1
+            return config
+        else:
+            raise StopIteration
+
+
+class Simulacion:
+    """
+    Núcleo de la lógica del juego, sin pantalla ni audio.
+
+    Es dueña de las torres, enemigos, proyectiles, el gestor de recursos y el
+    generador de oleadas, y avanza en pasos de duración fija sobre su propio
+    reloj. Así puede ejecutarse sin ventana y a cualquier velocidad, por
+    ejemplo para equilibrar oleadas ejecutando miles de partidas.
+
+    Toda la aleatoriedad sale de flujos con nombre derivados de ``semilla``
+    y las órdenes del jugador pueden registrarse con un ``grabador`` (ver
+    grabacion.py): misma semilla y mismas entradas en los mismos ticks dan
+    exactamente la misma partida.
+    """
+
+    DT_PASO = 1000.0 / 60  # ms simulados por paso
+    MAX_ACUMULADO = 250.0  # evita la espiral de pasos tras un frame muy largo
+    TAMAÑO_CELDA_CONSTRUCCION = 4  # px por celda del mapa de construcción
+
+    def __init__(self, camino: List[Tuple[int, int]],
+                 dificultad: NivelDificultad = NivelDificultad.MEDIO,
+                 ancho: int = ANCHO_BASE, alto: int = ALTO_BASE,
+                 dinero: int = 200, vidas: int = 20, semilla: Optional[int] = None):
+        self.camino = camino
+        self.ruta = Ruta.desde(camino)
+        self.ancho = ancho
+        self.alto = alto
+        self.dificultad = dificultad
+        self.dinero_inicial = dinero
+        self.vidas_iniciales = vidas
+        self.aleatorio = FlujosAleatorios(semilla)
+        self.semilla = self.aleatorio.semilla
+        # Recibe (tick, tipo, argumentos) de cada orden que altera la partida
+        self.grabador = None
+        # MedidorRendimiento que recibe el tiempo de cada fase del paso (solo con el HUD visible)
+        self.medidor = None
+        # RegistroTrazas que recibe un span por fase del paso (solo mientras se graba)
+        self.trazas = None
+        self.torres: List[TorreBase] = []
+        self.planificador_torres = PlanificadorTorres()
+        self.mapa_construccion = MapaConstruccion(
+            self.ruta, ancho, alto, DISTANCIA_MINIMA_CAMINO, DISTANCIA_MINIMA_TORRES,
+            self.TAMAÑO_CELDA_CONSTRUCCION)
+        self.enemigos = AlmacenEnemigos(self.ruta, ancho=ancho, alto=alto,
+                                        rng=self.aleatorio.generador('movimiento'))
+        self.pools_enemigos = {tipo: PoolObjetos(clase) for tipo, clase in CLASES_ENEMIGOS.items()}
+        self.enemigos.al_retirar = self._liberar_enemigo
+        self.proyectiles = MotorProyectiles(ancho, alto)
+        self.gestor_recursos = GestorRecursos(dinero=dinero, vidas=vidas)
+        self.generador_oleadas: Optional[GeneradorOleadas] = None
+
+        self._oleadas_automaticas = False
+        self.oleadas_agotadas = False
+        # Enemigos que llegaron al final de la ruta en la partida actual
+        self.fugas = 0
+        self.retraso_oleada = 10000
+        self.ultimo_tiempo_oleada = 0.0
+
+        self.tick = 0
+        self._acumulado = 0.0
+        self.planificador = PlanificadorGeneraciones()
+
+        # Tipos de torre que dispararon desde el último avance (para el audio)
+        self.disparos: List[str] = []
+        # Posiciones de los impactos desde el último avance (para los efectos)
+        self.impactos: List[Tuple[float, float]] = []
+
+    @property
+    def tiempo_actual(self) -> float:
+        """Tiempo simulado en milisegundos."""
+        return self.tick * self.DT_PASO
+
+    @property
+    def derrota(self) -> bool:
+        return self.gestor_recursos.obtener('vidas') <= 0
+
+    @property
+    def victoria(self) -> bool:
+        """Todas las oleadas salieron y no queda ningún enemigo por generar ni vivo."""
+        return (self.oleadas_agotadas and len(self.enemigos) == 0
+                and len(self.planificador) == 0 and not self.derrota)
+
+    @property
+    def oleadas_superadas(self) -> int:
+        """Oleadas lanzadas y eliminadas por completo."""
+        if self.generador_oleadas is None:
+            return 0
+        lanzadas = self.generador_oleadas.numero_oleada - 1
+        en_curso = len(self.enemigos) > 0 or len(self.planificador) > 0 or self.derrota
+        return max(0, lanzadas - 1) if en_curso else lanzadas
+
+    @property
+    def oleadas_automaticas(self) -> bool:
+        return self._oleadas_automaticas
+
+    @oleadas_automaticas.setter
+    def oleadas_automaticas(self, valor: bool):
+        valor = bool(valor)
+        if valor != self._oleadas_automaticas:
+            self._registrar('oleadas_automaticas', valor)
+            self._oleadas_automaticas = valor
+
+    def _registrar(self, tipo: str, *argumentos):
+        if self.grabador is not None:
+            self.grabador.registrar(self.tick, tipo, argumentos)
+
+    def aplicar_entrada(self, tipo: str, argumentos) -> None:
+        """Repite una orden grabada con ``_registrar`` (ver grabacion.py)."""
+        if tipo == 'iniciar_partida':
+            self.iniciar_partida(NivelDificultad[argumentos[0]])
+        elif tipo == 'colocar_torre':
+            try:
+                self.colocar_torre(*argumentos)
+            except ExcepcionRecursosInsuficientes:
+                pass
+        elif tipo == 'vender_torre':
+            self.vender_torre(self.torres[argumentos[0]])
+        elif tipo == 'mejorar_torre':
+            self.mejorar_torre(self.torres[argumentos[0]])
+        elif tipo == 'oleadas_automaticas':
+            self.oleadas_automaticas = argumentos[0]
+        else:
+            raise ValueError(f"Entrada grabada desconocida: {tipo}")
+
+    def iniciar_partida(self, dificultad: Optional[NivelDificultad] = None):
+        """Reinicia el estado para una partida nueva con oleadas automáticas."""
+        if dificultad is not None:
+            self.dificultad = dificultad
+        self._registrar('iniciar_partida', self.dificultad.name)
+        self.generador_oleadas = GeneradorOleadas(self.dificultad, self.aleatorio.flujo('oleadas'))
+        self.gestor_recursos.recursos.update(MODIFICADORES_DIFICULTAD[self.dificultad])
+        self.reemplazar_torres()
+        self.enemigos.clear()
+        self.proyectiles.clear()
+        self.planificador.clear()
+        self._oleadas_automaticas = True
+        self.oleadas_agotadas = False
+        self.fugas = 0
+        self.ultimo_tiempo_oleada = self.tiempo_actual
+
+    def posicion_valida_torre(self, x: int, y: int) -> bool:
+        """
+        Si cabe una torre en (x, y): lejos de los segmentos del camino y de
+        las demás torres. Es una consulta al mapa de construcción, que se
+        actualiza en colocar_torre, vender_torre y reemplazar_torres.
+        """
+        return self.mapa_construccion.es_valida(x, y)
+
+    def colocar_torre(self, x: int, y: int, tipo_torre: str) -> Optional[TorreBase]:
+        if tipo_torre not in CLASES_TORRES:
+            return None
+        torre_nueva = CLASES_TORRES[tipo_torre](x, y)
+        if not self.gestor_recursos.gastar('dinero', torre_nueva.costo):
+            raise ExcepcionRecursosInsuficientes(
+                f"No tienes suficiente dinero para {tipo_torre}"
+            )
+        # Solo se graban las órdenes que cambiaron la partida
+        self._registrar('colocar_torre', x, y, tipo_torre)
+        torre_nueva.calcular_cobertura(self.ruta)
+        self.torres.append(torre_nueva)
+        self.mapa_construccion.agregar_torre(x, y)
+        self.planificador_torres.agregar(torre_nueva, self._tick_listo(torre_nueva))
+        return torre_nueva
+
+    def vender_torre(self, torre: TorreBase) -> int:
+        """Retira una torre y devuelve su valor de venta; 0 si no estaba colocada."""
+        if torre not in self.torres:
+            return 0
+        self._registrar('vender_torre', self.torres.index(torre))
+        self.torres.remove(torre)
+        self.mapa_construccion.quitar_torre(torre.x, torre.y)
+        self._sincronizar_torres()
+        valor = torre.obtener_valor_venta()
+        self.gestor_recursos.ganar('dinero', valor)
+        return valor
+
+    def mejorar_torre(self, torre: TorreBase) -> bool:
+        """
+        Sube un nivel una torre colocada cobrando su costo de mejora.
+
+        Con el nuevo rango y la nueva cadencia, la torre se vuelve a programar
+        en el planificador (aunque estuviera dormida) con su cobertura
+        recalculada. Devuelve False si no estaba colocada o ya es de nivel máximo.
+        """
+        if torre not in self.torres or torre.nivel >= NIVEL_MAXIMO:
+            return False
+        if not self.gestor_recursos.gastar('dinero', torre.obtener_costo_mejora()):
+            raise ExcepcionRecursosInsuficientes(
+                f"No tienes suficiente dinero para mejorar {torre.tipo}"
+            )
+        self._registrar('mejorar_torre', self.torres.index(torre))
+        torre.mejorar()
+        torre.calcular_cobertura(self.ruta)
+        self.planificador_torres.reprogramar(torre, self._tick_listo(torre))
+        return True
+
+    def reemplazar_torres(self, torres_nuevas: Iterable[TorreBase] = ()):
+        """
+        Sustituye todas las torres de la partida (sin argumentos, las quita).
+
+        Es la forma de cambiar la lista entera desde fuera (el tutorial la
+        vacía): recalcula la cobertura de cada torre, el mapa de construcción
+        y el planificador. No se graba; las partidas grabadas empiezan con
+        ``iniciar_partida``.
+        """
+        self.torres[:] = torres_nuevas
+        for torre in self.torres:
+            torre.calcular_cobertura(self.ruta)
+        self.mapa_construccion.reconstruir_torres(self.torres)
+        self._sincronizar_torres()
+
+    def torre_en(self, x: float, y: float) -> Optional[TorreBase]:
+        """Torre cuyo dibujo contiene el punto (x, y), si la hay."""
+        for torre in self.torres:
+            if (x - torre.x) ** 2 + (y - torre.y) ** 2 <= torre.radio_visual ** 2:
+                return torre
+        return None
+
+    def cobertura_ruta(self) -> List[Tuple[float, float, int]]:
+        """
+        Tramos de la ruta cubiertos por al menos una torre.
+
+        Returns:
+            Lista de (inicio, fin, torres) en longitud de arco, donde
+            ``torres`` es cuántas torres alcanzan ese tramo
+        """
+        eventos = []
+        for torre in self.torres:
+            for inicio, fin in torre.intervalos_cobertura or []:
+                eventos.append((inicio, 1))
+                eventos.append((fin, -1))
+        eventos.sort()
+        tramos = []
+        solapes = 0
+        anterior = None
+        for distancia, cambio in eventos:
+            if solapes > 0 and distancia > anterior:
+                tramos.append((anterior, distancia, solapes))
+            solapes += cambio
+            anterior = distancia
+        return tramos
+
+    def generar_enemigo(self, tipo_enemigo: str) -> Optional[Enemigo]:
+        if tipo_enemigo not in CLASES_ENEMIGOS:
+            return None
+        enemigo = self.pools_enemigos[tipo_enemigo].adquirir(self.camino[0][0], self.camino[0][1])
+        enemigo.ruta = self.ruta
+        enemigo.aleatorio = self.aleatorio
+        enemigo.desplazamiento_animacion = self.aleatorio.flujo('animacion').uniform(0, 2 * math.pi)
+        self.enemigos.append(enemigo)
+        return enemigo
+
+    def _liberar_enemigo(self, enemigo: Enemigo):
+        pool = self.pools_enemigos.get(enemigo.tipo_enemigo)
+        if pool is not None:
+            pool.liberar(enemigo)
+
+    def estadisticas_pools(self) -> Dict[str, dict]:
+        """Máximo en uso y tasa de reutilización de cada pool de la simulación."""
+        estadisticas = {f"enemigo_{tipo}": pool.estadisticas()
+                        for tipo, pool in self.pools_enemigos.items()}
+        estadisticas['proyectiles'] = self.proyectiles.estadisticas()
+        estadisticas['filas_enemigos'] = self.enemigos.estadisticas()
+        return estadisticas
+
+    def huella(self) -> str:
+        """
+        Resumen (SHA-1) del estado simulado: tick, recursos, oleada, torres,
+        enemigos y proyectiles. Dos ejecuciones son idénticas si coinciden.
+        """
+        resumen = hashlib.sha1()
+        resumen.update(repr((
+            self.tick, sorted(self.gestor_recursos.recursos.items()),
+            self.generador_oleadas.numero_oleada if self.generador_oleadas else 0,
+            [(torre.tipo, torre.x, torre.y, torre.ultimo_disparo) for torre in self.torres],
+            self.planificador.pendientes(),
+        )).encode())
+        for almacen in (self.enemigos, self.proyectiles):
+            for nombre in sorted(almacen.columnas):
+                resumen.update(almacen.columnas[nombre][:almacen.n].tobytes())
+        return resumen.hexdigest()
+
+    def avanzar(self, dt: float, escala: float = 1.0) -> int:
+        """
+        Acumula tiempo real y ejecuta los pasos fijos que correspondan.
+
+        Args:
+            dt: Tiempo transcurrido en milisegundos
+            escala: Velocidad del juego (2 = el doble de pasos por frame)
+
+        Returns:
+            Número de pasos simulados
+        """
+        self.disparos.clear()
+        self.impactos.clear()
+        self._acumulado = min(self._acumulado + dt * escala, self.MAX_ACUMULADO * escala)
+        pasos = 0
+        while self._acumulado >= self.DT_PASO:
+            self._acumulado -= self.DT_PASO
+            self.paso()
+            pasos += 1
+        return pasos
+
+    def avanzar_pasos(self, pasos: int) -> int:
+        """Ejecuta ``pasos`` pasos fijos sin mirar el reloj real (velocidad máxima)."""
+        self.disparos.clear()
+        self.impactos.clear()
+        for _ in range(pasos):
+            self.paso()
+        return pasos
+
+    def paso(self):
+        """Avanza la simulación exactamente un paso fijo."""
+        self.tick += 1
+        dt = self.DT_PASO
+        tiempo_actual = self.tiempo_actual
+        if self.medidor is not None or self.trazas is not None:
+            self._paso_medido(dt, tiempo_actual)
+            return
+
+        self._procesar_generaciones(tiempo_actual)
+        self._actualizar_enemigos(dt)
+        self._actualizar_torres(tiempo_actual)
+        self._actualizar_proyectiles(dt)
+        self._liquidar_paso()
+        if self.oleadas_automaticas:
+            self._actualizar_oleadas(tiempo_actual)
+
+    def _paso_medido(self, dt: float, tiempo_actual: float):
+        """El mismo paso, con el tiempo de cada fase enviado al medidor y a las trazas."""
+        reloj = time.perf_counter
+        t0 = reloj()
+        self._procesar_generaciones(tiempo_actual)
+        t1 = reloj()
+        self._actualizar_enemigos(dt)
+        t2 = reloj()
+        self._actualizar_torres(tiempo_actual)
+        t3 = reloj()
+        self._actualizar_proyectiles(dt)
+        t4 = reloj()
+        self._liquidar_paso()
+        t5 = reloj()
+        if self.oleadas_automaticas:
+            self._actualizar_oleadas(tiempo_actual)
+        t6 = reloj()
+        medidor = self.medidor
+        if medidor is not None:
+            medidor.acumular('enemigos', t2 - t0)
+            medidor.acumular('objetivos', t3 - t2)
+            medidor.acumular('proyectiles', t4 - t3)
+            medidor.acumular('resto_sim', t6 - t4)
+        trazas = self.trazas
+        if trazas is not None:
+            trazas.registrar('paso', t0, t6, {'tick': self.tick})
+            trazas.registrar('generaciones', t0, t1)
+            trazas.registrar('enemigos', t1, t2)
+            trazas.registrar('torres', t2, t3)
+            trazas.registrar('proyectiles', t3, t4)
+            trazas.registrar('liquidar', t4, t5)
+            trazas.registrar('oleadas', t5, t6)
+
+    def _actualizar_enemigos(self, dt: float):
+        self.enemigos.actualizar(dt, liquidar=False)
+
+    def _liquidar_paso(self):
+        """
+        Retira en una sola compactación estable todo lo que terminó en el paso.
+
+        Durante el paso los enemigos y proyectiles solo se marcan inactivos;
+        así una oleada entera eliminada de golpe se retira en una sola pasada.
+        """
+        self.proyectiles.compactar()
+        fugas, recompensa = self.enemigos.liquidar()
+        if fugas:
+            self.fugas += fugas
+            vidas = self.gestor_recursos.obtener('vidas')
+            self.gestor_recursos.gastar('vidas', min(fugas, vidas))
+        if recompensa:
+            self.gestor_recursos.ganar('dinero', recompensa)
+
+    def _tick_listo(self, torre: TorreBase) -> int:
+        """Primer tick en el que ``torre.puede_disparar`` será cierto."""
+        tick = max(0, math.ceil((torre.ultimo_disparo + torre.intervalo_disparo) / self.DT_PASO))
+        # Ajuste fino por redondeo: mismo criterio que puede_disparar
+        while tick > 0 and torre.puede_disparar((tick - 1) * self.DT_PASO):
+            tick -= 1
+        while not torre.puede_disparar(tick * self.DT_PASO):
+            tick += 1
+        return tick
+
+    def _sincronizar_torres(self):
+        """Vuelve a programar todas las torres tras quitar o sustituir alguna."""
+        self.planificador_torres.clear()
+        for torre in self.torres:
+            self.planificador_torres.agregar(torre, self._tick_listo(torre))
+
+    def _actualizar_torres(self, tiempo_actual: float):
+        """
+        Solo buscan objetivo las torres que ya recargaron; las que no
+        encuentran ninguno duermen hasta que entren enemigos en su cobertura.
+        """
+        planificador = self.planificador_torres
+        planificador.despertar(self.enemigos, self.tick)
+        for torre in planificador.extraer_listas(self.tick):
+            torre.objetivo = torre.encontrar_objetivo(self.enemigos)
+            if torre.objetivo:
+                torre.disparar(torre.objetivo, self.proyectiles, tiempo_actual)
+                self.disparos.append(torre.tipo)
+                planificador.programar(torre, self._tick_listo(torre))
+            elif torre.intervalos_cobertura is not None and torre.ruta_cobertura is self.ruta:
+                planificador.dormir(torre)
+            else:
+                planificador.programar(torre, self.tick + 1)
+
+    def _actualizar_proyectiles(self, dt: float):
+        self.impactos.extend(self.proyectiles.actualizar(dt, self.enemigos, compactar=False))
+
+    def _actualizar_oleadas(self, tiempo_actual: float):
+        if self.oleadas_agotadas or self.generador_oleadas is None:
+            return
+        # La siguiente oleada espera a que la actual termine de salir y caiga entera
+        if (len(self.enemigos) == 0 and len(self.planificador) == 0
+                and tiempo_actual - self.ultimo_tiempo_oleada > self.retraso_oleada):
+            self.ultimo_tiempo_oleada = tiempo_actual
+            try:
+                config_oleada = next(self.generador_oleadas)
+            except StopIteration:
+                self.oleadas_agotadas = True
+                return
+            self.planificador.programar_oleada(tiempo_actual, config_oleada)
+
+    def programar_generacion(self, retraso: float, tipo_enemigo: str, grupo: Optional[str] = None):
+        """Genera un enemigo dentro de ``retraso`` ms de tiempo simulado."""
+        self.planificador.programar(self.tiempo_actual + retraso, tipo_enemigo, grupo)
+
+    def _procesar_generaciones(self, tiempo_actual: float):
+        for tipo_enemigo in self.planificador.extraer_vencidos(tiempo_actual):
+            self.generar_enemigo(tipo_enemigo)
+
+
+if __name__ == "__main__":
+    print("Probando Simulacion sin pantalla...")
+    simulacion = Simulacion(crear_camino())
+    simulacion.iniciar_partida(NivelDificultad.FACIL)
+    for x, y, tipo in [(300, 300, 'cañon'), (500, 520, 'laser'), (700, 400, 'misil')]:
+        if simulacion.posicion_valida_torre(x, y):
+            simulacion.colocar_torre(x, y, tipo)
+    while not simulacion.derrota and simulacion.tick < 60 * 600:
+        simulacion.paso()
+    print(f"Ticks: {simulacion.tick}, Oleada: {simulacion.generador_oleadas.numero_oleada}, "
+          f"Dinero: {simulacion.gestor_recursos.obtener('dinero')}, "
+          f"Vidas: {simulacion.gestor_recursos.obtener('vidas')}")
+    for nombre, datos in simulacion.estadisticas_pools().items():
+        print(f"Pool {nombre}: máximo {datos['maximo_en_uso']}, "
+              f"reutilización {datos['tasa_reutilizacion']:.0%}")
+    print("Prueba de simulación completada!")
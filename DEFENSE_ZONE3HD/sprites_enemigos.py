@@ -0,0 +1,266 @@
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+import pygame
+from almacen_enemigos import TIPOS_ENEMIGO, ID_TIPO_ENEMIGO
+from Enemigo import FABRICAS_ENEMIGOS, COLORES_ENEMIGOS
+from atlas import Atlas, componer, girar
+
+ANCHO_BARRA = 30
+ALTO_BARRA = 5
+# Amplitud del pulso del cuerpo (ver Enemigo._dibujar_cuerpo_enemigo)
+AMPLITUD_PULSO = 0.1
+VELOCIDAD_PULSO = 0.005
+
+COLOR_TRANSPARENTE = (255, 0, 255)
+
+# Casco y cañón de assets/tanque_enemigo/ para cada tipo (Hull_XX, Gun_XX)
+TANQUES_ENEMIGOS = {'basico': '03', 'rapido': '04', 'tanque': '02'}
+# Orientaciones horneadas (cada 360/16 = 22,5 grados)
+ORIENTACIONES = 16
+# Largo del tanque respecto al diámetro del círculo que sustituye
+LARGO_EXTRA = 6
+# Parpadeo de daño: se multiplica el color del tanque por este
+COLOR_DAÑO = (255, 90, 90)
+
+Sprite = Tuple[pygame.Surface, int, int]
+
+
+def _hornear(dibujar: Callable[[pygame.Surface, Tuple[int, int]], None], lado: int) -> Sprite:
+    """
+    Dibuja en una superficie transparente y la recorta a lo pintado.
+
+    El dibujo no tiene antialiasing, así que basta un color clave con RLE en
+    lugar de alfa por píxel, que al blitear es varias veces más caro. Devuelve
+    la superficie y el desplazamiento (dx, dy) del punto de anclaje dentro
+    de ella: se blitea en (x - dx, y - dy).
+    """
+    ancla = lado // 2
+    superficie = pygame.Surface((lado, lado), pygame.SRCALPHA)
+    dibujar(superficie, (ancla, ancla))
+    caja = superficie.get_bounding_rect()
+    recorte = pygame.Surface(caja.size)
+    recorte.fill(COLOR_TRANSPARENTE)
+    recorte.blit(superficie, (0, 0), caja)
+    if pygame.display.get_surface() is not None:
+        recorte = recorte.convert()
+    recorte.set_colorkey(COLOR_TRANSPARENTE, pygame.RLEACCEL)
+    return recorte, ancla - caja.x, ancla - caja.y
+
+
+class CacheSpritesEnemigos:
+    """
+    Fotogramas de los enemigos horneados una vez y dibujados con un solo ``blits``.
+
+    El pulso del cuerpo solo toma unos pocos tamaños enteros, así que para
+    cada tipo se hornean todos los tamaños posibles, con y sin el parpadeo
+    de daño, usando el propio ``_dibujar_cuerpo`` de su clase (estela del
+    rápido, anillo del tanque). La barra de vida se hornea para cada ancho
+    de la parte verde. ``dibujar`` calcula con NumPy, a partir de las
+    columnas del almacén, qué fotograma y dónde le toca a cada enemigo, y lo
+    pinta todo en una llamada a ``Surface.blits`` en el mismo orden que el
+    dibujo enemigo a enemigo.
+
+    Con el atlas de tanques, el cuerpo es en cambio el tanque de
+    assets/tanque_enemigo/ de cada tipo (teñido con su color), horneado en
+    ``ORIENTACIONES`` giros con y sin el parpadeo de daño y empaquetado en
+    un atlas propio; cada enemigo usa el giro del tramo de ruta por el que
+    va, así que los fotogramas son subsuperficies de una misma página.
+    """
+
+    def __init__(self, atlas_tanques: Optional[Atlas] = None):
+        n_tipos = len(TIPOS_ENEMIGO)
+        self._tamaños = np.zeros(n_tipos)
+        self._minimos = np.zeros(n_tipos, dtype=np.int64)
+        self._maximos = np.zeros(n_tipos, dtype=np.int64)
+        # [tipo][tamaño - mínimo, o giro con tanques][dañado] -> sprite
+        self._cuerpos: List[List[Tuple[Sprite, Sprite]]] = []
+        self.atlas_cuerpos: Optional[Atlas] = None
+        if atlas_tanques is not None:
+            self._hornear_tanques(atlas_tanques)
+        else:
+            self._hornear_primitivas()
+
+        self._barras = [_hornear(lambda superficie, origen, verde=verde: self._dibujar_barra(superficie, origen, verde),
+                                 2 * ANCHO_BARRA + 4)
+                        for verde in range(ANCHO_BARRA + 1)]
+        self._ralentizado = _hornear(
+            lambda superficie, centro: pygame.draw.circle(superficie, (0, 0, 255), centro, 3), 16)
+        self._desplazamientos = np.empty(0)
+        self._clave_desplazamientos = None
+        self._giros_tramos = np.zeros(0, dtype=np.int64)
+        self._ruta_giros = None
+
+    @property
+    def tanques(self) -> bool:
+        return self.atlas_cuerpos is not None
+
+    def _hornear_primitivas(self):
+        for tipo in TIPOS_ENEMIGO:
+            prototipo = FABRICAS_ENEMIGOS[tipo](0, 0)
+            tamaño = prototipo._tamaño
+            # Un entero de margen por los redondeos de sin() en los extremos
+            minimo = int(tamaño * (1.0 - AMPLITUD_PULSO)) - 1
+            maximo = int(tamaño * (1.0 + AMPLITUD_PULSO)) + 1
+            lado = 4 * (maximo + 16)
+            fotogramas = []
+            for tamaño_animado in range(minimo, maximo + 1):
+                fotogramas.append(tuple(
+                    _hornear(lambda superficie, centro, t=tamaño_animado, d=dañado:
+                             prototipo._dibujar_cuerpo(superficie, centro, t, d), lado)
+                    for dañado in (False, True)))
+            indice = ID_TIPO_ENEMIGO[tipo]
+            self._tamaños[indice] = tamaño
+            self._minimos[indice] = minimo
+            self._maximos[indice] = maximo
+            self._cuerpos.append(fotogramas)
+
+    def _hornear_tanques(self, atlas_tanques: Atlas):
+        horneados = {}
+        for tipo in TIPOS_ENEMIGO:
+            numero = TANQUES_ENEMIGOS[tipo]
+            tanque, dx, dy = componer([atlas_tanques.sprite(f"tanque_enemigo/Hull_{numero}"),
+                                       atlas_tanques.sprite(f"tanque_enemigo/Gun_{numero}")])
+            # Mitad del color del tipo y mitad blanco, para que se note sin tapar el dibujo
+            tinte = tuple(128 + c // 2 for c in COLORES_ENEMIGOS[tipo])
+            tanque.fill(tinte, special_flags=pygame.BLEND_RGB_MULT)
+            dañado = tanque.copy()
+            dañado.fill(COLOR_DAÑO, special_flags=pygame.BLEND_RGB_MULT)
+
+            tamaño = FABRICAS_ENEMIGOS[tipo](0, 0)._tamaño
+            escala = (2 * tamaño + LARGO_EXTRA) / max(tanque.get_size())
+            for giro in range(ORIENTACIONES):
+                grados = giro * 360.0 / ORIENTACIONES
+                for variante, superficie in (('normal', tanque), ('dañado', dañado)):
+                    horneados[f"{tipo}/{giro}/{variante}"] = girar((superficie, dx, dy), grados, escala)
+            indice = ID_TIPO_ENEMIGO[tipo]
+            self._tamaños[indice] = tamaño
+
+        self.atlas_cuerpos = Atlas.desde_sprites(horneados)
+        self._cuerpos = [None] * len(TIPOS_ENEMIGO)
+        for tipo in TIPOS_ENEMIGO:
+            self._cuerpos[ID_TIPO_ENEMIGO[tipo]] = [
+                (self.atlas_cuerpos.sprite(f"{tipo}/{giro}/normal"), self.atlas_cuerpos.sprite(f"{tipo}/{giro}/dañado"))
+                for giro in range(ORIENTACIONES)]
+
+    @staticmethod
+    def _dibujar_barra(superficie: pygame.Surface, origen: Tuple[int, int], verde: int):
+        """La barra de Enemigo._dibujar_barra_vida con ``verde`` píxeles de vida."""
+        x, y = origen
+        pygame.draw.rect(superficie, (255, 0, 0), (x, y, ANCHO_BARRA, ALTO_BARRA))
+        if verde > 0:
+            pygame.draw.rect(superficie, (0, 255, 0), (x, y, verde, ALTO_BARRA))
+        pygame.draw.rect(superficie, (0, 0, 0), (x, y, ANCHO_BARRA, ALTO_BARRA), 1)
+
+    def _fases(self, almacen) -> np.ndarray:
+        """Desplazamiento de animación de cada fila; cambia solo al entrar o salir enemigos."""
+        clave = (id(almacen), almacen._version)
+        if clave != self._clave_desplazamientos:
+            self._desplazamientos = np.fromiter(
+                (enemigo._desplazamiento_animacion for enemigo in almacen.vistas),
+                dtype=np.float64, count=len(almacen.vistas))
+            self._clave_desplazamientos = clave
+        return self._desplazamientos
+
+    def _giros(self, almacen, distancias: np.ndarray) -> np.ndarray:
+        """Giro horneado de cada fila, el de la dirección de su tramo de ruta."""
+        ruta = almacen.ruta
+        if ruta is not self._ruta_giros:
+            dx, dy = ruta.direcciones[:, 0], ruta.direcciones[:, 1]
+            # 0 grados hacia arriba y en sentido horario, como en girar()
+            grados = np.degrees(np.arctan2(dx, -dy)) if len(dx) else np.zeros(1)
+            self._giros_tramos = np.round(grados * ORIENTACIONES / 360.0).astype(np.int64) % ORIENTACIONES
+            self._ruta_giros = ruta
+        return self._giros_tramos[ruta.indices_segmento(distancias)]
+
+    def dibujar(self, pantalla: pygame.Surface, almacen, tiempo_ms: float):
+        n = almacen.n
+        if n == 0:
+            return
+        c = almacen.columnas
+        tipos = c['tipo'][:n].astype(np.int64)
+        x, y = c['x'][:n], c['y'][:n]
+        tamaños = self._tamaños[tipos]
+
+        if self.tanques:
+            indices = self._giros(almacen, c['distancia_ruta'][:n]).tolist()
+        else:
+            factor = np.sin((tiempo_ms + self._fases(almacen)) * VELOCIDAD_PULSO) * AMPLITUD_PULSO + 1.0
+            animados = np.clip((tamaños * factor).astype(np.int64), self._minimos[tipos], self._maximos[tipos])
+            indices = (animados - self._minimos[tipos]).tolist()
+        dañados = (c['tiempo_daño'][:n] > 0).tolist()
+        verdes = np.clip((ANCHO_BARRA * c['vida'][:n] / c['vida_maxima'][:n]).astype(np.int64),
+                         0, ANCHO_BARRA).tolist()
+        # Mismos truncados que int() y pygame.Rect en el dibujo enemigo a enemigo
+        cx, cy = x.astype(np.int64).tolist(), y.astype(np.int64).tolist()
+        bx = (x - ANCHO_BARRA // 2).astype(np.int64).tolist()
+        by = (y - tamaños - 10).astype(np.int64).tolist()
+        lentos = c['duracion_ralentizacion'][:n] > 0
+        if lentos.any():
+            lx = (x - 10).astype(np.int64).tolist()
+            ly = (y + tamaños + 5).astype(np.int64).tolist()
+        lentos = lentos.tolist()
+
+        cuerpos, barras = self._cuerpos, self._barras
+        sprite_lento, lento_dx, lento_dy = self._ralentizado
+        secuencia = []
+        agregar = secuencia.append
+        for i, (tipo, indice, dañado, verde, x_i, y_i, bx_i, by_i) in enumerate(
+                zip(tipos.tolist(), indices, dañados, verdes, cx, cy, bx, by)):
+            superficie, dx, dy = cuerpos[tipo][indice][dañado]
+            agregar((superficie, (x_i - dx, y_i - dy)))
+            barra, dx, dy = barras[verde]
+            agregar((barra, (bx_i - dx, by_i - dy)))
+            if lentos[i]:
+                agregar((sprite_lento, (lx[i] - lento_dx, ly[i] - lento_dy)))
+        pantalla.blits(secuencia, False)
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from almacen_enemigos import AlmacenEnemigos
+
+    print("Probando CacheSpritesEnemigos...")
+    pygame.init()
+    pantalla = pygame.display.set_mode((1300, 800))
+    cache = CacheSpritesEnemigos()
+    almacen = AlmacenEnemigos([(0, 400), (1300, 400)])
+    rng = np.random.default_rng(0)
+    for i in range(2000):
+        enemigo = FABRICAS_ENEMIGOS[TIPOS_ENEMIGO[i % 3]](float(rng.uniform(40, 1260)), float(rng.uniform(40, 760)))
+        enemigo.recibir_daño(int(rng.integers(0, 20)))
+        if i % 7 == 0:
+            enemigo.aplicar_ralentizacion(500)
+        almacen.append(enemigo)
+
+    # Los sprites deben dar los mismos píxeles que el dibujo enemigo a enemigo
+    tiempo = 12345.0
+    referencia = pantalla.copy()
+    referencia.fill((255, 255, 255))
+    ticks_originales = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: tiempo
+    for enemigo in almacen:
+        enemigo.dibujar(referencia)
+    pygame.time.get_ticks = ticks_originales
+    pantalla.fill((255, 255, 255))
+    cache.dibujar(pantalla, almacen, tiempo)
+    iguales = pygame.image.tobytes(pantalla, "RGB") == pygame.image.tobytes(referencia, "RGB")
+    print(f"Mismos píxeles que Enemigo.dibujar: {iguales}")
+
+    for nombre, dibujar in (("Enemigo.dibujar", lambda: [e.dibujar(pantalla) for e in almacen]),
+                            ("sprites + blits", lambda: cache.dibujar(pantalla, almacen, tiempo))):
+        inicio = time.perf_counter()
+        for _ in range(20):
+            dibujar()
+        print(f"{nombre}: {(time.perf_counter() - inicio) / 20 * 1000:.2f} ms para {len(almacen)} enemigos")
+
+    inicio = time.perf_counter()
+    tanques = CacheSpritesEnemigos(Atlas.cargar('tanques'))
+    print(f"Tanques horneados en {(time.perf_counter() - inicio) * 1000:.0f} ms: "
+          f"{len(tanques.atlas_cuerpos)} sprites en {len(tanques.atlas_cuerpos.paginas)} página(s)")
+    inicio = time.perf_counter()
+    for _ in range(20):
+        tanques.dibujar(pantalla, almacen, tiempo)
+    print(f"tanques + blits: {(time.perf_counter() - inicio) / 20 * 1000:.2f} ms para {len(almacen)} enemigos")
+    print("¡Prueba de sprites de enemigos completada!")
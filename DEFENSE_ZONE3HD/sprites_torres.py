@@ -0,0 +1,93 @@
+import math
+from typing import Dict, Iterable, List, Tuple
+import pygame
+from atlas import Atlas, Sprite, componer, girar
+from ruta import Ruta
+
+# Casco y cañón de assets/tanque/ para cada tipo de torre (Hull_XX, Gun_XX)
+TANQUES_TORRES = {'cañon': '01', 'misil': '06', 'laser': '08'}
+# Giros horneados del cañón (cada 360/32 = 11,25 grados)
+GIROS_CAÑON = 32
+# Largo del casco respecto al diámetro del círculo que sustituye
+LARGO_EXTRA = 6
+RADIO_VISUAL = 25
+
+
+class SpritesTorres:
+    """
+    Torres dibujadas como los tanques de assets/tanque/.
+
+    El casco va siempre derecho y el cañón apunta al punto del camino más
+    cercano, con el giro horneado más próximo. Casco y giros se hornean una
+    vez desde el atlas de tanques y se empaquetan en un atlas propio, así
+    que cada torre son dos subsuperficies de la misma página. Las torres no
+    se mueven: el juego las pinta en el fondo horneado y esto solo se
+    ejecuta cuando cambian.
+    """
+
+    def __init__(self, atlas_tanques: Atlas, radio_visual: int = RADIO_VISUAL):
+        horneados: Dict[str, Sprite] = {}
+        for tipo, numero in TANQUES_TORRES.items():
+            casco = atlas_tanques.sprite(f"tanque/Hull_{numero}")
+            cañon = atlas_tanques.sprite(f"tanque/Gun_{numero}")
+            superficie, _, _ = componer([casco, cañon])
+            escala = (2 * radio_visual + LARGO_EXTRA) / max(superficie.get_size())
+            horneados[f"{tipo}/casco"] = girar(casco, 0.0, escala)
+            for giro in range(GIROS_CAÑON):
+                horneados[f"{tipo}/cañon/{giro}"] = girar(cañon, giro * 360.0 / GIROS_CAÑON, escala)
+        self.atlas = Atlas.desde_sprites(horneados)
+        # Las torres no se mueven: el giro de cada posición se calcula una vez por ruta
+        self._giros: Dict[Tuple[float, float], int] = {}
+        self._ruta_giros = None
+
+    def giro_hacia(self, x: float, y: float, ruta: Ruta) -> int:
+        """Giro horneado que apunta de (x, y) al punto más cercano de la ruta."""
+        objetivo_x, objetivo_y = ruta.posicion(ruta.distancia_de(x, y))
+        # 0 grados hacia arriba y en sentido horario, como en atlas.girar
+        grados = math.degrees(math.atan2(objetivo_x - x, y - objetivo_y))
+        return round(grados * GIROS_CAÑON / 360.0) % GIROS_CAÑON
+
+    def elementos(self, torres: Iterable, ruta: Ruta) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Casco y cañón de cada torre, listos para ``Surface.blits``."""
+        if ruta is not self._ruta_giros:
+            self._giros.clear()
+            self._ruta_giros = ruta
+        giros = self._giros
+        secuencia = []
+        for torre in torres:
+            tipo = torre.tipo if torre.tipo in TANQUES_TORRES else 'cañon'
+            giro = giros.get((torre.x, torre.y))
+            if giro is None:
+                giro = giros[(torre.x, torre.y)] = self.giro_hacia(torre.x, torre.y, ruta)
+            secuencia.append(self.atlas.blit(f"{tipo}/casco", torre.x, torre.y))
+            secuencia.append(self.atlas.blit(f"{tipo}/cañon/{giro}", torre.x, torre.y))
+        return secuencia
+
+    def dibujar(self, superficie: pygame.Surface, torres: Iterable, ruta: Ruta):
+        torres = list(torres)
+        superficie.blits(self.elementos(torres, ruta), False)
+        for torre in torres:
+            if torre.mostrar_rango:
+                pygame.draw.circle(superficie, (255, 255, 255), (int(torre.x), int(torre.y)), int(torre.rango), 2)
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from simulacion import CLASES_TORRES, crear_camino
+
+    print("Probando SpritesTorres...")
+    pygame.init()
+    pantalla = pygame.display.set_mode((1300, 800))
+    inicio = time.perf_counter()
+    sprites = SpritesTorres(Atlas.cargar('tanques'))
+    print(f"Horneado: {(time.perf_counter() - inicio) * 1000:.0f} ms, {len(sprites.atlas)} sprites "
+          f"en {len(sprites.atlas.paginas)} página(s)")
+    ruta = Ruta.desde(crear_camino())
+    torres = [CLASES_TORRES[tipo](300 + 150 * i, 300) for i, tipo in enumerate(sorted(CLASES_TORRES))]
+    for torre in torres:
+        print(f"{torre.tipo} en ({torre.x}, {torre.y}): giro {sprites.giro_hacia(torre.x, torre.y, ruta)}")
+    pantalla.fill((255, 255, 255))
+    sprites.dibujar(pantalla, torres, ruta)
+    print("¡Prueba de sprites de torres completada!")
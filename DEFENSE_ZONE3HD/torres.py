@@ -1,7 +1,10 @@
 import pygame
 import math
 from Objetos import Objetos
-from typing import List, Optional
+from almacen_enemigos import AlmacenEnemigos
+from typing import List, Optional, Tuple
+
+NIVEL_MAXIMO = 5
 
 
 class torres(Objetos):
@@ -9,6 +12,13 @@ class torres(Objetos):
     Clase base para todas las torres del juego.
     Hereda de Objetos para mantener la estructura POO.
     """
+
+    __slots__ = (
+        'nombre', 'costo', 'rango', 'daño', 'cadencia_fuego', 'imagen_torre',
+        'ultimo_disparo', 'nivel', 'objetivo_actual', 'ruta_cobertura',
+        'intervalos_cobertura', 'color', 'radio_visual', 'mostrar_rango',
+        'enemigos_eliminados', 'daño_total_infligido',
+    )
     
     def __init__(self, x: float, y: float, nombre: str = "Torre Base", 
                  costo: int = 100, rango: float = 150, cadencia_fuego: float = 1500,
@@ -28,6 +38,10 @@ class torres(Objetos):
         self.nivel = 1
         self.objetivo_actual = None
         
+        # Tramos de la ruta (en longitud de arco) dentro del alcance
+        self.ruta_cobertura = None
+        self.intervalos_cobertura: Optional[List[Tuple[float, float]]] = None
+        
         
         self.color = (0, 100, 255)  
         self.radio_visual = 25
@@ -48,11 +62,21 @@ class torres(Objetos):
         Busca el enemigo más cercano dentro del alcance.
         
         Args:
-            enemigos: Lista de enemigos en el juego
+            enemigos: Lista de enemigos en el juego, o un AlmacenEnemigos. Con
+                el almacén y la cobertura calculada se elige el enemigo más
+                avanzado dentro de los tramos cubiertos; sin cobertura, el más
+                cercano según la rejilla espacial
             
         Returns:
             El enemigo más cercano o None si no hay objetivos
         """
+        if isinstance(enemigos, AlmacenEnemigos):
+            if self.intervalos_cobertura is not None and enemigos.ruta is self.ruta_cobertura:
+                self.objetivo_actual = enemigos.mas_avanzado(self.intervalos_cobertura)
+            else:
+                self.objetivo_actual = enemigos.mas_cercano(self.x, self.y, self.rango)
+            return self.objetivo_actual
+
         objetivo_mas_cercano = None
         distancia_minima = self.rango
 
@@ -74,17 +98,21 @@ class torres(Objetos):
         
         Args:
             objetivo: Enemigo objetivo
-            lista_proyectiles: Lista donde agregar el nuevo proyectil
+            lista_proyectiles: Lista donde agregar el nuevo proyectil, o un
+                MotorProyectiles que lo actualizará junto a los demás
         """
         if not self.puede_disparar or not objetivo:
             return False
         
         
-        from misiles import misiles
+        from misiles import misiles, MotorProyectiles
         
         
-        nuevo_proyectil = misiles(self.x, self.y, objetivo.x, objetivo.y, self.daño)
-        lista_proyectiles.append(nuevo_proyectil)
+        if isinstance(lista_proyectiles, MotorProyectiles):
+            misiles(self.x, self.y, objetivo.x, objetivo.y, self.daño, motor=lista_proyectiles)
+        else:
+            nuevo_proyectil = misiles(self.x, self.y, objetivo.x, objetivo.y, self.daño)
+            lista_proyectiles.append(nuevo_proyectil)
         
         
         self.ultimo_disparo = pygame.time.get_ticks()
@@ -144,16 +172,31 @@ class torres(Objetos):
         Returns:
             True si la mejora fue exitosa, False en caso contrario
         """
-        if self.nivel >= 5:  
+        if self.nivel >= NIVEL_MAXIMO:
             return False
         
         self.nivel += 1
         self.daño = int(self.daño * 1.3)  
         self.rango = int(self.rango * 1.1)  
         self.cadencia_fuego = max(200, int(self.cadencia_fuego * 0.85))  
+        if self.ruta_cobertura is not None:
+            self.calcular_cobertura(self.ruta_cobertura)
         
         return True
 
+    def calcular_cobertura(self, ruta):
+        """
+        Precalcula los tramos de la ruta que quedan dentro del alcance.
+
+        Las torres no se mueven y la ruta es fija, así que basta con hacerlo
+        al colocar la torre (y al cambiar su rango).
+        
+        Args:
+            ruta: Ruta compartida por los enemigos
+        """
+        self.ruta_cobertura = ruta
+        self.intervalos_cobertura = ruta.intervalos_en_radio(self.x, self.y, self.rango)
+
     def obtener_costo_mejora(self) -> int:
         """Retorna el costo de mejorar la torre."""
         return int(self.costo * (self.nivel * 0.8))
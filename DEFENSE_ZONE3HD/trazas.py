@@ -0,0 +1,136 @@
+"""
+Registro de intervalos (spans) de cada frame para verlos en un visor de trazas.
+
+Cada fase medida del bucle principal y de la simulación se guarda como
+(nombre, inicio, fin) en un búfer circular de tamaño fijo, así que grabar
+continuamente no crece en memoria y siempre están los últimos segundos. Al
+exportar se escribe el formato JSON de eventos de traza de Chrome, que
+abren chrome://tracing, Perfetto (ui.perfetto.dev) o speedscope: cada frame
+aparece con sus fases anidadas y se ve qué frame se disparó y en qué fase.
+
+Desde la línea de comandos convierte una exportación en un resumen:
+
+Uso:
+    python trazas.py traza.json [--top 10]
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+# Unos 30-40 s de spans a velocidad x4 (frame, fases del bucle y del paso)
+CAPACIDAD_TRAZAS = 65536
+
+
+class RegistroTrazas:
+    """Búfer circular de spans exportable como traza de Chrome."""
+
+    def __init__(self, capacidad: int = CAPACIDAD_TRAZAS):
+        self.capacidad = capacidad
+        self._nombres = [''] * capacidad
+        self._inicios = [0.0] * capacidad
+        self._fines = [0.0] * capacidad
+        self._argumentos: List[Optional[dict]] = [None] * capacidad
+        self.total = 0
+        self._origen = time.perf_counter()
+
+    def registrar(self, nombre: str, inicio: float, fin: float, argumentos: Optional[dict] = None):
+        """Guarda un span; ``inicio`` y ``fin`` son segundos de time.perf_counter."""
+        i = self.total % self.capacidad
+        self._nombres[i] = nombre
+        self._inicios[i] = inicio
+        self._fines[i] = fin
+        self._argumentos[i] = argumentos
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacidad)
+
+    def clear(self):
+        self.total = 0
+        self._argumentos = [None] * self.capacidad
+
+    def eventos(self) -> List[Dict]:
+        """Spans guardados como eventos completos ("X") en microsegundos."""
+        n = len(self)
+        primero = self.total - n
+        eventos = []
+        for k in range(primero, self.total):
+            i = k % self.capacidad
+            evento = {
+                'name': self._nombres[i],
+                'ph': 'X',
+                'ts': (self._inicios[i] - self._origen) * 1e6,
+                'dur': (self._fines[i] - self._inicios[i]) * 1e6,
+                'pid': os.getpid(),
+                'tid': 0,
+            }
+            if self._argumentos[i] is not None:
+                evento['args'] = self._argumentos[i]
+            eventos.append(evento)
+        # El visor anida por tiempo; a igual inicio, primero el span más largo
+        eventos.sort(key=lambda evento: (evento['ts'], -evento['dur']))
+        return eventos
+
+    def exportar(self, ruta_archivo: str) -> int:
+        """Escribe la traza y devuelve cuántos spans contiene."""
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        eventos = self.eventos()
+        datos = {
+            'traceEvents': [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                             'args': {'name': 'Defense Zone 3 HD'}}] + eventos,
+            'displayTimeUnit': 'ms',
+        }
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+        return len(eventos)
+
+
+def resumir_traza(datos: dict, top: int = 10) -> List[str]:
+    """Frames más lentos de una traza exportada, con el reparto de sus fases."""
+    eventos = [evento for evento in datos['traceEvents'] if evento.get('ph') == 'X']
+    frames = sorted((evento for evento in eventos if evento['name'] == 'frame'),
+                    key=lambda evento: evento['dur'], reverse=True)
+    lineas = [f"{len(frames)} frames, {len(eventos)} spans"]
+    for frame in frames[:top]:
+        inicio, fin = frame['ts'], frame['ts'] + frame['dur']
+        fases: Dict[str, float] = {}
+        for evento in eventos:
+            if evento is not frame and inicio <= evento['ts'] and evento['ts'] + evento['dur'] <= fin:
+                fases[evento['name']] = fases.get(evento['name'], 0.0) + evento['dur']
+        detalle = ", ".join(f"{nombre} {duracion / 1000:.2f}"
+                            for nombre, duracion in sorted(fases.items(), key=lambda par: -par[1]))
+        lineas.append(f"frame {frame.get('args', {}).get('frame', '?')}: {frame['dur'] / 1000:.2f} ms ({detalle})")
+    return lineas
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Resumen de una traza exportada")
+    parser.add_argument("traza", nargs="?", default=None, help="JSON exportado con F10 o --trazas")
+    parser.add_argument("--top", type=int, default=10, help="frames más lentos a mostrar")
+    argumentos = parser.parse_args()
+
+    if argumentos.traza:
+        with open(argumentos.traza, encoding='utf-8') as archivo:
+            for linea in resumir_traza(json.load(archivo), argumentos.top):
+                print(linea)
+    else:
+        import tempfile
+        print("Probando RegistroTrazas...")
+        registro = RegistroTrazas(capacidad=8)
+        for numero in range(5):
+            inicio = time.perf_counter()
+            time.sleep(0.001 * numero)
+            medio = time.perf_counter()
+            registro.registrar('actualizar', inicio, medio)
+            registro.registrar('frame', inicio, time.perf_counter(), {'frame': numero})
+        print(f"Spans guardados: {len(registro)} de {registro.total}")
+        ruta = os.path.join(tempfile.mkdtemp(), "traza.json")
+        registro.exportar(ruta)
+        with open(ruta, encoding='utf-8') as archivo:
+            for linea in resumir_traza(json.load(archivo), 2):
+                print(linea)
+        print("¡Prueba de trazas completada!")
@@ -1,9 +1,8 @@
 import pygame
 import math
-import threading
-import time
 from enum import Enum
 from typing import List, Tuple
+from fuentes import FUENTES, TEXTOS
 
 # Colores mejorados para mejor legibilidad
 BLANCO = (255, 255, 255)
@@ -18,6 +17,9 @@ GRIS_CLARO = (248, 248, 255)   # Casi blanco
 GRIS_TEXTO = (64, 64, 64)      # Gris oscuro para texto
 MORADO = (75, 0, 130)
 
+# Grupo del planificador para las generaciones del tutorial
+GRUPO_TUTORIAL = 'tutorial'
+
 class FaseTutorial(Enum):
     INICIO = 0
     INTERFAZ_BASICA = 1
@@ -45,9 +47,9 @@ class TutorialInteractivo:
         self.fase_actual = FaseTutorial.INICIO
         
         # Fuentes optimizadas para legibilidad
-        self.fuente_titulo = pygame.font.SysFont("arial", 16, bold=True)
-        self.fuente_texto = pygame.font.SysFont("arial", 13)
-        self.fuente_pequeña = pygame.font.SysFont("arial", 12)
+        self.fuente_titulo = FUENTES.fuente("arial", 16, negrita=True)
+        self.fuente_texto = FUENTES.fuente("arial", 13)
+        self.fuente_pequeña = FUENTES.fuente("arial", 12)
         
         self.objetivos_actuales: List[ObjetivoTutorial] = []
         self.mensaje_principal = ""
@@ -56,6 +58,8 @@ class TutorialInteractivo:
         self.torres_colocadas_inicial = 0
         self.enemigos_tutorial_spawneados = 0
         self.tiempo_fase_inicio = 0
+        # Tiempo simulado en que se completó la fase de torres (None si aún no)
+        self.tiempo_fase_completada = None
         
         # SIMPLIFICADO: Solo contar torres totales
         self.contador_torres_fase = 0
@@ -64,19 +68,22 @@ class TutorialInteractivo:
         self.activo = True
         self.fase_actual = FaseTutorial.INICIO
         self.juego.gestor_recursos.recursos = {"dinero": 500, "vidas": 10}  # Más dinero
-        self.juego.torres.clear()
+        self.juego.simulacion.reemplazar_torres()
         self.juego.enemigos.clear()
         self.juego.proyectiles.clear()
         self.torres_colocadas_inicial = 0
         self.enemigos_tutorial_spawneados = 0
-        self.tiempo_fase_inicio = pygame.time.get_ticks()
+        self.tiempo_fase_inicio = self._tiempo_actual()
         self.contador_torres_fase = 0
         self._cargar_fase()
 
     def _cargar_fase(self):
         self.objetivos_actuales.clear()
         self.puede_continuar = False
-        self.tiempo_fase_inicio = pygame.time.get_ticks()
+        self.tiempo_fase_completada = None
+        # La oleada de práctica solo sigue saliendo mientras dure su fase
+        self.juego.simulacion.planificador.cancelar(GRUPO_TUTORIAL)
+        self.tiempo_fase_inicio = self._tiempo_actual()
         
         # Resetear contador al entrar a fase de torres
         if self.fase_actual == FaseTutorial.TIPOS_TORRES:
@@ -199,29 +206,15 @@ class TutorialInteractivo:
             print(f"Error generando enemigos variados: {e}")
 
     def _iniciar_oleada_tutorial(self):
-        def generar_oleada():
-            tipos = ['basico', 'basico', 'rapido', 'basico']
-            try:
-                from Enemigo import EnemigoBasico, EnemigoRapido, EnemigoTanque
-                clases_enemigos = {
-                    'basico': EnemigoBasico,
-                    'rapido': EnemigoRapido,
-                    'tanque': EnemigoTanque
-                }
-                for i, tipo in enumerate(tipos):
-                    time.sleep(1.0)
-                    if self.activo and self.fase_actual == FaseTutorial.OLEADAS:
-                        if tipo in clases_enemigos and len(self.juego.camino) > 0:
-                            enemigo = clases_enemigos[tipo](self.juego.camino[0][0], self.juego.camino[0][1])
-                            enemigo.ruta = self.juego.camino
-                            self.juego.enemigos.append(enemigo)
-                            print(f"DEBUG: Enemigo oleada {tipo} agregado")
-            except Exception as e:
-                print(f"Error en oleada tutorial: {e}")
-        
-        hilo = threading.Thread(target=generar_oleada)
-        hilo.daemon = True
-        hilo.start()
+        # Un enemigo por segundo de tiempo simulado, sin hilos
+        tipos = ['basico', 'basico', 'rapido', 'basico']
+        for i, tipo in enumerate(tipos):
+            self.juego.simulacion.programar_generacion((i + 1) * 1000.0, tipo, GRUPO_TUTORIAL)
+        print(f"DEBUG: Oleada del tutorial programada ({len(tipos)} enemigos)")
+
+    def _tiempo_actual(self) -> float:
+        """Los plazos del tutorial siguen el reloj de la simulación (pausa y velocidad)."""
+        return self.juego.simulacion.tiempo_actual
 
     def actualizar(self, dt: float):
         if not self.activo:
@@ -234,13 +227,16 @@ class TutorialInteractivo:
         
         # AUTO-AVANCE INMEDIATO para la fase de torres
         if self.fase_actual == FaseTutorial.TIPOS_TORRES and self.puede_continuar:
-            print("DEBUG: ¡AVANZANDO INMEDIATAMENTE DESDE TIPOS TORRES!")
-            pygame.time.wait(500)  # Pequeña pausa para que el usuario vea
-            self._avanzar_fase()
+            # Pequeña pausa (en tiempo de juego) para que el usuario vea la fase completada
+            if self.tiempo_fase_completada is None:
+                self.tiempo_fase_completada = self._tiempo_actual()
+            elif self._tiempo_actual() - self.tiempo_fase_completada >= 500:
+                print("DEBUG: ¡AVANZANDO DESDE TIPOS TORRES!")
+                self._avanzar_fase()
             return
         
         # Auto-avance para otras fases
-        tiempo_transcurrido = pygame.time.get_ticks() - self.tiempo_fase_inicio
+        tiempo_transcurrido = self._tiempo_actual() - self.tiempo_fase_inicio
         if tiempo_transcurrido > 10000:  # 10 segundos máximo por fase
             print(f"DEBUG: Auto-avance por tiempo excedido en fase {self.fase_actual}")
             for objetivo in self.objetivos_actuales:
@@ -248,7 +244,7 @@ class TutorialInteractivo:
             self.puede_continuar = True
 
     def _verificar_objetivos(self):
-        tiempo_transcurrido = pygame.time.get_ticks() - self.tiempo_fase_inicio
+        tiempo_transcurrido = self._tiempo_actual() - self.tiempo_fase_inicio
         
         if self.fase_actual == FaseTutorial.INTERFAZ_BASICA:
             if tiempo_transcurrido > 1500:
@@ -381,6 +377,7 @@ class TutorialInteractivo:
         try:
             from Main import EstadoJuego
             self.activo = False
+            self.juego.simulacion.planificador.cancelar(GRUPO_TUTORIAL)
             self.juego.estado_juego = EstadoJuego.MENU
             print("DEBUG: =======================================")
             print("DEBUG: SALIENDO DEL TUTORIAL")
@@ -409,7 +406,7 @@ class TutorialInteractivo:
         pygame.draw.rect(pantalla, AZUL, panel_principal, 2)
         
         # Título
-        titulo = self.fuente_titulo.render(self.mensaje_principal, True, AZUL)
+        titulo = TEXTOS.render(self.fuente_titulo, self.mensaje_principal, AZUL)
         pantalla.blit(titulo, (panel_x + 8, panel_y + 8))
         
         # Mensaje secundario
@@ -417,7 +414,7 @@ class TutorialInteractivo:
             lineas_mensaje = self._dividir_texto(self.mensaje_secundario, 50)
             y_offset = 28
             for linea in lineas_mensaje:
-                mensaje = self.fuente_texto.render(linea, True, GRIS_TEXTO)
+                mensaje = TEXTOS.render(self.fuente_texto, linea, GRIS_TEXTO)
                 pantalla.blit(mensaje, (panel_x + 8, panel_y + y_offset))
                 y_offset += 16
         
@@ -434,7 +431,7 @@ class TutorialInteractivo:
         pygame.draw.rect(pantalla, VERDE, panel_objetivos, 2)
         
         # Título objetivos
-        titulo_obj = self.fuente_texto.render("Objetivos:", True, VERDE)
+        titulo_obj = TEXTOS.render(self.fuente_texto, "Objetivos:", VERDE)
         pantalla.blit(titulo_obj, (panel_x + 8, objetivos_y + 6))
         
         # Lista de objetivos
@@ -447,7 +444,7 @@ class TutorialInteractivo:
             if len(texto) > 55:
                 texto = texto[:52] + "..."
             
-            obj_surface = self.fuente_pequeña.render(texto, True, color)
+            obj_surface = TEXTOS.render(self.fuente_pequeña, texto, color)
             pantalla.blit(obj_surface, (panel_x + 12, objetivos_y + y_offset))
             y_offset += 18
         
@@ -457,7 +454,7 @@ class TutorialInteractivo:
             continuar_y = 700
             continuar_texto = "ESPACIO: Continuar"
             
-            continuar_surface = self.fuente_texto.render(continuar_texto, True, BLANCO)
+            continuar_surface = TEXTOS.render(self.fuente_texto, continuar_texto, BLANCO)
             rect_continuar = continuar_surface.get_rect()
             rect_continuar.x = continuar_x
             rect_continuar.y = continuar_y
@@ -474,13 +471,13 @@ class TutorialInteractivo:
         
         # Ayuda
         ayuda_texto = "ESPACIO: Avanzar | TAB: Debug info | ESC: Salir"
-        ayuda_surface = self.fuente_pequeña.render(ayuda_texto, True, GRIS_TEXTO)
+        ayuda_surface = TEXTOS.render(self.fuente_pequeña, ayuda_texto, GRIS_TEXTO)
         pantalla.blit(ayuda_surface, (panel_x, 770))
         
         # INFO DE DEBUG EN PANTALLA para fase de torres
         if self.fase_actual == FaseTutorial.TIPOS_TORRES:
             debug_texto = f"DEBUG: Torres={len(self.juego.torres)} | Inicio={self.contador_torres_fase} | Nuevas={len(self.juego.torres)-self.contador_torres_fase}"
-            debug_surface = self.fuente_pequeña.render(debug_texto, True, ROJO)
+            debug_surface = TEXTOS.render(self.fuente_pequeña, debug_texto, ROJO)
             pantalla.blit(debug_surface, (panel_x, 750))
 
     def _dividir_texto(self, texto: str, max_chars: int) -> List[str]: